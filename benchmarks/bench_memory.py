@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes per resident MushroomPet.
+
+Compares the compact slotted layout against the original layout, where
+every pet carried a __dict__ with string personality, food, mood and
+save_file fields. Run from the repository root:
+
+    python3 benchmarks/bench_memory.py [pet_count]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from mycomate import MushroomPet
+
+
+class LegacyPet:
+    """Stand-in for the original __dict__-based MushroomPet layout"""
+
+    def __init__(self, pet):
+        self.name = pet.name
+        self.birth_time = pet.birth_time
+        self.last_update = pet.last_update
+        self.hunger = pet.hunger
+        self.happiness = pet.happiness
+        self.health = pet.health
+        self.cleanliness = pet.cleanliness
+        self.energy = pet.energy
+        self.age = pet.age
+        self.growth_stage = pet.growth_stage
+        self.size = pet.size
+        self.personality = pet.personality
+        self.favorite_food = pet.favorite_food
+        self.mood = pet.mood
+        self.last_fed = pet.last_fed
+        self.last_played = pet.last_played
+        self.last_cleaned = pet.last_cleaned
+        self.experience = pet.experience
+        self.level = pet.level
+        self.save_file = f".mushroom_pet_{pet.name.lower()}.json"
+
+
+def measure(factory, count):
+    """Average traced bytes per object built by factory(i)"""
+    names = [f"pet{i}" for i in range(count)]  # Names are shared by both layouts
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    pets = [factory(name) for name in names]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Subtract the list holding the pets
+    return (after - before - sys.getsizeof(pets)) / count
+
+
+def make_pet(name):
+    """Compact pet with distinct float stats, as after a few updates"""
+    pet = MushroomPet(name)
+    offset = len(name) / 1000
+    pet.hunger = 50.5 - offset
+    pet.happiness = 50.25 - offset
+    pet.health = 99.5 - offset
+    pet.cleanliness = 99.25 - offset
+    pet.energy = 80.5 - offset
+    pet.age = 0.5 + offset
+    return pet
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    compact = measure(make_pet, count)
+    legacy = measure(lambda name: LegacyPet(make_pet(name)), count)
+    print(f"Pets measured:      {count}")
+    print(f"Legacy __dict__ pet: {legacy:8.1f} bytes/pet")
+    print(f"Compact slotted pet: {compact:8.1f} bytes/pet")
+    print(f"Saved:               {legacy - compact:8.1f} bytes/pet ({(1 - compact / legacy) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the core pet operations at fleet sizes from 1 to 1M.
+
+Every case runs on a FixedClock and seeded randomness, so two runs on
+the same machine do the same work; nothing touches the network or the
+real terminal. Results are saved as a JSON baseline, and compare flags
+cases that got slower than the baseline by more than a threshold. Run
+from the repository root:
+
+    python3 benchmarks/bench_suite.py run [--sizes 1,100,10000] [--output results.json]
+    python3 benchmarks/bench_suite.py compare baseline.json results.json [--threshold 0.2]
+    python3 benchmarks/bench_suite.py run --baseline baseline.json
+
+File I/O cases stop at 10,000 pets and rendering cases at 100,000 pets,
+since larger sizes only repeat the same per-pet work for minutes.
+
+The startup benchmark times `python3 mycomate.py` in fresh interpreters,
+from launch through the first frame to Save & Quit, lists the slowest
+imports from -X importtime, and fails when the median goes over its
+budget:
+
+    python3 benchmarks/bench_suite.py startup [--budget-ms 50] [--runs 20]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, REPO_ROOT)
+
+import mycomate_fleet
+from mycomate import MushroomPet, FixedClock, FrameRenderer, RENDER_CACHE, draw_ui
+
+DEFAULT_SIZES = (1, 100, 10000)
+START_TIME = 1_700_000_000.0  # Clock epoch of every case
+IO_MAX_PETS = 10000
+RENDER_MAX_PETS = 100000
+STARTUP_BUDGET_MS = 50
+
+# The game as players start it: pick a pet, press Enter, see the first
+# frame, then Save & Quit. The first run creates the pet, later ones load it
+STARTUP_SCRIPT = os.path.join(REPO_ROOT, 'mycomate.py')
+STARTUP_INPUT = "Startup\n\n5\n"
+
+
+def make_pets(count, clock):
+    """count pets on clock with seeded, varied stats, last updated at its time"""
+    rng = random.Random(count)
+    random.seed(count)  # MushroomPet draws personality and food from random
+    pets = []
+    for i in range(count):
+        pet = MushroomPet(f"Pet{i}", clock)
+        pet.birth_time = clock.now - rng.uniform(0, 60) * 3600
+        pet.last_update = clock.now
+        for stat in ('hunger', 'happiness', 'health', 'cleanliness', 'energy'):
+            setattr(pet, stat, rng.uniform(10, 90))
+        pet.experience = rng.randrange(0, 500)
+        pet.level = 1 + pet.experience // 100
+        pet.age = (clock.now - pet.birth_time) / 3600
+        pets.append(pet)
+    return pets
+
+
+def reset_for_actions(pets):
+    """Put every pet where each care action takes its full path"""
+    for pet in pets:
+        pet.hunger = 40.0
+        pet.happiness = 50.0
+        pet.health = 70.0
+        pet.cleanliness = 50.0
+        pet.energy = 60.0
+        pet.last_fed = pet.last_played = pet.last_cleaned = 0.0
+
+
+# Each case is (setup, run, max pets). setup(pets, clock, workdir) prepares
+# untimed state; run(pets, clock, workdir) is the timed part.
+
+def _advance_hour(pets, clock, workdir):
+    clock.advance(3600)
+
+
+def _update_stats(pets, clock, workdir):
+    for pet in pets:
+        pet.update_stats()
+
+
+def _fleet_setup(pets, clock, workdir):
+    clock.advance(3600)
+    pets[:] = [mycomate_fleet.PetPopulation.from_pets(pets)]
+
+
+def _fleet_update_stats(pets, clock, workdir):
+    pets[0].update_stats(clock.now)
+
+
+def _action(name, *args):
+    def run(pets, clock, workdir):
+        for pet in pets:
+            getattr(pet, name)(*args)
+    return run
+
+
+def _action_setup(pets, clock, workdir):
+    reset_for_actions(pets)
+
+
+def _get_ascii_art(pets, clock, workdir):
+    for pet in pets:
+        pet.get_ascii_art()
+
+
+def _render_setup(pets, clock, workdir):
+    RENDER_CACHE.clear()
+
+
+def _get_status(pets, clock, workdir):
+    for pet in pets:
+        pet.get_status()
+
+
+def _draw_ui(pets, clock, workdir):
+    renderer = FrameRenderer(stream=io.StringIO(), watch_resize=False)
+    for pet in pets:
+        renderer.invalidate()  # A full frame per pet, as when switching pets
+        draw_ui(pet, renderer)
+
+
+def _save_setup(pets, clock, workdir):
+    for pet in pets:
+        pet.save_file = os.path.join(workdir, f".mushroom_pet_{pet.name.lower()}.json")
+
+
+def _save_to_file(pets, clock, workdir):
+    for pet in pets:
+        pet.save_to_file()
+
+
+def _load_setup(pets, clock, workdir):
+    _save_setup(pets, clock, workdir)
+    _save_to_file(pets, clock, workdir)
+    clock.advance(6 * 3600)
+
+
+def _load_from_file(pets, clock, workdir):
+    for pet in pets:
+        pet.load_from_file()
+
+
+CASES = {
+    'update_stats': (_advance_hour, _update_stats, None),
+    'fleet_update_stats': (_fleet_setup, _fleet_update_stats, None),
+    'feed': (_action_setup, _action('feed', 'compost'), None),
+    'play': (_action_setup, _action('play'), None),
+    'clean': (_action_setup, _action('clean'), None),
+    'rest': (_action_setup, _action('rest'), None),
+    'get_ascii_art': (_render_setup, _get_ascii_art, RENDER_MAX_PETS),
+    'get_status': (_render_setup, _get_status, RENDER_MAX_PETS),
+    'draw_ui': (_render_setup, _draw_ui, RENDER_MAX_PETS),
+    'save_to_file': (_save_setup, _save_to_file, IO_MAX_PETS),
+    'load_from_file': (_load_setup, _load_from_file, IO_MAX_PETS),
+}
+
+
+def available_cases():
+    cases = dict(CASES)
+    if mycomate_fleet.np is None:
+        del cases['fleet_update_stats']  # Needs NumPy
+    return cases
+
+
+def run_case(name, count, repeat):
+    """Best time of `repeat` runs of one case; returns its result dict"""
+    setup, run, _ = CASES[name]
+    clock = FixedClock()
+    best = None
+    for _ in range(repeat):
+        clock.set(START_TIME)
+        random.seed(0)
+        pets = make_pets(count, clock)
+        workdir = tempfile.mkdtemp(prefix='mycomate_bench_')
+        try:
+            setup(pets, clock, workdir)
+            random.seed(0)
+            start = time.perf_counter()
+            run(pets, clock, workdir)
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        best = elapsed if best is None else min(best, elapsed)
+    return {'case': name, 'pets': count, 'seconds': best, 'us_per_pet': best / count * 1e6}
+
+
+def run_suite(sizes, cases=None, repeat=3, progress=None):
+    """Run every case at every size; returns the results document"""
+    selected = available_cases()
+    if cases:
+        selected = {name: selected[name] for name in cases}
+    results = {}
+    for name, (_, _, max_pets) in selected.items():
+        for count in sizes:
+            if max_pets is not None and count > max_pets:
+                continue
+            # Small fleets finish in microseconds, so they get more runs to pick the best from
+            runs = repeat * max(1, min(100, 1000 // count)) if count < 100000 else 1
+            result = run_case(name, count, runs)
+            results[f"{name}@{count}"] = result
+            if progress is not None:
+                progress(result)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': mycomate_fleet.np.__version__ if mycomate_fleet.np is not None else None,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def _launch(args, workdir, env, stdin=''):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=workdir, env=env, check=True, input=stdin, text=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def slowest_imports(workdir, env, count=8):
+    """(module, cumulative ms) of the slowest imports of one -X importtime run"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', STARTUP_SCRIPT], cwd=workdir, env=env,
+                            check=True, input=STARTUP_INPUT, capture_output=True, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            imports.append((parts[2].strip(), int(parts[1]) / 1000))
+    return sorted(imports, key=lambda item: -item[1])[:count]
+
+
+def run_startup(runs=20, budget_ms=STARTUP_BUDGET_MS):
+    """Median wall time of fresh interpreters reaching the first frame, against a budget"""
+    workdir = tempfile.mkdtemp(prefix='mycomate_bench_')
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(REPO_ROOT))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # Cold start, not a first-ever compile
+    try:
+        _launch([STARTUP_SCRIPT], workdir, env, STARTUP_INPUT)  # Warm the caches, create the pet
+        times = [_launch([STARTUP_SCRIPT], workdir, env, STARTUP_INPUT) for _ in range(runs)]
+        interpreter = [_launch(['-c', 'pass'], workdir, env) for _ in range(runs)]
+        imports = slowest_imports(workdir, env)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    median = statistics.median(times)
+    return {
+        'case': 'startup',
+        'runs': runs,
+        'median_ms': median,
+        'best_ms': min(times),
+        'interpreter_ms': statistics.median(interpreter),
+        'budget_ms': budget_ms,
+        'within_budget': median <= budget_ms,
+        'slowest_imports': imports,
+    }
+
+
+def print_startup(result):
+    print(f"mycomate.py to first frame and exit: median {result['median_ms']:.1f}ms, best {result['best_ms']:.1f}ms "
+          f"(bare interpreter {result['interpreter_ms']:.1f}ms) over {result['runs']} runs")
+    print("Slowest imports (cumulative):")
+    for module, ms in result['slowest_imports']:
+        print(f"  {module:<30}{ms:>8.1f}ms")
+    verdict = "within" if result['within_budget'] else "OVER"
+    print(f"\n{verdict} the {result['budget_ms']:g}ms budget")
+
+
+def compare(baseline, current, threshold=0.2):
+    """Rows of (key, baseline us/pet, current us/pet, ratio, regressed) for shared cases"""
+    rows = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        ratio = result['us_per_pet'] / base['us_per_pet'] if base['us_per_pet'] else float('inf')
+        rows.append((key, base['us_per_pet'], result['us_per_pet'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def print_result(result):
+    print(f"{result['case']:<20}{result['pets']:>9}{result['seconds']:>12.4f}{result['us_per_pet']:>12.2f}")
+
+
+def print_comparison(rows, threshold):
+    print(f"{'case':<30}{'base us':>10}{'now us':>10}{'ratio':>8}")
+    for key, base, now, ratio, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{key:<30}{base:>10.2f}{now:>10.2f}{ratio:>8.2f}{flag}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{regressions} of {len(rows)} cases slower than baseline by more than {threshold:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MycoMate benchmark suite")
+    commands = parser.add_subparsers(dest='command')
+    run = commands.add_parser('run', help="run the suite and save the results")
+    run.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                     help="comma-separated pet counts (default %(default)s)")
+    run.add_argument('--cases', help="comma-separated case names (default: all)")
+    run.add_argument('--repeat', type=int, default=3, help="runs per case, best is kept (default 3)")
+    run.add_argument('--output', help="JSON file for the results")
+    run.add_argument('--baseline', help="compare against this results file when done")
+    run.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown ratio (default 0.2)")
+    check = commands.add_parser('compare', help="compare two results files")
+    check.add_argument('baseline')
+    check.add_argument('current')
+    check.add_argument('--threshold', type=float, default=0.2, help="allowed slowdown ratio (default 0.2)")
+    startup = commands.add_parser('startup', help="time cold starts to the first frame")
+    startup.add_argument('--runs', type=int, default=20, help="interpreter launches (default 20)")
+    startup.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                         help="allowed median in milliseconds (default %(default)s)")
+    startup.add_argument('--output', help="JSON file for the result")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        sizes = [int(size) for size in args.sizes.split(',')]
+        cases = args.cases.split(',') if args.cases else None
+        print(f"{'case':<20}{'pets':>9}{'seconds':>12}{'us/pet':>12}")
+        document = run_suite(sizes, cases, args.repeat, print_result)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(document, f, indent=2)
+            print(f"\nSaved results to {args.output}")
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            print()
+            return 1 if print_comparison(compare(baseline, document, args.threshold), args.threshold) else 0
+    elif args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        return 1 if print_comparison(compare(baseline, current, args.threshold), args.threshold) else 0
+    elif args.command == 'startup':
+        result = run_startup(args.runs, args.budget_ms)
+        print_startup(result)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(result, f, indent=2)
+        return 0 if result['within_budget'] else 1
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,40 @@ import json
 import time
 import random
 import os
+import shutil
+import signal
 import sys
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+# Modules only saves and tools need are imported where they are used, to
+# keep startup fast (see the startup budget in benchmarks/bench_suite.py)
+
+def atomic_write_bytes(path, data):
+    """Write bytes via a temp file, fsync and rename, so a crash never leaves a torn save"""
+    import tempfile  # Saves run after the first frame, off the startup path
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        # Wrapped first so the fd is closed whatever fails below
+        with os.fdopen(fd, 'wb') as f:
+            # mkstemp creates files private to the user; keep the usual save permissions
+            try:
+                mode = os.stat(path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp_path, mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def atomic_write_json(path, data):
+    """Atomically replace path with data as JSON"""
+    atomic_write_bytes(path, json.dumps(data).encode('utf-8'))
 
 # Color constants for terminal output
 class Colors:
@@ -22,11 +54,697 @@ class Colors:
     BOLD = '\033[1m'    # Bold text
     RESET = '\033[0m'   # Reset to default
 
+# Fields of a save record, in storage order
+SAVE_FIELDS = (
+    'name', 'birth_time', 'last_update',
+    'hunger', 'happiness', 'health', 'cleanliness', 'energy',
+    'age', 'growth_stage', 'personality', 'favorite_food', 'mood',
+    'last_fed', 'last_played', 'last_cleaned', 'experience', 'level',
+)
+
+# Small-int codes: each name's code is its index in the tuple
+PERSONALITIES = ('shy', 'playful', 'curious', 'sleepy', 'energetic')
+FOODS = ('nutrients', 'compost', 'water', 'sunshine', 'minerals')
+FAVORITE_FOODS = ('water', 'compost', 'sunshine', 'minerals')  # nutrients is never a favorite
+STAGE_NAMES = ('Spore', 'Sprout', 'Young Mushroom', 'Mature Mushroom', 'Magical Mushroom')
+
+# Base stat decay rates per hour (reduced for better playability)
+HUNGER_DECAY = 4         # Was 5, reduced to be less aggressive
+HAPPINESS_DECAY = 2.5    # Was 3, slightly reduced
+CLEANLINESS_DECAY = 1.5  # Was 2, reduced as cleaning has 1hr cooldown
+ENERGY_DECAY = 3.5       # Was 4, slightly reduced
+
+# Personality decay multipliers: (hunger, happiness, cleanliness, energy)
+PERSONALITY_DECAY = {
+    # Burns energy much faster, high metabolism, gets dirty from being active
+    'energetic': (1.2, 1, 1.1, 1.3),
+    # Conserves energy very well, gets sad easier, slower metabolism when resting
+    'sleepy': (0.9, 1.2, 1, 0.6),
+    # Maintains happiness much better, uses energy for play but not excessively
+    'playful': (1, 0.7, 1, 1.1),
+    # Stays much cleaner, needs significantly more attention, conserves energy by hiding
+    'shy': (1, 1.3, 0.7, 0.9),
+    # Burns some calories investigating, exploration keeps them fairly content
+    'curious': (1.05, 0.85, 1, 1.15),
+}
+
+# Mood words by bucket, from the lowest average stats to the highest
+MOOD_WORDS = (
+    ('miserable', 'sick', 'dying'),
+    ('sad', 'worried', 'tired'),
+    ('okay', 'neutral', 'meh'),
+    ('happy', 'content', 'cheerful'),
+    ('ecstatic', 'joyful', 'blissful'),
+)
+
+MOODS = tuple(word for words in MOOD_WORDS for word in words)
+
+PERSONALITY_CODES = {personality: code for code, personality in enumerate(PERSONALITIES)}
+FOOD_CODES = {food: code for code, food in enumerate(FOODS)}
+MOOD_CODES = {mood: code for code, mood in enumerate(MOODS)}
+
+def _code_for(codes, kind, value):
+    """Look up the small-int code for a named value"""
+    try:
+        return codes[value]
+    except KeyError:
+        raise ValueError(f"Unknown {kind}: {value!r}")
+
+def get_mood_bucket(avg_stats):
+    """Map an average stat value to its mood bucket (index into MOOD_WORDS)"""
+    if avg_stats > 80:
+        return 4
+    elif avg_stats > 60:
+        return 3
+    elif avg_stats > 40:
+        return 2
+    elif avg_stats > 20:
+        return 1
+    return 0
+
+# Stat levels where the health rules change, highest first (0 is the floor)
+HUNGER_THRESHOLDS = (60, 20, 0)
+HAPPINESS_THRESHOLDS = (50, 15, 0)
+CLEANLINESS_THRESHOLDS = (60, 30, 0)
+ENERGY_THRESHOLDS = (40, 10, 0)
+STAT_THRESHOLDS = (HUNGER_THRESHOLDS, HAPPINESS_THRESHOLDS, CLEANLINESS_THRESHOLDS, ENERGY_THRESHOLDS)
+
+# Growth requirements, checked from the highest stage down:
+# (stage, age above (hours), health above or None, experience at least)
+GROWTH_REQUIREMENTS = (
+    (4, 48, 75, 400),   # magical: 2 days + conditions (reduced from 72hrs and 500xp)
+    (3, 30, 50, 0),     # mature: 30 hours (reduced from 48)
+    (2, 16, 35, 0),     # young: 16 hours (reduced from 24)
+    (1, 4, None, 0),    # sprout: 4 hours (reduced from 6)
+)
+
+def growth_gates(requirements):
+    """(HEALTH_LEVELS, GROWTH_AGES) for a GROWTH_REQUIREMENTS table"""
+    health = {0, 100} | {health for _, _, health, _ in requirements if health is not None}
+    return tuple(sorted(health)), tuple(sorted({age for _, age, _, _ in requirements}))
+
+# Health levels that gate growth, plus the 0-100 clamp, and the ages
+# (hours) where a new growth stage becomes possible
+HEALTH_LEVELS, GROWTH_AGES = growth_gates(GROWTH_REQUIREMENTS)
+
+def get_health_rate(hunger, happiness, cleanliness, energy):
+    """Health change per hour for the given stats"""
+    health_rate = 0
+    
+    # Negative health factors
+    if hunger < 20:
+        health_rate -= 6
+    if cleanliness < 30:
+        health_rate -= 4
+    if happiness < 15:
+        health_rate -= 2  # Very sad pets get sick
+    if energy < 10:
+        health_rate -= 1  # Exhaustion affects health
+    
+    # Positive health factors
+    good_care_stats = (hunger > 60) + (cleanliness > 60) + (happiness > 50) + (energy > 40)
+    if good_care_stats >= 3:
+        health_rate += 2
+    elif good_care_stats >= 2:
+        health_rate += 0.5
+    return health_rate
+
+def get_growth_stage(age, health, experience, current_stage):
+    """Growth stage for the given age (hours), health and experience"""
+    for stage, min_age, min_health, min_experience in GROWTH_REQUIREMENTS:
+        if age > min_age and (min_health is None or health > min_health) and experience >= min_experience:
+            return stage
+    return current_stage
+
+# Stats within this distance of a threshold count as on it. Without the
+# snap, a stat left a hair above a threshold gives fast_forward() a
+# zero-length step and it never finishes.
+SNAP_EPSILON = 1e-9
+
+def _snap_down(value, floor):
+    """value decreasing towards floor, snapped onto it once (nearly) reached"""
+    return floor if value < floor + SNAP_EPSILON else value
+
+def _snap_up(value, ceiling):
+    """value increasing towards ceiling, snapped onto it once (nearly) reached"""
+    return ceiling if value > ceiling - SNAP_EPSILON else value
+
+def _next_level_below(value, levels):
+    """Highest level strictly below value, or None"""
+    for level in levels:
+        if level < value:
+            return level
+    return None
+
+def get_decay_rates(personality):
+    """Per-hour (hunger, happiness, cleanliness, energy) decay for a personality"""
+    hunger_mult, happiness_mult, cleanliness_mult, energy_mult = PERSONALITY_DECAY.get(personality, (1, 1, 1, 1))
+    return (HUNGER_DECAY * hunger_mult, HAPPINESS_DECAY * happiness_mult,
+            CLEANLINESS_DECAY * cleanliness_mult, ENERGY_DECAY * energy_mult)
+
+def get_care_due_hours(hunger, happiness, cleanliness, energy, decay):
+    """Hours until a pet needs care: hunger below 20 or health falling
+    
+    The health rules only change where a stat crosses one of its
+    thresholds, so this walks those crossings (a handful at most). Returns
+    0 when care is already due, or None when it never will be.
+    """
+    stats = [hunger, happiness, cleanliness, energy]
+    hours = 0.0
+    while True:
+        step = None
+        floors = [_next_level_below(value, levels) for value, levels in zip(stats, STAT_THRESHOLDS)]
+        for value, rate, floor in zip(stats, decay, floors):
+            if floor is not None and rate > 0:
+                step = (value - floor) / rate if step is None else min(step, (value - floor) / rate)
+        # Rules hold until the next crossing, so read them halfway there
+        probe = step / 2 if step is not None else 1.0
+        probed = [max(0, value - rate * probe) for value, rate in zip(stats, decay)]
+        if probed[0] < 20 or get_health_rate(*probed) < 0:
+            return hours
+        if step is None:
+            return None  # Nothing left to decay
+        hours += step
+        stats = [_snap_down(max(0, value - rate * step), floor) if floor is not None else value
+                 for value, rate, floor in zip(stats, decay, floors)]
+
+# Clocks. Every time a pet reads comes from its clock (MushroomPet.clock),
+# so tests, benchmarks and simulations can run days of pet time in
+# milliseconds, deterministically, instead of waiting or patching time.
+class RealClock:
+    """Wall-clock time; the default clock of every pet"""
+    
+    def __init__(self):
+        self.time = time.time  # Reads go straight to the builtin
+    
+    def wait_seconds(self, seconds):
+        """Real seconds until this clock has moved on by `seconds`"""
+        return seconds
+
+class FixedClock:
+    """Time that stands still until set() or advance() moves it"""
+    
+    def __init__(self, now=0.0):
+        self.now = now
+    
+    def time(self):
+        return self.now
+    
+    def set(self, now):
+        self.now = now
+    
+    def advance(self, seconds):
+        self.now += seconds
+    
+    def wait_seconds(self, seconds):
+        return None  # Never moves by itself
+
+class AcceleratedClock:
+    """Real time running `speed` times faster from `start` (default: now)
+    
+    AcceleratedClock(3600) passes an hour of pet time every real second;
+    cooldowns, decay and growth all speed up alike.
+    """
+    
+    def __init__(self, speed, start=None):
+        self.speed = speed
+        self.start = time.time() if start is None else start
+        self._origin = time.monotonic()
+    
+    def time(self):
+        return self.start + (time.monotonic() - self._origin) * self.speed
+    
+    def wait_seconds(self, seconds):
+        return seconds / self.speed
+
+REAL_CLOCK = RealClock()
+
+# Change events. Every callable in EVENT_LISTENERS gets each PetEvent as it
+# happens; with no listeners registered, no event is ever built. See
+# mycomate_events.py for buffered streams and a JSONL sink.
+EVENT_LISTENERS = []
+
+EVENT_STATS = 'stats'            # deltas: {stat: change}, values: {stat: new value}
+EVENT_THRESHOLD = 'threshold'    # stat, level, direction ('below' or 'above')
+EVENT_MOOD = 'mood'              # mood (if known), bucket, old_bucket
+EVENT_LEVEL_UP = 'level_up'      # level
+EVENT_EVOLUTION = 'evolution'    # stage, stage_name
+
+# Stats in an event state, and the levels a threshold event is raised for
+EVENT_STAT_FIELDS = ('hunger', 'happiness', 'health', 'cleanliness', 'energy')
+EVENT_STAT_LEVELS = (HUNGER_THRESHOLDS, HAPPINESS_THRESHOLDS, HEALTH_LEVELS,
+                     CLEANLINESS_THRESHOLDS, ENERGY_THRESHOLDS)
+
+# Mood bucket of each mood code (MOODS lists MOOD_WORDS bucket by bucket)
+MOOD_BUCKETS = tuple(bucket for bucket, words in enumerate(MOOD_WORDS) for _ in words)
+
+class PetEvent:
+    """One change to one pet: kind (an EVENT_* constant), pet name, time, data"""
+    __slots__ = ('kind', 'pet', 'time', 'data')
+    
+    def __init__(self, kind, pet, time, data):
+        self.kind = kind
+        self.pet = pet
+        self.time = time
+        self.data = data
+    
+    def __repr__(self):
+        return f"PetEvent({self.kind!r}, {self.pet!r}, {self.data!r})"
+    
+    def to_dict(self):
+        return {'kind': self.kind, 'pet': self.pet, 'time': self.time, **self.data}
+
+def emit_event(kind, pet_name, when, **data):
+    """Send one event to every registered listener"""
+    event = PetEvent(kind, pet_name, when, data)
+    for listener in tuple(EVENT_LISTENERS):
+        listener(event)
+
+def event_state(pet):
+    """What change events compare: the stats, mood bucket, level and stage"""
+    return (pet.hunger, pet.happiness, pet.health, pet.cleanliness, pet.energy,
+            MOOD_BUCKETS[pet._mood], pet.level, pet.growth_stage)
+
+def emit_changes(pet_name, before, after, when, mood=None):
+    """Emit the events for a pet going from one event_state() to another"""
+    deltas = {}
+    values = {}
+    crossings = []
+    for stat, levels, old_value, new_value in zip(EVENT_STAT_FIELDS, EVENT_STAT_LEVELS, before, after):
+        if new_value == old_value:
+            continue
+        deltas[stat] = new_value - old_value
+        values[stat] = new_value
+        for level in levels:
+            if new_value < level <= old_value:
+                crossings.append((stat, level, 'below'))
+            elif old_value < level <= new_value:
+                crossings.append((stat, level, 'above'))
+    if deltas:
+        emit_event(EVENT_STATS, pet_name, when, deltas=deltas, values=values)
+    for stat, level, direction in crossings:
+        emit_event(EVENT_THRESHOLD, pet_name, when, stat=stat, level=level, direction=direction)
+    old_bucket, old_level, old_stage = before[5:]
+    bucket, level, stage = after[5:]
+    if bucket != old_bucket:
+        emit_event(EVENT_MOOD, pet_name, when, mood=mood or MOOD_WORDS[bucket][0],
+                   bucket=bucket, old_bucket=old_bucket)
+    if level > old_level:
+        emit_event(EVENT_LEVEL_UP, pet_name, when, level=level)
+    if stage > old_stage:
+        emit_event(EVENT_EVOLUTION, pet_name, when, stage=stage, stage_name=STAGE_NAMES[stage])
+
+# Care action rules, compiled once at import. Per-personality tables are
+# tuples indexed by personality code; response templates take {name},
+# {food} and {activity}.
+
+def _by_personality(rules):
+    """Freeze a personality -> rule mapping into a tuple indexed by code"""
+    return tuple(rules[personality] for personality in PERSONALITIES)
+
+# Cooldowns in seconds of the pet's clock, so they scale with AcceleratedClock
+FEED_COOLDOWN = 1800   # 30 min, but only if not very hungry
+PLAY_COOLDOWN = 1200   # 20 minutes
+CLEAN_COOLDOWN = 3600  # 1 hour
+
+# Rebalanced food effects (hunger, happiness, health)
+FOOD_EFFECTS = MappingProxyType({
+    'nutrients': (20, 8, 5),      # Balanced nutrition (reduced hunger gain, increased happiness)
+    'compost': (25, 5, 3),        # High hunger, low happiness, some health
+    'water': (12, 3, 2),          # Light meal, hydration focused
+    'sunshine': (8, 18, 8),       # Low hunger, high happiness and health
+    'minerals': (28, 2, 12),      # Very high hunger, low happiness, good health
+})
+DEFAULT_FOOD_EFFECT = (20, 5, 5)
+
+# Enhanced favorite food bonus (hunger, happiness, health, experience)
+FAVORITE_FOOD_BONUS = (8, 12, 3, 22)  # 22 XP = 15 bonus + 7 extra base XP; health bonus added
+
+# Play effects (happiness gain, energy cost, base XP) - base 18/12/12, reduced from 20/15/15
+PLAY_EFFECTS = _by_personality({
+    'playful': (23, 10, 15),
+    'energetic': (18, 15, 14),
+    'sleepy': (15, 14, 12),
+    'shy': (16, 12, 13),    # Gets more satisfaction from overcoming shyness
+    'curious': (18, 12, 12),
+})
+
+# Most energy a single rest can restore - base 25, reduced from 30
+REST_ENERGY_GAIN = _by_personality({
+    'sleepy': 35,      # Sleepy pets rest better
+    'energetic': 20,   # Energetic pets rest less efficiently
+    'playful': 25,
+    'shy': 25,
+    'curious': 25,
+})
+
+# Labels used in the stat change line after an action
+STAT_LABELS = MappingProxyType({
+    'hunger': "🍽️ Hunger",
+    'happiness': "😊 Happiness",
+    'health': "❤️ Health",
+    'cleanliness': "🧼 Cleanliness",
+    'energy': "⚡ Energy",
+    'experience': "⭐ XP",
+})
+
+FEED_RESPONSES = _by_personality({
+    'shy': (
+        "🤗 {name} quietly nibbles the {food}...",
+        "😊 {name} seems pleased with the {food}.",
+        "🙂 *soft munching* {name} enjoys their meal.",
+    ),
+    'playful': (
+        "🎉 {name} bounces excitedly while eating {food}!",
+        "😄 *happy wiggling* {name} loves this {food}!",
+        "🤸 {name} does a little dance before eating!",
+    ),
+    'curious': (
+        "🔍 {name} carefully examines the {food} before eating.",
+        "🤔 {name} seems intrigued by this {food}!",
+        "👁️ {name} studies the {food} with interest.",
+    ),
+    'sleepy': (
+        "😴 {name} drowsily munches on the {food}...",
+        "🥱 *yawn* {name} slowly enjoys their {food}.",
+        "💤 {name} eating makes them even more relaxed.",
+    ),
+    'energetic': (
+        "⚡ {name} quickly devours the {food}!",
+        "🚀 {name} enthusiastically chomps the {food}!",
+        "💨 *rapid munching* {name} can't wait to eat!",
+    ),
+})
+
+PLAY_ACTIVITIES = _by_personality({
+    'shy': (
+        "quietly exploring hidden spots",
+        "gentle leaf rustling",
+        "peaceful meditation",
+        "soft spore floating",
+    ),
+    'playful': (
+        "bouncy mushroom dancing",
+        "energetic cap wiggling",
+        "playful rolling around",
+        "joyful spore celebrations",
+    ),
+    'curious': (
+        "investigating interesting smells",
+        "examining tiny creatures",
+        "studying soil patterns",
+        "exploring new territories",
+    ),
+    'sleepy': (
+        "dreamy swaying motions",
+        "relaxed stretching",
+        "gentle breathing exercises",
+        "cozy burrowing games",
+    ),
+    'energetic': (
+        "high-speed spore racing",
+        "rapid growth competitions",
+        "intense soil digging",
+        "lightning-fast dancing",
+    ),
+})
+
+PLAY_RESPONSES = _by_personality({
+    'shy': (
+        "🤗 {name} shyly enjoys {activity}...",
+        "😌 {name} seems content after {activity}.",
+        "🙂 *quiet happiness* {name} had fun!",
+    ),
+    'playful': (
+        "🎉 {name} has a blast {activity}!",
+        "😄 *joyful bouncing* {name} loves {activity}!",
+        "🤸 {name} can't stop giggling after {activity}!",
+    ),
+    'curious': (
+        "🔍 {name} discovers something interesting while {activity}!",
+        "🤔 {name} learns something new from {activity}!",
+        "💡 {activity} sparks {name}'s curiosity!",
+    ),
+    'sleepy': (
+        "😴 {name} drowsily enjoys {activity}...",
+        "🥱 {activity} was relaxing for {name}.",
+        "💤 {name} feels peacefully tired after {activity}.",
+    ),
+    'energetic': (
+        "⚡ {name} energetically tackles {activity}!",
+        "🚀 {name} puts maximum effort into {activity}!",
+        "💨 {name} zooms through {activity} with enthusiasm!",
+    ),
+})
+
+CLEAN_RESPONSES = _by_personality({
+    'shy': (
+        "🤗 {name} quietly enjoys the gentle cleaning...",
+        "😌 {name} seems relaxed during their spa time.",
+        "🙂 *soft contentment* {name} feels much better now.",
+    ),
+    'playful': (
+        "🎉 {name} splashes happily during bath time!",
+        "😄 {name} makes bubbles and giggles!",
+        "🤸 {name} does happy wiggles while being cleaned!",
+    ),
+    'curious': (
+        "🔍 {name} examines each bubble with interest!",
+        "🤔 {name} seems fascinated by the cleaning process!",
+        "👁️ {name} watches the dirt wash away curiously.",
+    ),
+    'sleepy': (
+        "😴 {name} drowsily enjoys the warm, soothing bath...",
+        "🥱 *yawn* The cleaning is very relaxing for {name}.",
+        "💤 {name} almost falls asleep during the spa treatment.",
+    ),
+    'energetic': (
+        "⚡ {name} enthusiastically helps with the cleaning!",
+        "🚀 {name} can't sit still during bath time!",
+        "💨 {name} is excited to get squeaky clean!",
+    ),
+})
+
+REST_RESPONSES = _by_personality({
+    'shy': (
+        "🤗 {name} quietly curls up for a peaceful rest...",
+        "😌 {name} finds a cozy, hidden spot to nap.",
+        "🙂 *soft snoring* {name} dreams sweetly.",
+    ),
+    'playful': (
+        "🎉 {name} bounces into their favorite sleeping spot!",
+        "😄 {name} does a happy spin before settling down!",
+        "🤸 Even while resting, {name} wiggles with joy!",
+    ),
+    'curious': (
+        "🔍 {name} examines their sleeping area before resting.",
+        "🤔 {name} wonders what dreams will come!",
+        "👁️ {name} studies the patterns in the soil while dozing.",
+    ),
+    'sleepy': (
+        "😴 {name} yawns and easily drifts off to sleep...",
+        "🥱 *stretch* {name} was ready for this nap!",
+        "💤 {name} falls into the deepest, most restful sleep.",
+    ),
+    'energetic': (
+        "⚡ {name} reluctantly slows down for a power nap!",
+        "🚀 {name} charges up their energy reserves!",
+        "💨 Even while resting, {name} seems ready to go!",
+    ),
+})
+
+ACTION_RESPONSES = MappingProxyType({
+    'feed': FEED_RESPONSES,
+    'play': PLAY_RESPONSES,
+    'clean': CLEAN_RESPONSES,
+    'rest': REST_RESPONSES,
+})
+
+# Messages for actions the pet refuses, keyed by ActionResult.key
+REFUSAL_MESSAGES = MappingProxyType({
+    'not_hungry': "🥱 {name} is not hungry right now! {c.YELLOW}(Hunger: {hunger:.0f}%){c.RESET}",
+    'digesting': "⏰ {name} is still digesting! Try again in {c.YELLOW}{minutes:.0f} minutes{c.RESET}.",
+    'play_cooldown': "😴 {name} needs to rest between play sessions! Try again in {c.YELLOW}{minutes:.0f} minutes{c.RESET}.",
+    'too_tired': "😫 {name} is too tired to play! {c.RED}(Energy: {energy:.0f}%){c.RESET} Let them rest first.",
+    'clean_cooldown': "✨ {name} is already clean! {c.YELLOW}(Next cleaning in {minutes:.0f} minutes){c.RESET}",
+    'already_clean': "🧼 {name} is already sparkling clean! {c.YELLOW}(Cleanliness: {cleanliness:.0f}%){c.RESET}",
+    'well_rested': "⚡ {name} is already well-rested! {c.YELLOW}(Energy: {energy:.0f}%){c.RESET}",
+})
+
+# ASCII art by growth stage, for happy, sad and other moods
+ASCII_ART = (
+    {  # spore
+        'happy': "  ○\n  ·",
+        'sad': "  ○\n  .",
+        'default': "  ●\n  ·"
+    },
+    {  # sprout
+        'happy': "  |\n ○○\n  |",
+        'sad': "  |\n ●●\n  |",
+        'default': "  |\n ◦◦\n  |"
+    },
+    {  # young
+        'happy': "  🍄\n ◉ ◉\n  \\_/",
+        'sad': "  🍄\n ● ●\n  ___",
+        'default': "  🍄\n ○ ○\n  ~~"
+    },
+    {  # mature
+        'happy': "   🍄🍄\n  ^◉ ◉^\n   \\_/\n    |",
+        'sad': "   🍄🍄\n  ×● ●×\n   ___\n    |",
+        'default': "   🍄🍄\n  ○ ○ ○\n   ~~~\n    |"
+    },
+    {  # magical
+        'happy': " ✨🍄✨🍄✨\n  ^◉   ◉^\n   \\___/\n  ~~~ ~~~",
+        'sad': " ⚡🍄⚡🍄⚡\n  ×●   ●×\n   _____\n  --- ---",
+        'default': " ★ 🍄★🍄 ★\n  ◐   ◑\n   ~~~~~\n  ≋≋≋≋≋"
+    },
+)
+
+HAPPY_ART_MOODS = ('happy', 'ecstatic', 'joyful', 'blissful', 'cheerful')
+SAD_ART_MOODS = ('sad', 'miserable', 'sick', 'dying', 'worried')
+
+# Art kind for each mood code
+ART_KIND_BY_MOOD = tuple('happy' if mood in HAPPY_ART_MOODS else 'sad' if mood in SAD_ART_MOODS else 'default'
+                         for mood in MOODS)
+
+class RenderCache:
+    """Bounded LRU cache of rendered UI fragments, with hit/miss counters
+    
+    Keys are the quantized visible state a fragment depends on, so pets (or
+    clients) that would render the same text share one prebuilt copy.
+    """
+    
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, build, *args):
+        """Cached fragment for key, calling build(*args) on a miss"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+        value = build(*args)
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self):
+        """Counters as a dict: hits, misses, size, maxsize, hit_rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data),
+                    'maxsize': self.maxsize, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+# Shared by get_status() and draw_ui()
+RENDER_CACHE = RenderCache()
+
+def _bar_key(value, length):
+    """What a status bar shows for value: filled cells and rounded percent"""
+    return int((value / 100) * length), round(value)
+
+class ActionResult:
+    """Structured outcome of a care action
+    
+    Holds the stat changes, XP and level-up flag as plain data. The colored
+    message, including the random flavor text, is only built when the
+    result is rendered with str() or render(), so headless callers never
+    pay for it.
+    """
+    __slots__ = ('pet', 'action', 'key', 'changes', 'leveled_up', 'level', 'params', '_text')
+    
+    def __init__(self, pet, action, key, changes=(), leveled_up=False, params=None):
+        self.pet = pet
+        self.action = action          # feed, play, clean or rest
+        self.key = key                # Message key: the action itself, or a REFUSAL_MESSAGES key
+        self.changes = changes        # (stat, old value, new value) for every stat that moved
+        self.leveled_up = leveled_up
+        self.level = pet.level
+        self.params = params or {}
+        self._text = None
+    
+    @property
+    def ok(self):
+        """True if the action was carried out"""
+        return self.key == self.action
+    
+    @property
+    def deltas(self):
+        """Stat changes as {stat: change}"""
+        return {stat: new_value - old_value for stat, old_value, new_value in self.changes}
+    
+    @property
+    def xp(self):
+        """Experience gained"""
+        return self.deltas.get('experience', 0)
+    
+    def render(self):
+        """Human-readable message with color codes (built once, then cached)"""
+        if self._text is None:
+            self._text = self._render()
+        return self._text
+    
+    __str__ = render
+    
+    def __repr__(self):
+        return f"ActionResult({self.action!r}, {self.key!r}, deltas={self.deltas!r}, leveled_up={self.leveled_up})"
+    
+    def _render(self):
+        pet = self.pet
+        if not self.ok:
+            return REFUSAL_MESSAGES[self.key].format(name=pet.name, c=Colors, **self.params)
+        
+        # Personality-based flavor text
+        personality = pet._personality
+        activity = random.choice(PLAY_ACTIVITIES[personality]) if self.action == 'play' else None
+        response = random.choice(ACTION_RESPONSES[self.action][personality]).format(
+            name=pet.name, activity=activity, **self.params)
+        if self.params.get('favorite'):
+            response += f" ✨ {Colors.CYAN}It's their favorite!{Colors.RESET} ✨"
+        
+        # Stat change display
+        changes = [pet.format_stat_change(STAT_LABELS[stat], old_value, new_value)
+                   for stat, old_value, new_value in self.changes]
+        text = f"{response}\n{' | '.join(changes)}"
+        
+        # Add level up celebration if applicable
+        if self.leveled_up:
+            text += "\n\n" + pet.get_level_up_celebration(self.level)
+        return text
+
 class MushroomPet:
-    def __init__(self, name="Sporeling"):
+    # Compact layout: no per-instance __dict__, and the personality, favorite
+    # food and mood are stored as small-int codes behind string properties.
+    # _evolution_celebration stays unset until the pet evolves.
+    __slots__ = (
+        'name', 'birth_time', 'last_update',
+        'hunger', 'happiness', 'health', 'cleanliness', 'energy',
+        'age', 'growth_stage', 'size',
+        '_personality', '_favorite_food', '_mood',
+        'last_fed', 'last_played', 'last_cleaned', 'experience', 'level',
+        '_save_file', '_evolution_celebration', 'clock',
+    )
+    
+    def __init__(self, name="Sporeling", clock=None):
         self.name = name
-        self.birth_time = time.time()
-        self.last_update = time.time()
+        self.clock = clock or REAL_CLOCK  # Source of every time the pet reads
+        self.birth_time = self.clock.time()
+        self.last_update = self.birth_time
         
         # Pet stats (0-100)
         self.hunger = 50
@@ -41,59 +759,71 @@ class MushroomPet:
         self.size = 1
         
         # Special attributes
-        self.personality = random.choice(['shy', 'playful', 'curious', 'sleepy', 'energetic'])
-        self.favorite_food = random.choice(['water', 'compost', 'sunshine', 'minerals'])
+        self.personality = random.choice(PERSONALITIES)
+        self.favorite_food = random.choice(FAVORITE_FOODS)
         self.mood = 'content'
         
         # Game mechanics
-        self.last_fed = time.time()
-        self.last_played = time.time()
-        self.last_cleaned = time.time()
+        self.last_fed = self.last_played = self.last_cleaned = self.birth_time
         self.experience = 0
         self.level = 1
         
-        # File for persistence
-        self.save_file = f".mushroom_pet_{name.lower()}.json"
-        
+        # File for persistence (derived from the name unless overridden)
+        self._save_file = None
+    
+    @property
+    def personality(self):
+        return PERSONALITIES[self._personality]
+    
+    @personality.setter
+    def personality(self, value):
+        self._personality = _code_for(PERSONALITY_CODES, 'personality', value)
+    
+    @property
+    def favorite_food(self):
+        return FOODS[self._favorite_food]
+    
+    @favorite_food.setter
+    def favorite_food(self, value):
+        self._favorite_food = _code_for(FOOD_CODES, 'food', value)
+    
+    @property
+    def mood(self):
+        return MOODS[self._mood]
+    
+    @mood.setter
+    def mood(self, value):
+        self._mood = _code_for(MOOD_CODES, 'mood', value)
+    
+    @property
+    def save_file(self):
+        if self._save_file is None:
+            return f".mushroom_pet_{self.name.lower()}.json"
+        return self._save_file
+    
+    @save_file.setter
+    def save_file(self, value):
+        self._save_file = value
+    
     def get_age_in_hours(self):
         """Calculate age in hours"""
-        return (time.time() - self.birth_time) / 3600
+        return (self.clock.time() - self.birth_time) / 3600
+    
+    def get_decay_rates(self):
+        """Get per-hour (hunger, happiness, cleanliness, energy) decay for this personality"""
+        return get_decay_rates(self.personality)
     
     def update_stats(self):
         """Update pet stats based on time passage"""
-        current_time = time.time()
+        current_time = self.clock.time()
         time_passed = (current_time - self.last_update) / 3600  # in hours
         
         if time_passed < 0.01:  # Less than 36 seconds, no update needed
             return
+        before = event_state(self) if EVENT_LISTENERS else None
             
-        # Improved stat decay rates for better balance
-        # Base decay rates per hour (reduced for better playability)
-        hunger_decay = 4  # Was 5, reduced to be less aggressive
-        happiness_decay = 2.5  # Was 3, slightly reduced
-        cleanliness_decay = 1.5  # Was 2, reduced as cleaning has 1hr cooldown
-        energy_decay = 3.5  # Was 4, slightly reduced
-        
         # Personality affects decay rates - each with distinct characteristics
-        if self.personality == 'energetic':
-            energy_decay *= 1.3  # Burns energy much faster from constant activity
-            hunger_decay *= 1.2  # High metabolism from being active
-            cleanliness_decay *= 1.1  # Gets dirty from being active
-        elif self.personality == 'sleepy':
-            energy_decay *= 0.6  # Conserves energy very well
-            happiness_decay *= 1.2  # Gets sad easier without stimulation
-            hunger_decay *= 0.9  # Slower metabolism when resting
-        elif self.personality == 'playful':
-            happiness_decay *= 0.7  # Maintains happiness much better
-            energy_decay *= 1.1  # Uses energy for play but not excessively
-        elif self.personality == 'shy':
-            cleanliness_decay *= 0.7  # Stays much cleaner (hides and avoids mess)
-            happiness_decay *= 1.3  # Needs significantly more attention
-            energy_decay *= 0.9  # Conserves energy by hiding
-        elif self.personality == 'curious':
-            energy_decay *= 1.15  # Uses energy exploring
-            hunger_decay *= 1.05  # Burns some calories investigating
-            happiness_decay *= 0.85  # Exploration keeps them fairly content
+        hunger_decay, happiness_decay, cleanliness_decay, energy_decay = self.get_decay_rates()
         
         # Apply decay
         self.hunger = max(0, self.hunger - (time_passed * hunger_decay))
@@ -102,29 +832,7 @@ class MushroomPet:
         self.energy = max(0, self.energy - (time_passed * energy_decay))
         
         # Improved health system with more granular changes
-        health_change = 0
-        
-        # Negative health factors
-        if self.hunger < 20:
-            health_change -= time_passed * 6  # Was 8, reduced severity
-        if self.cleanliness < 30:
-            health_change -= time_passed * 4
-        if self.happiness < 15:
-            health_change -= time_passed * 2  # Very sad pets get sick
-        if self.energy < 10:
-            health_change -= time_passed * 1  # Exhaustion affects health
-        
-        # Positive health factors (more achievable conditions)
-        good_care_stats = 0
-        if self.hunger > 60: good_care_stats += 1
-        if self.cleanliness > 60: good_care_stats += 1
-        if self.happiness > 50: good_care_stats += 1
-        if self.energy > 40: good_care_stats += 1
-        
-        if good_care_stats >= 3:
-            health_change += time_passed * 2
-        elif good_care_stats >= 2:
-            health_change += time_passed * 0.5
+        health_change = time_passed * get_health_rate(self.hunger, self.happiness, self.cleanliness, self.energy)
         
         # Apply health change
         self.health = max(0, min(100, self.health + health_change))
@@ -132,16 +840,7 @@ class MushroomPet:
         # Age and growth
         self.age = self.get_age_in_hours()
         old_stage = self.growth_stage
-        
-        # Improved growth requirements for better progression balance
-        if self.age > 48 and self.health > 75 and self.experience >= 400:  # 2 days + conditions (reduced from 72hrs and 500xp)
-            self.growth_stage = 4  # magical
-        elif self.age > 30 and self.health > 50:  # 30 hours (reduced from 48)
-            self.growth_stage = 3  # mature
-        elif self.age > 16 and self.health > 35:  # 16 hours (reduced from 24)
-            self.growth_stage = 2  # young
-        elif self.age > 4:  # 4 hours (reduced from 6)
-            self.growth_stage = 1  # sprout
+        self.growth_stage = get_growth_stage(self.age, self.health, self.experience, self.growth_stage)
         
         if self.growth_stage > old_stage:
             self.experience += 100  # Bonus for growing
@@ -152,65 +851,164 @@ class MushroomPet:
         self.update_mood()
         
         self.last_update = current_time
+        if before is not None:
+            emit_changes(self.name, before, event_state(self), current_time, self.mood)
+    
+    def fast_forward(self, current_time=None):
+        """Advance stats exactly to current_time, e.g. after a long absence
+        
+        update_stats() takes one linear step and checks the health rules on
+        the end values. This instead splits the elapsed time at every moment
+        a stat, health or age crosses a rule threshold and integrates each
+        segment with the rules that hold during it, so the cost depends on
+        the number of crossings rather than the length of the absence.
+        """
+        if current_time is None:
+            current_time = self.clock.time()
+        remaining = (current_time - self.last_update) / 3600  # in hours
+        
+        if remaining < 0.01:  # Same cutoff as update_stats
+            return
+        before = event_state(self) if EVENT_LISTENERS else None
+        
+        stats = [self.hunger, self.happiness, self.cleanliness, self.energy]
+        decay = self.get_decay_rates()
+        health = self.health
+        age = (self.last_update - self.birth_time) / 3600
+        old_stage = self.growth_stage
+        
+        while remaining > 0:
+            # Longest step before any decaying stat or the age crosses a threshold
+            step = remaining
+            floors = []
+            for value, rate, levels in zip(stats, decay, STAT_THRESHOLDS):
+                floor = _next_level_below(value, levels)
+                floors.append(floor if floor is not None else 0)
+                if floor is not None and rate > 0:
+                    step = min(step, (value - floor) / rate)
+            for growth_age in GROWTH_AGES:
+                if growth_age > age:
+                    step = min(step, growth_age - age)
+                    break
+            
+            # Health rules are constant over the step, so read them at its midpoint
+            hunger, happiness, cleanliness, energy = [max(0, value - rate * step / 2)
+                                                      for value, rate in zip(stats, decay)]
+            health_rate = get_health_rate(hunger, happiness, cleanliness, energy)
+            
+            # Health itself may reach a growth gate or the 0-100 clamp first
+            start_health = health
+            if health_rate > 0 and health < 100:
+                level = min(level for level in HEALTH_LEVELS if level > health)
+                step = min(step, (level - health) / health_rate)
+                health = _snap_up(health + health_rate * step, level)
+            elif health_rate < 0 and health > 0:
+                level = max(level for level in HEALTH_LEVELS if level < health)
+                step = min(step, (level - health) / health_rate)
+                health = _snap_down(health + health_rate * step, level)
+            
+            # Snap each stat to its threshold to absorb float error
+            stats = [_snap_down(value - rate * step, floor) for value, rate, floor in zip(stats, decay, floors)]
+            age += step
+            remaining = remaining - step if step < remaining else 0
+            
+            # Growth gates are strict (age > 16, health > 35), so one can hold
+            # inside a step but not at its end, where the step stops on the
+            # gate itself; check the midpoint as well as the end
+            for check_age, check_health in ((age - step / 2, (start_health + health) / 2), (age, health)):
+                stage = get_growth_stage(check_age, check_health, self.experience, self.growth_stage)
+                if stage > self.growth_stage:
+                    self.experience += 100  # Bonus for growing
+                self.growth_stage = stage
+        
+        self.hunger, self.happiness, self.cleanliness, self.energy = stats
+        self.health = health
+        self.age = (current_time - self.birth_time) / 3600
+        if self.growth_stage > old_stage:
+            self._evolution_celebration = self.get_growth_celebration(self.growth_stage)
+        
+        self.update_mood()
+        self.last_update = current_time
+        if before is not None:
+            emit_changes(self.name, before, event_state(self), current_time, self.mood)
+    
+    def next_threshold_time(self):
+        """Time of the next rule threshold crossing after last_update, or None
+        
+        Covers the stat thresholds of the decay and health rules, the growth
+        ages and the health levels that gate growth. Until then no rule
+        changes, so a scheduler can leave the pet alone.
+        """
+        stats = (self.hunger, self.happiness, self.cleanliness, self.energy)
+        decay = self.get_decay_rates()
+        step = None
+        for value, rate, levels in zip(stats, decay, STAT_THRESHOLDS):
+            floor = _next_level_below(value, levels)
+            if floor is not None and rate > 0:
+                hours = (value - floor) / rate
+                step = hours if step is None else min(step, hours)
+        age = (self.last_update - self.birth_time) / 3600
+        # Growth needs age and health strictly above their gates, so a pet
+        # sitting exactly on one is due again right away
+        for growth_age in GROWTH_AGES:
+            if growth_age >= age:
+                step = growth_age - age if step is None else min(step, growth_age - age)
+                break
+        
+        # Health rules hold until the first crossing, so read them halfway there
+        probe = step / 2 if step is not None else 1.0
+        health_rate = get_health_rate(*[max(0, value - rate * probe) for value, rate in zip(stats, decay)])
+        hours = None
+        if health_rate > 0 and self.health < 100:
+            hours = (min(level for level in HEALTH_LEVELS if level >= self.health) - self.health) / health_rate
+        elif health_rate < 0 and self.health > 0:
+            hours = (max(level for level in HEALTH_LEVELS if level < self.health) - self.health) / health_rate
+        if hours is not None:
+            step = hours if step is None else min(step, hours)
+        
+        if step is None:
+            return None  # Fully decayed and grown: nothing left to cross
+        return self.last_update + step * 3600
+    
+    def care_due_time(self):
+        """Time the pet starts needing care (hunger below 20 or health falling), or None
+        
+        Projected from last_update, so it is at most last_update when the
+        pet needs care already.
+        """
+        hours = get_care_due_hours(self.hunger, self.happiness, self.cleanliness, self.energy,
+                                   self.get_decay_rates())
+        return None if hours is None else self.last_update + hours * 3600
     
     def update_mood(self):
-        """Update mood based on current stats"""
-        avg_stats = (self.hunger + self.happiness + self.health + self.cleanliness + self.energy) / 5
+        """Update mood based on current stats
         
-        if avg_stats > 80:
-            self.mood = random.choice(['ecstatic', 'joyful', 'blissful'])
-        elif avg_stats > 60:
-            self.mood = random.choice(['happy', 'content', 'cheerful'])
-        elif avg_stats > 40:
-            self.mood = random.choice(['okay', 'neutral', 'meh'])
-        elif avg_stats > 20:
-            self.mood = random.choice(['sad', 'worried', 'tired'])
-        else:
-            self.mood = random.choice(['miserable', 'sick', 'dying'])
+        A new word is only drawn when the average stats cross into another
+        mood bucket, so the mood, the art and the render cache keys built
+        from them stay put while the stats drift within a bucket.
+        """
+        avg_stats = (self.hunger + self.happiness + self.health + self.cleanliness + self.energy) / 5
+        bucket = get_mood_bucket(avg_stats)
+        if MOOD_BUCKETS[self._mood] != bucket:
+            self.mood = random.choice(MOOD_WORDS[bucket])
+    
+    @property
+    def mood_bucket(self):
+        """Index into MOOD_WORDS of the current mood"""
+        return MOOD_BUCKETS[self._mood]
+    
+    @property
+    def art_key(self):
+        """(growth stage, art kind) selecting the pet's ASCII art"""
+        return (self.growth_stage, ART_KIND_BY_MOOD[self._mood])
     
     def get_ascii_art(self):
         """Get ASCII art based on growth stage and mood"""
-        arts = {
-            0: {  # spore
-                'happy': "  ○\n  ·",
-                'sad': "  ○\n  .",
-                'default': "  ●\n  ·"
-            },
-            1: {  # sprout
-                'happy': "  |\n ○○\n  |",
-                'sad': "  |\n ●●\n  |",
-                'default': "  |\n ◦◦\n  |"
-            },
-            2: {  # young
-                'happy': "  🍄\n ◉ ◉\n  \\_/",
-                'sad': "  🍄\n ● ●\n  ___",
-                'default': "  🍄\n ○ ○\n  ~~"
-            },
-            3: {  # mature
-                'happy': "   🍄🍄\n  ^◉ ◉^\n   \\_/\n    |",
-                'sad': "   🍄🍄\n  ×● ●×\n   ___\n    |",
-                'default': "   🍄🍄\n  ○ ○ ○\n   ~~~\n    |"
-            },
-            4: {  # magical
-                'happy': " ✨🍄✨🍄✨\n  ^◉   ◉^\n   \\___/\n  ~~~ ~~~",
-                'sad': " ⚡🍄⚡🍄⚡\n  ×●   ●×\n   _____\n  --- ---",
-                'default': " ★ 🍄★🍄 ★\n  ◐   ◑\n   ~~~~~\n  ≋≋≋≋≋"
-            }
-        }
-        
-        stage_art = arts.get(self.growth_stage, arts[0])
-        
-        if self.mood in ['happy', 'ecstatic', 'joyful', 'blissful', 'cheerful']:
-            return stage_art.get('happy', stage_art['default'])
-        elif self.mood in ['sad', 'miserable', 'sick', 'dying', 'worried']:
-            return stage_art.get('sad', stage_art['default'])
-        else:
-            return stage_art['default']
+        return ASCII_ART[self.growth_stage][ART_KIND_BY_MOOD[self._mood]]
     
     def get_stage_name(self):
         """Get the name of current growth stage"""
-        stages = ['Spore', 'Sprout', 'Young Mushroom', 'Mature Mushroom', 'Magical Mushroom']
-        return stages[self.growth_stage]
+        return STAGE_NAMES[self.growth_stage]
     
     def format_stat_change(self, stat_name, old_value, new_value):
         """Format stat changes with colors and visual indicators"""
@@ -237,7 +1035,7 @@ class MushroomPet:
     
     def get_growth_celebration(self, new_stage):
         """Create celebration message for growth stage evolution"""
-        stage_names = ['Spore', 'Sprout', 'Young Mushroom', 'Mature Mushroom', 'Magical Mushroom']
+        stage_names = STAGE_NAMES
         stage_emojis = ['🌱', '🌿', '🍄', '🍄🍄', '✨🍄✨']
         
         celebration = f"""
@@ -251,45 +1049,60 @@ class MushroomPet:
 """
         return celebration
 
+    def _finish_action(self, action, stats, old_values, xp, params=None):
+        """Shared tail of every care action: award XP, level up, record changes"""
+        old_experience = self.experience
+        old_level = self.level
+        self.experience += xp
+        
+        # Check for level up
+        new_level = 1 + (self.experience // 100)
+        leveled_up = new_level > old_level
+        if leveled_up:
+            self.level = new_level
+        
+        changes = [(stat, old_value, getattr(self, stat)) for stat, old_value in zip(stats, old_values)
+                   if getattr(self, stat) != old_value]
+        if self.experience > old_experience:
+            changes.append(('experience', old_experience, self.experience))
+        
+        if EVENT_LISTENERS:
+            after = event_state(self)
+            before = list(after)
+            for stat, old_value, _ in changes:
+                if stat in EVENT_STAT_FIELDS:
+                    before[EVENT_STAT_FIELDS.index(stat)] = old_value
+            before[6] = old_level
+            emit_changes(self.name, before, after, self.clock.time())
+        
+        return ActionResult(self, action, action, tuple(changes), leveled_up, params)
+    
     def feed(self, food_type='nutrients'):
         """Feed the pet"""
-        current_time = time.time()
+        current_time = self.clock.time()
         
         # Check if actually hungry first
         if self.hunger > 85:
-            return f"🥱 {self.name} is not hungry right now! {Colors.YELLOW}(Hunger: {self.hunger:.0f}%){Colors.RESET}"
+            return ActionResult(self, 'feed', 'not_hungry', params={'hunger': self.hunger})
         
         # Only apply cooldown if recently fed AND not very hungry
         time_since_fed = current_time - self.last_fed
-        if time_since_fed < 1800 and self.hunger > 60:  # 30 min cooldown, but only if not very hungry
-            minutes_left = (1800 - time_since_fed) / 60
-            return f"⏰ {self.name} is still digesting! Try again in {Colors.YELLOW}{minutes_left:.0f} minutes{Colors.RESET}."
-        
-        # Rebalanced food effects (hunger, happiness, health)
-        food_effects = {
-            'nutrients': (20, 8, 5),      # Balanced nutrition (reduced hunger gain, increased happiness)
-            'compost': (25, 5, 3),        # High hunger, low happiness, some health
-            'water': (12, 3, 2),          # Light meal, hydration focused
-            'sunshine': (8, 18, 8),       # Low hunger, high happiness and health
-            'minerals': (28, 2, 12)       # Very high hunger, low happiness, good health
-        }
-        
-        hunger_gain, happiness_gain, health_gain = food_effects.get(food_type, (20, 5, 5))
+        if time_since_fed < FEED_COOLDOWN and self.hunger > 60:
+            minutes_left = (FEED_COOLDOWN - time_since_fed) / 60
+            return ActionResult(self, 'feed', 'digesting', params={'minutes': minutes_left})
         
-        # Store old values for comparison
-        old_hunger = self.hunger
-        old_happiness = self.happiness
-        old_health = self.health
-        old_experience = self.experience
-        old_level = self.level
+        hunger_gain, happiness_gain, health_gain = FOOD_EFFECTS.get(food_type, DEFAULT_FOOD_EFFECT)
+        old_values = (self.hunger, self.happiness, self.health)
         
-        # Enhanced favorite food bonus
+        # Improved XP distribution based on action quality
+        xp = 8  # Reduced from 10
         is_favorite = food_type == self.favorite_food
         if is_favorite:
-            hunger_gain += 8   # Reduced from 10
-            happiness_gain += 12  # Reduced from 15
-            health_gain += 3   # Added health bonus for favorite food
-            self.experience += 15  # Reduced from 20
+            hunger_bonus, happiness_bonus, health_bonus, xp_bonus = FAVORITE_FOOD_BONUS
+            hunger_gain += hunger_bonus
+            happiness_gain += happiness_bonus
+            health_gain += health_bonus
+            xp += xp_bonus
         
         # Apply changes
         self.hunger = min(100, self.hunger + hunger_gain)
@@ -297,362 +1110,84 @@ class MushroomPet:
         self.health = min(100, self.health + health_gain)
         self.last_fed = current_time
         
-        # Improved XP distribution based on action quality
-        base_xp = 8  # Reduced from 10
-        if is_favorite:
-            base_xp += 7  # Total 15 for favorite food
         if self.hunger < 30:  # Bonus for feeding when very hungry
-            base_xp += 3
+            xp += 3
         
-        self.experience += base_xp
-        
-        # Check for level up
-        new_level = 1 + (self.experience // 100)
-        leveled_up = new_level > old_level
-        if leveled_up:
-            self.level = new_level
-        
-        # Create stat change display
-        changes = []
-        if self.hunger > old_hunger:
-            changes.append(self.format_stat_change("🍽️ Hunger", old_hunger, self.hunger))
-        if self.happiness > old_happiness:
-            changes.append(self.format_stat_change("😊 Happiness", old_happiness, self.happiness))
-        if self.health > old_health:
-            changes.append(self.format_stat_change("❤️ Health", old_health, self.health))
-        if self.experience > old_experience:
-            changes.append(self.format_stat_change("⭐ XP", old_experience, self.experience))
-        
-        change_text = " | ".join(changes) if changes else ""
-        
-        # Enhanced responses with personality
-        personality_responses = {
-            'shy': [
-                f"🤗 {self.name} quietly nibbles the {food_type}...",
-                f"😊 {self.name} seems pleased with the {food_type}.",
-                f"🙂 *soft munching* {self.name} enjoys their meal."
-            ],
-            'playful': [
-                f"🎉 {self.name} bounces excitedly while eating {food_type}!",
-                f"😄 *happy wiggling* {self.name} loves this {food_type}!",
-                f"🤸 {self.name} does a little dance before eating!"
-            ],
-            'curious': [
-                f"🔍 {self.name} carefully examines the {food_type} before eating.",
-                f"🤔 {self.name} seems intrigued by this {food_type}!",
-                f"👁️ {self.name} studies the {food_type} with interest."
-            ],
-            'sleepy': [
-                f"😴 {self.name} drowsily munches on the {food_type}...",
-                f"🥱 *yawn* {self.name} slowly enjoys their {food_type}.",
-                f"💤 {self.name} eating makes them even more relaxed."
-            ],
-            'energetic': [
-                f"⚡ {self.name} quickly devours the {food_type}!",
-                f"🚀 {self.name} enthusiastically chomps the {food_type}!",
-                f"💨 *rapid munching* {self.name} can't wait to eat!"
-            ]
-        }
-        
-        base_response = random.choice(personality_responses.get(self.personality, [
-            f"🍄 {self.name} happily munches on the {food_type}! *nom nom*",
-            f"😋 {self.name} seems to really enjoy the {food_type}!",
-            f"🤤 *munch munch* {self.name} is satisfied!"
-        ]))
-        
-        # Add favorite food bonus message
-        if is_favorite:
-            base_response += f" ✨ {Colors.CYAN}It's their favorite!{Colors.RESET} ✨"
-        
-        # Combine response with stat changes
-        full_response = f"{base_response}\n{change_text}"
-        
-        # Add level up celebration if applicable
-        if leveled_up:
-            full_response += "\n\n" + self.get_level_up_celebration(new_level)
-        
-        return full_response
+        return self._finish_action('feed', ('hunger', 'happiness', 'health'), old_values, xp,
+                                   {'food': food_type, 'favorite': is_favorite})
     
     def play(self):
         """Play with the pet"""
-        current_time = time.time()
+        current_time = self.clock.time()
         
-        if current_time - self.last_played < 1200:  # 20 minutes cooldown
-            minutes_left = (1200 - (current_time - self.last_played)) / 60
-            return f"😴 {self.name} needs to rest between play sessions! Try again in {Colors.YELLOW}{minutes_left:.0f} minutes{Colors.RESET}."
+        if current_time - self.last_played < PLAY_COOLDOWN:
+            minutes_left = (PLAY_COOLDOWN - (current_time - self.last_played)) / 60
+            return ActionResult(self, 'play', 'play_cooldown', params={'minutes': minutes_left})
         
         if self.energy < 30:  # Increased threshold to avoid the gap
-            return f"😫 {self.name} is too tired to play! {Colors.RED}(Energy: {self.energy:.0f}%){Colors.RESET} Let them rest first."
-        
-        # Personality-based play activities
-        personality_activities = {
-            'shy': [
-                "quietly exploring hidden spots",
-                "gentle leaf rustling",
-                "peaceful meditation",
-                "soft spore floating"
-            ],
-            'playful': [
-                "bouncy mushroom dancing",
-                "energetic cap wiggling",
-                "playful rolling around",
-                "joyful spore celebrations"
-            ],
-            'curious': [
-                "investigating interesting smells",
-                "examining tiny creatures",
-                "studying soil patterns",
-                "exploring new territories"
-            ],
-            'sleepy': [
-                "dreamy swaying motions",
-                "relaxed stretching",
-                "gentle breathing exercises",
-                "cozy burrowing games"
-            ],
-            'energetic': [
-                "high-speed spore racing",
-                "rapid growth competitions",
-                "intense soil digging",
-                "lightning-fast dancing"
-            ]
-        }
-        
-        activities = personality_activities.get(self.personality, [
-            "hide and seek among the leaves",
-            "rolling in the dirt",
-            "dancing in the moonlight",
-            "practicing spore dispersal"
-        ])
-        
-        activity = random.choice(activities)
-        
-        # Store old values for comparison
-        old_happiness = self.happiness
-        old_energy = self.energy
-        old_experience = self.experience
-        old_level = self.level
-        
-        # Improved play effects with personality consideration
-        happiness_gain = 18  # Reduced from 20
-        energy_cost = 12     # Reduced from 15
-        base_xp = 12         # Reduced from 15
+            return ActionResult(self, 'play', 'too_tired', params={'energy': self.energy})
         
         # Personality affects play effectiveness
-        if self.personality == 'playful':
-            happiness_gain += 5
-            energy_cost -= 2
-            base_xp += 3
-        elif self.personality == 'energetic':
-            energy_cost += 3
-            base_xp += 2
-        elif self.personality == 'sleepy':
-            happiness_gain -= 3
-            energy_cost += 2
-        elif self.personality == 'shy':
-            happiness_gain -= 2
-            base_xp += 1  # Gets more satisfaction from overcoming shyness
+        happiness_gain, energy_cost, xp = PLAY_EFFECTS[self._personality]
+        old_values = (self.happiness, self.energy)
         
         # Apply changes
         self.happiness = min(100, self.happiness + happiness_gain)
         self.energy = max(0, self.energy - energy_cost)
+        self.last_played = current_time
         
         # XP bonus for playing when pet is very happy or very sad
         if self.happiness > 80:
-            base_xp += 2  # Reward maintaining high happiness
+            xp += 2  # Reward maintaining high happiness
         elif self.happiness < 30:
-            base_xp += 4  # Bigger reward for cheering up sad pet
-        
-        self.experience += base_xp
-        self.last_played = current_time
-        
-        # Check for level up
-        new_level = 1 + (self.experience // 100)
-        leveled_up = new_level > old_level
-        if leveled_up:
-            self.level = new_level
-        
-        # Create stat change display
-        changes = []
-        if self.happiness > old_happiness:
-            changes.append(self.format_stat_change("😊 Happiness", old_happiness, self.happiness))
-        if self.energy < old_energy:
-            changes.append(self.format_stat_change("⚡ Energy", old_energy, self.energy))
-        if self.experience > old_experience:
-            changes.append(self.format_stat_change("⭐ XP", old_experience, self.experience))
-        
-        change_text = " | ".join(changes) if changes else ""
-        
-        # Personality-based responses
-        personality_responses = {
-            'shy': [
-                f"🤗 {self.name} shyly enjoys {activity}...",
-                f"😌 {self.name} seems content after {activity}.",
-                f"🙂 *quiet happiness* {self.name} had fun!"
-            ],
-            'playful': [
-                f"🎉 {self.name} has a blast {activity}!",
-                f"😄 *joyful bouncing* {self.name} loves {activity}!",
-                f"🤸 {self.name} can't stop giggling after {activity}!"
-            ],
-            'curious': [
-                f"🔍 {self.name} discovers something interesting while {activity}!",
-                f"🤔 {self.name} learns something new from {activity}!",
-                f"💡 {activity} sparks {self.name}'s curiosity!"
-            ],
-            'sleepy': [
-                f"😴 {self.name} drowsily enjoys {activity}...",
-                f"🥱 {activity} was relaxing for {self.name}.",
-                f"💤 {self.name} feels peacefully tired after {activity}."
-            ],
-            'energetic': [
-                f"⚡ {self.name} energetically tackles {activity}!",
-                f"🚀 {self.name} puts maximum effort into {activity}!",
-                f"💨 {self.name} zooms through {activity} with enthusiasm!"
-            ]
-        }
-        
-        base_response = random.choice(personality_responses.get(self.personality, [
-            f"🎮 {self.name} enjoys {activity}! Their cap wiggles with joy!",
-            f"😊 You and {self.name} have fun {activity}!",
-            f"🎈 {self.name} seems much happier after {activity}!"
-        ]))
-        
-        # Combine response with stat changes
-        full_response = f"{base_response}\n{change_text}"
-        
-        # Add level up celebration if applicable
-        if leveled_up:
-            full_response += "\n\n" + self.get_level_up_celebration(new_level)
+            xp += 4  # Bigger reward for cheering up sad pet
         
-        return full_response
+        return self._finish_action('play', ('happiness', 'energy'), old_values, xp)
     
     def clean(self):
         """Clean the pet"""
-        current_time = time.time()
+        current_time = self.clock.time()
         
-        if current_time - self.last_cleaned < 3600:  # 1 hour cooldown
-            time_left = (3600 - (current_time - self.last_cleaned)) / 60
-            return f"✨ {self.name} is already clean! {Colors.YELLOW}(Next cleaning in {time_left:.0f} minutes){Colors.RESET}"
+        if current_time - self.last_cleaned < CLEAN_COOLDOWN:
+            time_left = (CLEAN_COOLDOWN - (current_time - self.last_cleaned)) / 60
+            return ActionResult(self, 'clean', 'clean_cooldown', params={'minutes': time_left})
         
         # Check cleanliness level
         if self.cleanliness > 90:
-            return f"🧼 {self.name} is already sparkling clean! {Colors.YELLOW}(Cleanliness: {self.cleanliness:.0f}%){Colors.RESET}"
+            return ActionResult(self, 'clean', 'already_clean', params={'cleanliness': self.cleanliness})
         
-        # Store old values for comparison
-        old_cleanliness = self.cleanliness
-        old_happiness = self.happiness
-        old_health = self.health
-        old_experience = self.experience
-        old_level = self.level
-        
-        # Improved cleaning effects
         cleanliness_before = self.cleanliness
-        self.cleanliness = 100
+        old_values = (self.cleanliness, self.happiness, self.health)
         
         # Happiness and health gains based on how dirty they were
         dirtiness = 100 - cleanliness_before
         happiness_gain = 5 + (dirtiness * 0.1)  # More happiness if they were very dirty
         health_gain = 3 + (dirtiness * 0.08)    # More health benefit if they were very dirty
         
+        self.cleanliness = 100
         self.happiness = min(100, self.happiness + happiness_gain)
         self.health = min(100, self.health + health_gain)
         self.last_cleaned = current_time
         
         # XP based on cleaning necessity
-        base_xp = 6
+        xp = 6
         if cleanliness_before < 40:
-            base_xp += 4  # Bonus for cleaning when very dirty
+            xp += 4  # Bonus for cleaning when very dirty
         elif cleanliness_before < 70:
-            base_xp += 2  # Small bonus for regular maintenance
-        
-        self.experience += base_xp
-        
-        # Check for level up
-        new_level = 1 + (self.experience // 100)
-        leveled_up = new_level > old_level
-        if leveled_up:
-            self.level = new_level
-        
-        # Create stat change display
-        changes = []
-        if self.cleanliness > old_cleanliness:
-            changes.append(self.format_stat_change("🧼 Cleanliness", old_cleanliness, self.cleanliness))
-        if self.happiness > old_happiness:
-            changes.append(self.format_stat_change("😊 Happiness", old_happiness, self.happiness))
-        if self.health > old_health:
-            changes.append(self.format_stat_change("❤️ Health", old_health, self.health))
-        if self.experience > old_experience:
-            changes.append(self.format_stat_change("⭐ XP", old_experience, self.experience))
-        
-        change_text = " | ".join(changes) if changes else ""
-        
-        # Personality-based responses
-        personality_responses = {
-            'shy': [
-                f"🤗 {self.name} quietly enjoys the gentle cleaning...",
-                f"😌 {self.name} seems relaxed during their spa time.",
-                f"🙂 *soft contentment* {self.name} feels much better now."
-            ],
-            'playful': [
-                f"🎉 {self.name} splashes happily during bath time!",
-                f"😄 {self.name} makes bubbles and giggles!",
-                f"🤸 {self.name} does happy wiggles while being cleaned!"
-            ],
-            'curious': [
-                f"🔍 {self.name} examines each bubble with interest!",
-                f"🤔 {self.name} seems fascinated by the cleaning process!",
-                f"👁️ {self.name} watches the dirt wash away curiously."
-            ],
-            'sleepy': [
-                f"😴 {self.name} drowsily enjoys the warm, soothing bath...",
-                f"🥱 *yawn* The cleaning is very relaxing for {self.name}.",
-                f"💤 {self.name} almost falls asleep during the spa treatment."
-            ],
-            'energetic': [
-                f"⚡ {self.name} enthusiastically helps with the cleaning!",
-                f"🚀 {self.name} can't sit still during bath time!",
-                f"💨 {self.name} is excited to get squeaky clean!"
-            ]
-        }
-        
-        base_response = random.choice(personality_responses.get(self.personality, [
-            f"✨ {self.name} sparkles after a good cleaning!",
-            f"🧼 You gently brush off {self.name}'s cap. They look refreshed!",
-            f"🛁 {self.name} enjoys the spa treatment!",
-            f"🌟 All the dirt and debris are gone. {self.name} looks pristine!"
-        ]))
-        
-        # Combine response with stat changes
-        full_response = f"{base_response}\n{change_text}"
+            xp += 2  # Small bonus for regular maintenance
         
-        # Add level up celebration if applicable
-        if leveled_up:
-            full_response += "\n\n" + self.get_level_up_celebration(new_level)
-        
-        return full_response
+        return self._finish_action('clean', ('cleanliness', 'happiness', 'health'), old_values, xp)
     
     def rest(self):
         """Let the pet rest"""
         if self.energy > 90:
-            return f"⚡ {self.name} is already well-rested! {Colors.YELLOW}(Energy: {self.energy:.0f}%){Colors.RESET}"
+            return ActionResult(self, 'rest', 'well_rested', params={'energy': self.energy})
         
-        # Store old values for comparison
-        old_energy = self.energy
-        old_health = self.health
-        old_experience = self.experience
-        old_level = self.level
-        
-        # Improved rest effects with personality consideration
         energy_before = self.energy
-        energy_gain = min(25, 100 - self.energy)  # Reduced from 30
+        old_values = (self.energy, self.health)
         
         # Personality affects rest effectiveness
-        if self.personality == 'sleepy':
-            energy_gain = min(35, 100 - self.energy)  # Sleepy pets rest better
-        elif self.personality == 'energetic':
-            energy_gain = min(20, 100 - self.energy)  # Energetic pets rest less efficiently
-        
+        energy_gain = min(REST_ENERGY_GAIN[self._personality], 100 - self.energy)
         self.energy = min(100, self.energy + energy_gain)
         
         # Health gain based on how tired they were
@@ -661,78 +1196,24 @@ class MushroomPet:
         self.health = min(100, self.health + health_gain)
         
         # XP for rest (reduced and based on necessity)
-        base_xp = 3  # Reduced from 5
+        xp = 3  # Reduced from 5
         if energy_before < 30:
-            base_xp += 3  # Bonus for resting when very tired
-        
-        self.experience += base_xp
-        
-        # Check for level up
-        new_level = 1 + (self.experience // 100)
-        leveled_up = new_level > old_level
-        if leveled_up:
-            self.level = new_level
-        
-        # Create stat change display
-        changes = []
-        if self.energy > old_energy:
-            changes.append(self.format_stat_change("⚡ Energy", old_energy, self.energy))
-        if self.health > old_health:
-            changes.append(self.format_stat_change("❤️ Health", old_health, self.health))
-        if self.experience > old_experience:
-            changes.append(self.format_stat_change("⭐ XP", old_experience, self.experience))
-        
-        change_text = " | ".join(changes) if changes else ""
-        
-        # Personality-based responses
-        personality_responses = {
-            'shy': [
-                f"🤗 {self.name} quietly curls up for a peaceful rest...",
-                f"😌 {self.name} finds a cozy, hidden spot to nap.",
-                f"🙂 *soft snoring* {self.name} dreams sweetly."
-            ],
-            'playful': [
-                f"🎉 {self.name} bounces into their favorite sleeping spot!",
-                f"😄 {self.name} does a happy spin before settling down!",
-                f"🤸 Even while resting, {self.name} wiggles with joy!"
-            ],
-            'curious': [
-                f"🔍 {self.name} examines their sleeping area before resting.",
-                f"🤔 {self.name} wonders what dreams will come!",
-                f"👁️ {self.name} studies the patterns in the soil while dozing."
-            ],
-            'sleepy': [
-                f"😴 {self.name} yawns and easily drifts off to sleep...",
-                f"🥱 *stretch* {self.name} was ready for this nap!",
-                f"💤 {self.name} falls into the deepest, most restful sleep."
-            ],
-            'energetic': [
-                f"⚡ {self.name} reluctantly slows down for a power nap!",
-                f"🚀 {self.name} charges up their energy reserves!",
-                f"💨 Even while resting, {self.name} seems ready to go!"
-            ]
-        }
-        
-        base_response = random.choice(personality_responses.get(self.personality, [
-            f"💤 {self.name} takes a peaceful nap and feels refreshed!",
-            f"🛏️ {self.name} burrows into the soil for a cozy rest.",
-            f"😴 Zzz... {self.name} has sweet mushroom dreams!",
-            f"🌙 {self.name} absorbs energy from the earth while resting."
-        ]))
+            xp += 3  # Bonus for resting when very tired
         
-        # Combine response with stat changes
-        full_response = f"{base_response}\n{change_text}"
-        
-        # Add level up celebration if applicable
-        if leveled_up:
-            full_response += "\n\n" + self.get_level_up_celebration(new_level)
-        
-        return full_response
+        return self._finish_action('rest', ('energy', 'health'), old_values, xp)
     
     def get_status(self):
         """Get detailed status of the pet"""
         self.update_stats()
         
+        age_text = f"{self.age:.1f}"
+        key = ('status', self.name, self.growth_stage, self._mood, self._personality, self._favorite_food,
+               age_text, self.level, self.experience, _bar_key(self.hunger, 10), _bar_key(self.happiness, 10),
+               _bar_key(self.health, 10), _bar_key(self.cleanliness, 10), _bar_key(self.energy, 10))
+        return RENDER_CACHE.get(key, self._build_status, age_text)
+    
+    def _build_status(self, age_text):
+        """Render the status panel (see get_status)"""
         # Status bars
         def make_bar(value, length=10):
             filled = int((value / 100) * length)
@@ -748,7 +1229,7 @@ class MushroomPet:
 ║                                      ║
 ╠══════════════════════════════════════╣
 ║ Stage: {self.get_stage_name():<26} ║
-║ Age: {self.age:.1f} hours{' ' * (28 - len(f'{self.age:.1f} hours'))}║
+║ Age: {age_text} hours{' ' * (28 - len(f'{age_text} hours'))}║
 ║ Mood: {self.mood.title():<27} ║
 ║ Personality: {self.personality.title():<22} ║
 ║                                      ║
@@ -764,12 +1245,12 @@ class MushroomPet:
 """
         return status
     
-    def save_to_file(self):
-        """Save pet data to file"""
-        data = {
+    def to_dict(self):
+        """Pet state as a save record (SAVE_FIELDS keys)"""
+        return {
             'name': self.name,
             'birth_time': self.birth_time,
-            'last_update': time.time(),
+            'last_update': self.last_update,
             'hunger': self.hunger,
             'happiness': self.happiness,
             'health': self.health,
@@ -786,10 +1267,29 @@ class MushroomPet:
             'experience': self.experience,
             'level': self.level
         }
+    
+    def apply_dict(self, data):
+        """Restore state from a save record, ignoring unknown keys"""
+        for key, value in data.items():
+            if hasattr(self, key):
+                setattr(self, key, value)
+    
+    @classmethod
+    def from_dict(cls, data, clock=None):
+        """Create a pet from a save record"""
+        pet = cls(data['name'], clock)
+        pet.apply_dict(data)
+        return pet
+    
+    def save_to_file(self):
+        """Save pet data to file"""
+        data = self.to_dict()
+        data['last_update'] = self.clock.time()
         
         try:
-            with open(self.save_file, 'w') as f:
-                json.dump(data, f)
+            atomic_write_json(self.save_file, data)
+            from mycomate_storage import PetIndex
+            PetIndex(os.path.dirname(self.save_file) or '.').record([data])
             return True
         except Exception as e:
             print(f"Error saving: {e}")
@@ -802,12 +1302,10 @@ class MushroomPet:
                 with open(self.save_file, 'r') as f:
                     data = json.load(f)
                 
-                for key, value in data.items():
-                    if hasattr(self, key):
-                        setattr(self, key, value)
+                self.apply_dict(data)
                 
-                # Update stats based on time away
-                self.update_stats()
+                # Catch up on time away, crossing every threshold exactly
+                self.fast_forward()
                 return True
         except Exception as e:
             print(f"Error loading: {e}")
@@ -815,109 +1313,200 @@ class MushroomPet:
 
 def clear_screen():
     """Clear the terminal screen"""
-    os.system('clear')
+    sys.stdout.write("\033[H\033[2J")
+    sys.stdout.flush()
 
-def draw_ui(pet):
-    """Draw the complete UI with pet status always visible"""
-    clear_screen()
+class FrameRenderer:
+    """Paints UI frames with ANSI cursor addressing
     
-    # Update pet stats
-    pet.update_stats()
+    Each frame is built into one buffer and written at once. Only lines
+    that differ from the previous frame are repainted; the whole screen is
+    redrawn on the first frame, after a resize, or after invalidate().
+    Output printed below the frame should be reported with note_output()
+    so the renderer can tell when the terminal may have scrolled.
+    """
     
-    # Get terminal dimensions for responsive design
-    width = os.get_terminal_size().columns
-    width = min(80, width)  # Cap at 80 for readability
-    
-    # Create status bars
-    def make_bar(value, length=12, filled_char="█", empty_char="░"):
-        filled = int((value / 100) * length)
-        bar = filled_char * filled + empty_char * (length - filled)
-        return f"[{bar}] {value:.0f}%"
-    
-    # Get color based on stat value
-    def get_stat_color(value):
-        if value > 70:
-            return "\033[32m"  # Green
-        elif value > 40:
-            return "\033[33m"  # Yellow
+    def __init__(self, stream=None, watch_resize=True):
+        self.stream = stream or sys.stdout
+        self._previous = None      # Lines of the last frame painted
+        self._painted_size = None  # Terminal size it was painted at
+        self._below = 0            # Lines printed under the frame since then
+        self._size = None
+        self._resized = True
+        # With SIGWINCH the terminal size is only re-read after a resize
+        self._watching = False
+        if watch_resize and hasattr(signal, 'SIGWINCH'):
+            try:
+                signal.signal(signal.SIGWINCH, self._on_resize)
+                self._watching = True
+            except ValueError:
+                pass  # Not the main thread; read the size every frame instead
+    
+    def _on_resize(self, signum, frame):
+        self._resized = True
+    
+    @property
+    def size(self):
+        """Terminal size (columns, lines)"""
+        if self._resized:
+            self._size = shutil.get_terminal_size()
+            self._resized = not self._watching
+        return self._size
+    
+    def invalidate(self):
+        """Force a full redraw on the next frame"""
+        self._previous = None
+    
+    def note_output(self, text):
+        """Record text printed below the frame, which may scroll the frame away"""
+        self._below += text.count('\n') + 1
+    
+    def render(self, lines):
+        """Paint a frame, leaving the cursor on the line below it"""
+        size = self.size
+        previous = self._previous
+        if (previous is None or size != self._painted_size
+                or len(previous) + self._below >= size.lines):
+            buffer = ["\033[H\033[2J", "\n".join(lines)]
         else:
-            return "\033[31m"  # Red
+            buffer = []
+            for row, line in enumerate(lines):
+                if row >= len(previous) or previous[row] != line:
+                    buffer.append(f"\033[{row + 1};1H{line}\033[K")
+            buffer.append(f"\033[{len(lines)};1H")
+        # Clear whatever was printed under the last frame
+        buffer.append("\n\033[J")
+        self.stream.write(''.join(buffer))
+        self.stream.flush()
+        self._previous = lines
+        self._painted_size = size
+        self._below = 0
+
+def draw_ui(pet, renderer=None):
+    """Draw the complete UI with pet status always visible
     
-    reset_color = "\033[0m"
+    Pass the same FrameRenderer every frame to repaint only changed lines;
+    without one the whole frame is drawn.
+    """
+    renderer = renderer or FrameRenderer(watch_resize=False)
     
-    # Main display
-    print("╔" + "═" * (width - 2) + "╗")
+    # Update pet stats
+    pet.update_stats()
+    
+    # Get terminal dimensions for responsive design
+    width = min(80, renderer.size.columns)  # Cap at 80 for readability
+    renderer.render(build_ui_lines(pet, width))
+
+# Create status bars
+def make_bar(value, length=12, filled_char="█", empty_char="░"):
+    filled = int((value / 100) * length)
+    bar = filled_char * filled + empty_char * (length - filled)
+    return f"[{bar}] {value:.0f}%"
+
+# Get color based on stat value
+def get_stat_color(value):
+    if value > 70:
+        return "\033[32m"  # Green
+    elif value > 40:
+        return "\033[33m"  # Yellow
+    else:
+        return "\033[31m"  # Red
+
+# Rows of the stats section
+UI_STATS = (
+    ("🍽️", "Hunger", 'hunger'),
+    ("😊", "Happiness", 'happiness'),
+    ("❤️", "Health", 'health'),
+    ("🧼", "Cleanliness", 'cleanliness'),
+    ("⚡", "Energy", 'energy'),
+)
+
+def build_ui_lines(pet, width):
+    """Lines of the main UI frame for the given width
     
+    The frame is assembled from cached fragments keyed by the visible state
+    they show, so an unchanged section is never re-rendered.
+    """
+    cache = RENDER_CACHE
+    age_text = f"{pet.age:.1f}"
+    lines = list(cache.get(('ui_header', pet.name, width), _build_ui_header, pet.name, width))
+    lines += cache.get(('ui_pet', pet.growth_stage, pet._mood, pet._personality, age_text, width),
+                       _build_ui_pet, pet, age_text, width)
+    lines.append(cache.get(('ui_rule', width), _build_ui_rule, "╠", "╣", width))
+    for emoji, name, stat in UI_STATS:
+        value = getattr(pet, stat)
+        key = ('ui_stat', name, _bar_key(value, 12), value > 70, value > 40, width)
+        lines.append(cache.get(key, _build_ui_stat, emoji, name, value, width))
+    lines.append(cache.get(('ui_rule', width), _build_ui_rule, "╠", "╣", width))
+    lines += cache.get(('ui_footer', pet.level, pet.experience, pet._favorite_food, width),
+                       _build_ui_footer, pet, width)
+    return lines
+
+def _build_ui_rule(left, right, width):
+    return left + "═" * (width - 2) + right
+
+def _build_ui_header(name, width):
     # Title line
-    title = f"🍄 MycoMate - {pet.name} 🍄"
+    title = f"🍄 MycoMate - {name} 🍄"
     title_padding = (width - len(title) - 2) // 2
-    print(f"║{' ' * title_padding}{title}{' ' * (width - len(title) - title_padding - 2)}║")
-    
-    print("╠" + "═" * (width - 2) + "╣")
-    
+    return (
+        _build_ui_rule("╔", "╗", width),
+        f"║{' ' * title_padding}{title}{' ' * (width - len(title) - title_padding - 2)}║",
+        _build_ui_rule("╠", "╣", width),
+    )
+
+def _build_ui_pet(pet, age_text, width):
     # Pet display area
-    pet_art = pet.get_ascii_art()
-    art_lines = pet_art.split('\n')
+    art_lines = pet.get_ascii_art().split('\n')
     
     # Pet info
     info_lines = [
         f"Stage: {pet.get_stage_name()}",
-        f"Age: {pet.age:.1f} hours",
+        f"Age: {age_text} hours",
         f"Mood: {pet.mood.title()}",
         f"Personality: {pet.personality.title()}"
     ]
     
     # Display pet and info
-    max_lines = max(len(art_lines), len(info_lines))
-    
-    for i in range(max_lines):
+    lines = []
+    for i in range(max(len(art_lines), len(info_lines))):
         art_part = art_lines[i] if i < len(art_lines) else ""
         info_part = info_lines[i] if i < len(info_lines) else ""
         
         # Simple layout: art on left, info on right
         line = f"║  {art_part:<20} {info_part}"
         padding = width - len(line) - 1
-        print(f"{line}{' ' * max(0, padding)}║")
-    
-    print("╠" + "═" * (width - 2) + "╣")
-    
-    # Stats display
-    stats = [
-        ("🍽️", "Hunger", pet.hunger),
-        ("😊", "Happiness", pet.happiness),
-        ("❤️", "Health", pet.health),
-        ("🧼", "Cleanliness", pet.cleanliness),
-        ("⚡", "Energy", pet.energy)
-    ]
-    
-    for emoji, name, value in stats:
-        color = get_stat_color(value)
-        bar = make_bar(value)
-        line = f"║ {emoji} {name}: {color}{bar}{reset_color}"
-        padding = width - len(line) + len(color) + len(reset_color) - 1
-        print(f"{line}{' ' * max(0, padding)}║")
-    
-    print("╠" + "═" * (width - 2) + "╣")
-    
+        lines.append(f"{line}{' ' * max(0, padding)}║")
+    return tuple(lines)
+
+def _build_ui_stat(emoji, name, value, width):
+    reset_color = "\033[0m"
+    color = get_stat_color(value)
+    line = f"║ {emoji} {name}: {color}{make_bar(value)}{reset_color}"
+    padding = width - len(line) + len(color) + len(reset_color) - 1
+    return f"{line}{' ' * max(0, padding)}║"
+
+def _build_ui_footer(pet, width):
     # Experience and level
     exp_bar = make_bar((pet.experience % 100), 12, "▓", "▒")
-    line = f"║ 🌟 Level {pet.level} - XP: {exp_bar} ({pet.experience} total)"
-    padding = width - len(line) - 1
-    print(f"{line}{' ' * max(0, padding)}║")
+    xp_line = f"║ 🌟 Level {pet.level} - XP: {exp_bar} ({pet.experience} total)"
     
     # Favorite food
-    line = f"║ 💖 Favorite Food: {pet.favorite_food.title()}"
-    padding = width - len(line) - 1
-    print(f"{line}{' ' * max(0, padding)}║")
-    
-    print("╚" + "═" * (width - 2) + "╝")
-    print()
+    food_line = f"║ 💖 Favorite Food: {pet.favorite_food.title()}"
+    return (
+        f"{xp_line}{' ' * max(0, width - len(xp_line) - 1)}║",
+        f"{food_line}{' ' * max(0, width - len(food_line) - 1)}║",
+        _build_ui_rule("╚", "╝", width),
+        "",
+    )
+
+MENU_TEXT = """What would you like to do?
+1. 🍽️  Feed Pet     2. 🎮 Play        3. 🧼 Clean
+4. 😴 Rest         5. 💾 Save & Quit  6. ❓ Help"""
 
 def show_menu():
     """Display the action menu"""
-    print("What would you like to do?")
-    print("1. 🍽️  Feed Pet     2. 🎮 Play        3. 🧼 Clean")
-    print("4. 😴 Rest         5. 💾 Save & Quit  6. ❓ Help")
+    print(MENU_TEXT)
     
 def show_help():
     """Show help information"""
@@ -955,11 +1544,14 @@ def main():
     """Main game loop"""
     print("🍄 Starting MycoMate...")
     
-    # Check if save file exists
-    save_files = [f for f in os.listdir('.') if f.startswith('.mushroom_pet_') and f.endswith('.json')]
+    # Known pets come from the save index, not a directory scan
+    from mycomate_storage import PetIndex
+    known_pets = PetIndex('.').load_or_rebuild()
     
-    if save_files:
-        print(f"\nFound existing pets: {', '.join([f.split('_')[2].split('.')[0].title() for f in save_files])}")
+    if known_pets:
+        pet_list = ', '.join(f"{entry['name']} ({STAGE_NAMES[entry['stage']]}, Lv {entry['level']})"
+                             for entry in sorted(known_pets.values(), key=lambda entry: entry['name'].lower()))
+        print(f"\nFound existing pets: {pet_list}")
         pet_name = input("Enter pet name to load (or new name to create): ").strip()
     else:
         pet_name = input("Enter a name for your new mushroom pet: ").strip()
@@ -975,26 +1567,40 @@ def main():
         print(f"Their favorite food is {pet.favorite_food}!")
     else:
         print(f"\n🍄 Welcome back, {pet.name}!")
-        time_away = (time.time() - pet.last_update) / 3600
+        time_away = (pet.clock.time() - pet.last_update) / 3600
         if time_away > 1:
             print(f"You were away for {time_away:.1f} hours. Let's see how {pet.name} is doing...")
     
     input("\nPress Enter to continue...")
     
+    # Saves happen on a background thread, only when something changed
+    from mycomate_storage import JsonFileStore, WriteBehindSaver
+    saver = WriteBehindSaver(JsonFileStore('.'))
+    saver.mark_dirty(pet)
+    try:
+        game_loop(pet, saver)
+    finally:
+        saver.close()  # Flush pending saves, also on KeyboardInterrupt
+
+def game_loop(pet, saver):
+    """Interactive loop: draw, read a choice, act, repeat until Save & Quit"""
+    renderer = FrameRenderer()
     while True:
-        # Draw the full UI with pet status
-        draw_ui(pet)
+        # Draw the UI with pet status, repainting only what changed
+        draw_ui(pet, renderer)
         
         # Show menu
         show_menu()
         choice = input("\n> ").strip()
+        renderer.note_output(MENU_TEXT + "\n> ")
         
         result_message = ""
         
         if choice == '1':
             print("\nFood options: nutrients, compost, water, sunshine, minerals")
             food = input("What would you like to feed them? ").strip().lower()
-            if food in ['nutrients', 'compost', 'water', 'sunshine', 'minerals']:
+            renderer.note_output("\n\n")
+            if food in FOODS:
                 result_message = pet.feed(food)
             else:
                 result_message = pet.feed()  # Default food
@@ -1005,7 +1611,8 @@ def main():
         elif choice == '4':
             result_message = pet.rest()
         elif choice == '5':
-            if pet.save_to_file():
+            saver.mark_dirty(pet)
+            if saver.flush():
                 print(f"\n💾 {pet.name} has been saved! See you later! 🍄")
             else:
                 print("\n❌ Error saving. Try again!")
@@ -1014,26 +1621,38 @@ def main():
             clear_screen()
             show_help()
             input("\nPress Enter to continue...")
+            renderer.invalidate()
             continue
         else:
             result_message = "❌ Invalid choice! Please try again."
         
+        # Only successful actions change the pet enough to need saving
+        if isinstance(result_message, ActionResult) and result_message.ok:
+            saver.mark_dirty(pet)
+        
         # Show result message if there is one
         if result_message:
-            print(f"\n🍄 {result_message}")
+            message = f"\n🍄 {result_message}"
+            print(message)
             input("\nPress Enter to continue...")
+            renderer.note_output(message + "\n\n")
         
         # Check for evolution celebration (triggered by update_stats)
         if hasattr(pet, '_evolution_celebration'):
             print("\n" + pet._evolution_celebration)
             delattr(pet, '_evolution_celebration')  # Remove after showing
+            saver.mark_dirty(pet)
             input("\nPress Enter to continue...")
-        
-        # Auto-save periodically
-        if random.randint(1, 5) == 1:
-            pet.save_to_file()
+            renderer.invalidate()
 
 if __name__ == "__main__":
+    # Run as a script this module is __main__; modules that import mycomate
+    # (storage, server) must get this copy, not load and run a second one
+    sys.modules.setdefault('mycomate', sys.modules[__name__])
+    if '--serve' in sys.argv[1:]:
+        # Headless server mode, see mycomate_server.py
+        from mycomate_server import main as serve
+        sys.exit(serve(sys.argv[1:]))
     try:
         main()
     except KeyboardInterrupt:
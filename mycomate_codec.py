@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+MycoMate Codec - fixed-width binary save records for bulk storage.
+
+A binary save is a 12-byte header followed by `count` fixed-width records:
+
+    header: magic b'MYCO', version (u16), record size (u16), count (u32)
+    record: the SAVE_FIELDS of one pet, with personality, favorite food and
+            mood stored as their small-int codes and the name as 32 bytes
+            of NUL-padded UTF-8
+
+Decoding walks the buffer through a memoryview with struct.iter_unpack, so
+thousands of records are parsed without copying the input. Files written by
+an older version are read with that version's layout and upgraded through
+the MIGRATIONS hooks. JSON (MushroomPet.to_dict) stays the interchange and
+export format; this codec is for dense bulk storage.
+"""
+
+import struct
+
+from mycomate import (
+    MushroomPet, REAL_CLOCK, PERSONALITIES, PERSONALITY_CODES, FOODS, FOOD_CODES, MOODS, MOOD_CODES,
+)
+
+MAGIC = b'MYCO'
+HEADER = struct.Struct('<4sHHI')
+NAME_BYTES = 32
+
+# Record layout per codec version. Field order of version 1:
+# name, birth_time, last_update, hunger, happiness, health, cleanliness,
+# energy, age, last_fed, last_played, last_cleaned, experience, level,
+# growth_stage, personality, favorite_food, mood
+RECORD_LAYOUTS = {
+    1: struct.Struct(f'<{NAME_BYTES}s11dqi4B'),
+}
+VERSION = max(RECORD_LAYOUTS)
+
+# Schema migrations: MIGRATIONS[v] turns a version-v record dict into a
+# version v+1 record dict. Register one whenever RECORD_LAYOUTS grows.
+MIGRATIONS = {}
+
+
+def register_migration(from_version):
+    """Decorator registering the upgrade from `from_version` to the next version"""
+    def register(function):
+        MIGRATIONS[from_version] = function
+        return function
+    return register
+
+
+class CodecError(ValueError):
+    """Raised for buffers that are not valid binary saves"""
+
+
+def _pack_name(name):
+    raw = name.encode('utf-8')
+    if len(raw) > NAME_BYTES:
+        raise CodecError(f"Pet name too long for binary save ({len(raw)} > {NAME_BYTES} bytes): {name!r}")
+    return raw
+
+
+def encode_records(records):
+    """Encode save records (dicts with SAVE_FIELDS keys) as one binary save"""
+    layout = RECORD_LAYOUTS[VERSION]
+    body = bytearray()
+    count = 0
+    for r in records:
+        body += layout.pack(
+            _pack_name(r['name']), r['birth_time'], r['last_update'],
+            r['hunger'], r['happiness'], r['health'], r['cleanliness'], r['energy'], r['age'],
+            r['last_fed'], r['last_played'], r['last_cleaned'], r['experience'], r['level'],
+            r['growth_stage'], PERSONALITY_CODES[r['personality']], FOOD_CODES[r['favorite_food']],
+            MOOD_CODES[r['mood']])
+        count += 1
+    return HEADER.pack(MAGIC, VERSION, layout.size, count) + body
+
+
+def encode_pets(pets):
+    """Encode MushroomPet objects as one binary save"""
+    return encode_records(pet.to_dict() for pet in pets)
+
+
+def read_header(buffer):
+    """(version, record size, count) of a binary save; checks its length"""
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise CodecError("Buffer too short for a binary save header")
+    magic, version, record_size, count = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise CodecError("Not a MycoMate binary save")
+    layout = RECORD_LAYOUTS.get(version)
+    if layout is None or layout.size != record_size:
+        raise CodecError(f"Unsupported binary save version {version}")
+    if len(view) < HEADER.size + count * record_size:
+        raise CodecError("Binary save is truncated")
+    return version, record_size, count
+
+
+def iter_rows(buffer):
+    """Yield (version, raw field tuple) for every record, without copying the buffer"""
+    version, record_size, count = read_header(buffer)
+    body = memoryview(buffer)[HEADER.size:HEADER.size + count * record_size]
+    for row in RECORD_LAYOUTS[version].iter_unpack(body):
+        yield version, row
+
+
+def _row_to_record(row):
+    (name, birth_time, last_update, hunger, happiness, health, cleanliness, energy, age,
+     last_fed, last_played, last_cleaned, experience, level,
+     growth_stage, personality, favorite_food, mood) = row
+    return {
+        'name': name.rstrip(b'\0').decode('utf-8'),
+        'birth_time': birth_time,
+        'last_update': last_update,
+        'hunger': hunger,
+        'happiness': happiness,
+        'health': health,
+        'cleanliness': cleanliness,
+        'energy': energy,
+        'age': age,
+        'growth_stage': growth_stage,
+        'personality': PERSONALITIES[personality],
+        'favorite_food': FOODS[favorite_food],
+        'mood': MOODS[mood],
+        'last_fed': last_fed,
+        'last_played': last_played,
+        'last_cleaned': last_cleaned,
+        'experience': experience,
+        'level': level,
+    }
+
+
+def _migrate(record, version):
+    while version < VERSION:
+        record = MIGRATIONS[version](record)
+        version += 1
+    return record
+
+
+def decode_records(buffer):
+    """Decode a binary save into save record dicts, upgrading old versions"""
+    return [_migrate(_row_to_record(row), version) for version, row in iter_rows(buffer)]
+
+
+def decode_pets(buffer, clock=None):
+    """Decode a binary save straight into MushroomPet objects on clock
+
+    Current-version records fill the pet's slots directly, skipping
+    MushroomPet.__init__ and the per-field setattr of apply_dict().
+    """
+    pets = []
+    new_pet = MushroomPet.__new__
+    clock = clock or REAL_CLOCK
+    for version, row in iter_rows(buffer):
+        if version != VERSION:
+            pets.append(MushroomPet.from_dict(_migrate(_row_to_record(row), version), clock))
+            continue
+        pet = new_pet(MushroomPet)
+        (name, pet.birth_time, pet.last_update, pet.hunger, pet.happiness, pet.health,
+         pet.cleanliness, pet.energy, pet.age, pet.last_fed, pet.last_played, pet.last_cleaned,
+         pet.experience, pet.level, pet.growth_stage,
+         pet._personality, pet._favorite_food, pet._mood) = row
+        pet.name = name.rstrip(b'\0').decode('utf-8')
+        pet.size = 1
+        pet._save_file = None
+        pet.clock = clock
+        pets.append(pet)
+    return pets
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+MycoMate Columns - columnar, memory-mapped fleet snapshots for analytics.
+
+A columnar snapshot is a directory with one .npy file per save field plus
+a string table for the names:
+
+    meta.json          format version, pet count, field dtypes
+    <field>.npy        one array per SAVE_FIELDS entry except name;
+                       personality, favorite_food and mood hold their codes
+    names.bin          every name as UTF-8, back to back
+    name_offsets.npy   start of name i at [i], end at [i + 1]
+
+FleetColumns opens the arrays with mmap, so a query only reads the pages
+of the columns it uses, however many pets the snapshot holds:
+
+    fleet = FleetColumns('fleet.cols')
+    mask = (fleet['growth_stage'] == 3) & (fleet['health'] < 40)
+    print(mask.sum(), fleet.names_where(mask, limit=10))
+
+Export a store, query a snapshot, or load it back into a store with:
+
+    python3 mycomate_columns.py export pets.db fleet.cols
+    python3 mycomate_columns.py query fleet.cols --where stage=mature --where 'health<40' --mean energy
+    python3 mycomate_columns.py import fleet.cols pets.db
+
+Like PetPopulation, this needs NumPy.
+"""
+
+import argparse
+import json
+import operator
+import os
+import re
+import shutil
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, checked when a snapshot is opened or written
+    np = None
+
+from mycomate import SAVE_FIELDS, PERSONALITIES, FOODS, MOODS, STAGE_NAMES
+from mycomate_storage import open_store
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+NAMES_FILE = 'names.bin'
+OFFSETS_FILE = 'name_offsets.npy'
+
+# Column dtype per save field (name lives in the string table)
+COLUMN_DTYPES = {
+    'birth_time': 'float64',
+    'last_update': 'float64',
+    'hunger': 'float64',
+    'happiness': 'float64',
+    'health': 'float64',
+    'cleanliness': 'float64',
+    'energy': 'float64',
+    'age': 'float64',
+    'growth_stage': 'int8',
+    'personality': 'uint8',
+    'favorite_food': 'uint8',
+    'mood': 'uint8',
+    'last_fed': 'float64',
+    'last_played': 'float64',
+    'last_cleaned': 'float64',
+    'experience': 'int64',
+    'level': 'int32',
+}
+
+# String fields stored as an index into these tables
+CODE_TABLES = {'personality': PERSONALITIES, 'favorite_food': FOODS, 'mood': MOODS}
+
+# Records loaded from the store per batch while exporting
+EXPORT_BATCH = 5000
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Columnar snapshots need NumPy: pip install numpy")
+
+
+def _encode(field, value):
+    table = CODE_TABLES.get(field)
+    return table.index(value) if table is not None else value
+
+
+def export_columns(store, directory, batch_size=EXPORT_BATCH):
+    """Write every pet in store to a columnar snapshot; returns the pet count
+
+    Columns are filled through writable memmaps batch by batch, so memory
+    use stays at one batch of records. The snapshot is built next to
+    directory and swapped in when complete.
+    """
+    _require_numpy()
+    names = store.names()
+    building = directory.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(building)
+    columns = {field: np.lib.format.open_memmap(os.path.join(building, f"{field}.npy"), mode='w+',
+                                                dtype=dtype, shape=(len(names),))
+               for field, dtype in COLUMN_DTYPES.items()}
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    count = 0
+    with open(os.path.join(building, NAMES_FILE), 'wb') as name_file:
+        for start in range(0, len(names), batch_size):
+            records = list(store.load_many(names[start:start + batch_size]).values())
+            for field, column in columns.items():
+                column[count:count + len(records)] = [_encode(field, r[field]) for r in records]
+            for record in records:
+                raw = record['name'].encode('utf-8')
+                name_file.write(raw)
+                offsets[count + 1] = offsets[count] + len(raw)
+                count += 1
+    for column in columns.values():
+        column.flush()
+    del columns
+    np.save(os.path.join(building, OFFSETS_FILE), offsets[:count + 1])
+    with open(os.path.join(building, META_FILE), 'w') as f:
+        # Pets deleted during the export leave unused rows at the end
+        json.dump({'version': FORMAT_VERSION, 'count': count, 'created': time.time(),
+                   'columns': COLUMN_DTYPES}, f, indent=2)
+
+    old = directory.rstrip(os.sep) + '.old'
+    if os.path.exists(directory):
+        os.replace(directory, old)
+    os.replace(building, directory)
+    shutil.rmtree(old, ignore_errors=True)
+    return count
+
+
+class FleetColumns:
+    """Read-only view of a columnar snapshot; columns are mmapped on first use"""
+
+    def __init__(self, directory):
+        _require_numpy()
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), 'r') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar snapshot version {self.meta.get('version')}")
+        self.count = self.meta['count']
+        self._columns = {}
+        self._names = None
+        self._offsets = None
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def fields(self):
+        return tuple(self.meta['columns'])
+
+    def __getitem__(self, field):
+        """The column for a save field, as a read-only memmapped array"""
+        column = self._columns.get(field)
+        if column is None:
+            if field not in self.meta['columns']:
+                raise KeyError(field)
+            column = np.load(os.path.join(self.directory, f"{field}.npy"), mmap_mode='r')[:self.count]
+            self._columns[field] = column
+        return column
+
+    def name(self, index):
+        """Name of the pet in row index"""
+        if self._offsets is None:
+            self._offsets = np.load(os.path.join(self.directory, OFFSETS_FILE), mmap_mode='r')
+            path = os.path.join(self.directory, NAMES_FILE)
+            # np.memmap refuses empty files
+            self._names = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) else b''
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return bytes(self._names[start:end]).decode('utf-8')
+
+    def names_where(self, mask, limit=None):
+        """Names of the rows selected by a boolean mask, in row order"""
+        rows = np.flatnonzero(mask)
+        if limit is not None:
+            rows = rows[:limit]
+        return [self.name(i) for i in rows]
+
+    def decode(self, field, code):
+        """String value for a code in a personality, favorite_food or mood column"""
+        return CODE_TABLES[field][code]
+
+    def record(self, index):
+        """Save record for row index, as MushroomPet.to_dict() would give"""
+        record = {'name': self.name(index)}
+        for field in SAVE_FIELDS[1:]:
+            value = self[field][index].item()
+            record[field] = CODE_TABLES[field][value] if field in CODE_TABLES else value
+        return record
+
+    def records(self):
+        """Every save record, in row order"""
+        for index in range(self.count):
+            yield self.record(index)
+
+
+def import_columns(directory, store, batch_size=EXPORT_BATCH):
+    """Save every pet of a columnar snapshot into store; returns the pet count"""
+    fleet = FleetColumns(directory)
+    batch = []
+    for record in fleet.records():
+        batch.append(record)
+        if len(batch) >= batch_size:
+            store.save_many(batch)
+            batch = []
+    if batch:
+        store.save_many(batch)
+    return len(fleet)
+
+
+_OPERATORS = {'<=': operator.le, '>=': operator.ge, '!=': operator.ne,
+              '<': operator.lt, '>': operator.gt, '=': operator.eq}
+_CONDITION = re.compile(r'\s*(\w+)\s*(<=|>=|!=|<|>|=)\s*(.+?)\s*$')
+
+
+def _stage_code(value):
+    for code, stage in enumerate(STAGE_NAMES):
+        if value.lower() in (stage.lower(), stage.split()[0].lower()):
+            return code
+    return int(value)
+
+
+def parse_condition(fleet, condition):
+    """Boolean mask for a 'field<op>value' condition, e.g. 'health<40' or 'stage=mature'
+
+    'stage' is short for growth_stage and takes stage names; personality,
+    favorite_food and mood take their names too.
+    """
+    match = _CONDITION.match(condition)
+    if match is None:
+        raise ValueError(f"Bad condition {condition!r}; expected e.g. health<40")
+    field, op, value = match.groups()
+    if field == 'stage':
+        field = 'growth_stage'
+    if field not in fleet.fields:
+        raise ValueError(f"Unknown field {field!r}")
+    if field == 'growth_stage':
+        value = _stage_code(value)
+    elif field in CODE_TABLES:
+        if value not in CODE_TABLES[field]:
+            raise ValueError(f"Unknown {field} {value!r}")
+        value = CODE_TABLES[field].index(value)
+    else:
+        value = float(value)
+    return _OPERATORS[op](fleet[field], value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MycoMate columnar fleet snapshots")
+    commands = parser.add_subparsers(dest='command')
+    export = commands.add_parser('export', help="write every pet in a store to a columnar snapshot")
+    export.add_argument('store', help="SQLite database, .journal or directory of JSON saves")
+    export.add_argument('output', help="snapshot directory to write")
+    load = commands.add_parser('import', help="save every pet of a columnar snapshot into a store")
+    load.add_argument('snapshot', help="snapshot directory to read")
+    load.add_argument('store', help="SQLite database, .journal or directory of JSON saves")
+    query = commands.add_parser('query', help="count pets matching conditions")
+    query.add_argument('snapshot', help="snapshot directory to read")
+    query.add_argument('--where', action='append', default=[],
+                       help="condition like 'health<40' or stage=mature; repeat to AND them")
+    query.add_argument('--mean', action='append', default=[], help="field to average over the matches")
+    query.add_argument('--names', type=int, default=0, help="list up to this many matching pets")
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        started = time.perf_counter()
+        with open_store(args.store) as store:
+            count = export_columns(store, args.output)
+        print(f"🍄 Exported {count} pets to {args.output} in {time.perf_counter() - started:.2f}s")
+    elif args.command == 'import':
+        with open_store(args.store) as store:
+            count = import_columns(args.snapshot, store)
+        print(f"🍄 Imported {count} pets into {args.store}")
+    elif args.command == 'query':
+        fleet = FleetColumns(args.snapshot)
+        mask = np.ones(len(fleet), dtype=bool)
+        try:
+            for condition in args.where:
+                mask &= parse_condition(fleet, condition)
+        except ValueError as e:
+            parser.error(str(e))
+        for field in args.mean:
+            if field not in fleet.fields:
+                parser.error(f"Unknown field {field!r}")
+        matches = int(mask.sum())
+        print(f"🍄 {matches} of {len(fleet)} pets match")
+        for field in args.mean:
+            mean = float(fleet[field][mask].mean()) if matches else float('nan')
+            print(f"   mean {field}: {mean:.2f}")
+        for name in fleet.names_where(mask, args.names):
+            print(f"   {name}")
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
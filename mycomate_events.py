@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+MycoMate Events - stream pet changes instead of diffing status panels.
+
+MushroomPet.update_stats(), fast_forward() and the care actions, as well
+as PetPopulation.update_stats(), emit PetEvents to the callables in
+mycomate.EVENT_LISTENERS:
+
+    stats      deltas and new values of every stat that moved
+    threshold  a stat crossed one of its rule levels (below or above)
+    mood       the mood bucket changed
+    level_up   the pet reached a new level
+    evolution  the pet grew into a new stage
+
+EventStream buffers them for a consumer, as an iterator or an async
+iterator; JsonlSink appends them to a file:
+
+    with EventStream(kinds=['evolution', 'level_up']) as events:
+        for event in events:
+            notify(event.pet, event.to_dict())
+
+With no listener registered, the pets build no events at all.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+
+from mycomate import EVENT_LISTENERS
+
+
+def subscribe(listener):
+    """Register a callable to receive every PetEvent"""
+    EVENT_LISTENERS.append(listener)
+    return listener
+
+
+def unsubscribe(listener):
+    try:
+        EVENT_LISTENERS.remove(listener)
+    except ValueError:
+        pass
+
+
+class EventStream:
+    """Bounded buffer of PetEvents, subscribed from creation until close()
+
+    When `maxsize` events are waiting, overflow='block' makes the code that
+    emits wait for the consumer (backpressure), and overflow='drop' discards
+    the oldest event and counts it in `dropped`. Use 'drop' when the
+    consumer runs on the same thread or event loop as the pets, since
+    blocking there would wait forever.
+
+    Async consumers wait on a future of their own loop, which producers
+    wake with call_soon_threadsafe, so no executor thread sits blocked and
+    a cancelled consumer leaves nothing behind at loop shutdown.
+    """
+
+    def __init__(self, maxsize=1024, kinds=None, overflow='block'):
+        if overflow not in ('block', 'drop'):
+            raise ValueError(f"overflow must be 'block' or 'drop', not {overflow!r}")
+        self.maxsize = maxsize
+        self.kinds = frozenset(kinds) if kinds else None
+        self.overflow = overflow
+        self.dropped = 0
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._waiters = []  # (loop, future) of waiting async consumers
+        subscribe(self)
+
+    def __call__(self, event):
+        if self.kinds is not None and event.kind not in self.kinds:
+            return
+        with self._cond:
+            while len(self._buffer) >= self.maxsize and not self._closed:
+                if self.overflow == 'drop':
+                    self._buffer.popleft()
+                    self.dropped += 1
+                else:
+                    self._cond.wait()
+            if self._closed:
+                return
+            self._buffer.append(event)
+            self._cond.notify_all()
+            self._wake_waiters()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._buffer)
+
+    def get(self, timeout=None):
+        """Next event, waiting up to timeout; None once closed and drained, or on timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._buffer or self._closed, timeout):
+                return None
+            if not self._buffer:
+                return None
+            event = self._buffer.popleft()
+            self._cond.notify_all()  # Room for a blocked producer
+            return event
+
+    def __iter__(self):
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._buffer:
+                    event = self._buffer.popleft()
+                    self._cond.notify_all()  # Room for a blocked producer
+                    return event
+                if self._closed:
+                    raise StopAsyncIteration
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def _wake_waiters(self):
+        """Wake every waiting async consumer; call with _cond held"""
+        for loop, waiter in self._waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                pass  # Its loop is closed
+        self._waiters.clear()
+
+    def close(self):
+        """Unsubscribe; consumers still receive what is buffered, then stop"""
+        unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            self._wake_waiters()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _resolve(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class JsonlSink:
+    """Appends every event (optionally only some kinds) to a JSONL file"""
+
+    def __init__(self, path, kinds=None):
+        self.path = path
+        self.kinds = frozenset(kinds) if kinds else None
+        self.written = 0
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        subscribe(self)
+
+    def __call__(self, event):
+        if self.kinds is not None and event.kind not in self.kinds:
+            return
+        line = json.dumps(event.to_dict(), ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self.written += 1
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        unsubscribe(self)
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+MycoMate Fleet - batched simulation for large numbers of mushroom pets.
+
+PetPopulation keeps every pet's state in parallel NumPy arrays and applies
+the same rules as MushroomPet.update_stats() to the whole fleet in one pass.
+NumPy is only needed for this module; the game itself has no dependencies.
+
+tick_fleet() advances every pet in a store on a pool of worker processes,
+each loading, updating and saving its own shard of pets in bulk:
+
+    python3 mycomate_fleet.py tick pets.db [--workers N] [--shards N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, checked when a population is created
+    np = None
+
+from mycomate import (
+    MushroomPet, REAL_CLOCK, PERSONALITIES, STAGE_NAMES, PERSONALITY_CODES, PERSONALITY_DECAY,
+    HUNGER_DECAY, HAPPINESS_DECAY, CLEANLINESS_DECAY, ENERGY_DECAY, EVENT_LISTENERS, EVENT_MOOD,
+    emit_changes, emit_event,
+)
+from mycomate_storage import is_journal, open_store, pet_key
+
+STAT_FIELDS = ('hunger', 'happiness', 'health', 'cleanliness', 'energy')
+
+
+def _require_numpy():
+    """Raise a helpful error when NumPy is missing"""
+    if np is None:
+        raise ImportError("PetPopulation needs NumPy: pip install numpy")
+
+
+def _decay_table():
+    """Per-hour decay rates indexed by personality code"""
+    rows = []
+    for personality in PERSONALITIES:
+        hunger_mult, happiness_mult, cleanliness_mult, energy_mult = PERSONALITY_DECAY[personality]
+        rows.append((HUNGER_DECAY * hunger_mult, HAPPINESS_DECAY * happiness_mult,
+                     CLEANLINESS_DECAY * cleanliness_mult, ENERGY_DECAY * energy_mult))
+    return np.array(rows, dtype=np.float64)
+
+
+class PetPopulation:
+    """Struct-of-arrays store for many pets with a batched update_stats()"""
+
+    def __init__(self, size, clock=None):
+        _require_numpy()
+        self.size = size
+        self.clock = clock or REAL_CLOCK
+        self.names = [''] * size
+
+        # Pet stats (0-100)
+        self.hunger = np.full(size, 50.0)
+        self.happiness = np.full(size, 50.0)
+        self.health = np.full(size, 100.0)
+        self.cleanliness = np.full(size, 100.0)
+        self.energy = np.full(size, 80.0)
+
+        # Timestamps and growth
+        now = self.clock.time()
+        self.birth_time = np.full(size, now)
+        self.last_update = np.full(size, now)
+        self.age = np.zeros(size)
+        self.growth_stage = np.zeros(size, dtype=np.int8)
+        self.experience = np.zeros(size, dtype=np.int64)
+        self.level = np.ones(size, dtype=np.int64)
+
+        # Personality code and mood bucket (indexes into MOOD_WORDS)
+        self.personality = np.zeros(size, dtype=np.int8)
+        self.mood_bucket = np.full(size, 3, dtype=np.int8)
+
+        self._decay = _decay_table()
+        self._mood_changes = []  # (index, old bucket, bucket, time) waiting for apply_to()
+
+    def __len__(self):
+        return self.size
+
+    @classmethod
+    def from_pets(cls, pets, clock=None):
+        """Build a population from a sequence of MushroomPet objects"""
+        population = cls(len(pets), clock or (pets[0].clock if pets else None))
+        for i, pet in enumerate(pets):
+            population.set_pet(i, pet)
+        return population
+
+    def set_pet(self, index, pet):
+        """Copy one pet's state into slot `index`"""
+        self.names[index] = pet.name
+        for field in STAT_FIELDS:
+            getattr(self, field)[index] = getattr(pet, field)
+        self.birth_time[index] = pet.birth_time
+        self.last_update[index] = pet.last_update
+        self.age[index] = pet.age
+        self.growth_stage[index] = pet.growth_stage
+        self.experience[index] = pet.experience
+        self.level[index] = pet.level
+        self.personality[index] = PERSONALITY_CODES[pet.personality]
+        self.mood_bucket[index] = pet.mood_bucket
+
+    def apply_to(self, pets, evolved=None):
+        """Write population state back onto `pets` (same order as from_pets)
+
+        Pets flagged in `evolved` get their evolution celebration set, just
+        as MushroomPet.update_stats() would have done. Mood events from the
+        last update_stats() are emitted here, with the mood word each pet
+        just drew.
+        """
+        mood_changes, self._mood_changes = self._mood_changes, []
+        for i, pet in enumerate(pets):
+            for field in STAT_FIELDS:
+                setattr(pet, field, float(getattr(self, field)[i]))
+            pet.last_update = float(self.last_update[i])
+            pet.age = float(self.age[i])
+            pet.growth_stage = int(self.growth_stage[i])
+            pet.experience = int(self.experience[i])
+            pet.level = int(self.level[i])
+            if pet.mood_bucket != self.mood_bucket[i]:
+                pet.update_mood()
+            if evolved is not None and evolved[i]:
+                pet._evolution_celebration = pet.get_growth_celebration(pet.growth_stage)
+        for i, old_bucket, bucket, when in mood_changes:
+            emit_event(EVENT_MOOD, pets[i].name, when, mood=pets[i].mood, bucket=bucket, old_bucket=old_bucket)
+
+    def update_stats(self, current_time=None):
+        """Advance every pet to `current_time`; returns a mask of pets that evolved
+
+        Mirrors MushroomPet.update_stats() rule for rule, including skipping
+        pets updated less than 36 seconds ago.
+        """
+        if current_time is None:
+            current_time = self.clock.time()
+        self._flush_mood_changes()
+
+        # Every rule below rebinds its array, so these stay the old values
+        before = self._event_columns() if EVENT_LISTENERS else None
+
+        time_passed = (current_time - self.last_update) / 3600  # in hours
+        active = time_passed >= 0.01
+        # Inactive pets get a zero step so every rule below is a no-op for them
+        time_passed = np.where(active, time_passed, 0.0)
+
+        # Personality affects decay rates
+        rates = self._decay[self.personality]
+        self.hunger = np.maximum(0, self.hunger - time_passed * rates[:, 0])
+        self.happiness = np.maximum(0, self.happiness - time_passed * rates[:, 1])
+        self.cleanliness = np.maximum(0, self.cleanliness - time_passed * rates[:, 2])
+        self.energy = np.maximum(0, self.energy - time_passed * rates[:, 3])
+
+        # Negative health factors
+        health_change = np.zeros(self.size)
+        health_change -= np.where(self.hunger < 20, time_passed * 6, 0.0)
+        health_change -= np.where(self.cleanliness < 30, time_passed * 4, 0.0)
+        health_change -= np.where(self.happiness < 15, time_passed * 2, 0.0)
+        health_change -= np.where(self.energy < 10, time_passed * 1, 0.0)
+
+        # Positive health factors
+        good_care_stats = ((self.hunger > 60).astype(np.int8) + (self.cleanliness > 60)
+                           + (self.happiness > 50) + (self.energy > 40))
+        health_change += np.where(good_care_stats >= 3, time_passed * 2,
+                                  np.where(good_care_stats >= 2, time_passed * 0.5, 0.0))
+        self.health = np.maximum(0, np.minimum(100, self.health + health_change))
+
+        # Age and growth
+        age = (current_time - self.birth_time) / 3600
+        self.age = np.where(active, age, self.age)
+        old_stage = self.growth_stage
+        magical = (self.age > 48) & (self.health > 75) & (self.experience >= 400)
+        mature = (self.age > 30) & (self.health > 50)
+        young = (self.age > 16) & (self.health > 35)
+        sprout = self.age > 4
+        new_stage = np.select([magical, mature, young, sprout], [4, 3, 2, 1], default=old_stage)
+        self.growth_stage = np.where(active, new_stage, old_stage).astype(np.int8)
+
+        evolved = self.growth_stage > old_stage
+        self.experience = self.experience + np.where(evolved, 100, 0)  # Bonus for growing
+
+        # Mood bucket from average stats (see get_mood_bucket)
+        avg_stats = (self.hunger + self.happiness + self.health + self.cleanliness + self.energy) / 5
+        mood_bucket = np.select([avg_stats > 80, avg_stats > 60, avg_stats > 40, avg_stats > 20],
+                                [4, 3, 2, 1], default=0)
+        self.mood_bucket = np.where(active, mood_bucket, self.mood_bucket).astype(np.int8)
+
+        self.last_update = np.where(active, current_time, self.last_update)
+        if before is not None:
+            self._emit_changes(before, current_time, active)
+        return evolved
+
+    def _event_columns(self):
+        """Arrays in event_state() order"""
+        return (self.hunger, self.happiness, self.health, self.cleanliness, self.energy,
+                self.mood_bucket, self.level, self.growth_stage)
+
+    def _emit_changes(self, before, when, active):
+        # Mood events wait for apply_to(), where the pets draw their words
+        after = self._event_columns()
+        for i in np.flatnonzero(active):
+            old = tuple(column[i].item() for column in before)
+            new = tuple(column[i].item() for column in after)
+            if new[5] != old[5]:
+                self._mood_changes.append((i, old[5], new[5], when))
+                new = new[:5] + old[5:6] + new[6:]
+            emit_changes(self.names[i], old, new, when)
+
+    def _flush_mood_changes(self):
+        """Emit mood events never passed to apply_to(), with their buckets only"""
+        mood_changes, self._mood_changes = self._mood_changes, []
+        for i, old_bucket, bucket, when in mood_changes:
+            emit_event(EVENT_MOOD, self.names[i], when, bucket=bucket, old_bucket=old_bucket)
+
+
+# Pets loaded, advanced and saved together inside one shard
+TICK_BATCH = 5000
+
+
+def shard_for(name, shards):
+    """Shard number of a pet; stable across processes, unlike hash()"""
+    return zlib.crc32(pet_key(name).encode('utf-8')) % shards
+
+
+def advance_pets(pets):
+    """update_stats() for a batch of pets; returns the pets that evolved
+
+    Uses the vectorized PetPopulation when NumPy is installed.
+    """
+    if np is None:
+        evolved = []
+        for pet in pets:
+            old_stage = pet.growth_stage
+            pet.update_stats()
+            if pet.growth_stage > old_stage:
+                evolved.append(pet)
+        return evolved
+    population = PetPopulation.from_pets(pets)
+    mask = population.update_stats()
+    population.apply_to(pets, mask)
+    return [pet for pet, grew in zip(pets, mask) if grew]
+
+
+def _tick_shard(location, names):
+    """Worker: load, advance and save one shard; returns (count, evolved names and stages)"""
+    count = 0
+    evolved = []
+    with open_store(location) as store:
+        for start in range(0, len(names), TICK_BATCH):
+            records = store.load_many(names[start:start + TICK_BATCH])
+            pets = [MushroomPet.from_dict(record) for record in records.values()]
+            evolved.extend((pet.name, pet.growth_stage) for pet in advance_pets(pets))
+            store.save_pets(pets)
+            count += len(pets)
+    return count, evolved
+
+
+def tick_fleet(location, workers=None, shards=None):
+    """Run update_stats() on every pet stored at location, sharded over processes
+
+    Pets are split into `shards` (default: one per worker) by a hash of
+    their name, and each worker process loads, advances and saves its
+    shards in batches. Evolutions are not saved with the pet, so they are
+    returned for the caller to announce. Returns a report dict with pets,
+    evolved, seconds, pets_per_sec, workers and shards.
+
+    A journal has a single writer, so .journal stores are ticked in this
+    process whatever `workers` says.
+    """
+    workers = 1 if is_journal(location) else workers or os.cpu_count() or 1
+    shards = shards or workers
+    started = time.perf_counter()
+    with open_store(location) as store:
+        names = store.names()
+    parts = [[] for _ in range(shards)]
+    for name in names:
+        parts[shard_for(name, shards)].append(name)
+
+    if workers == 1:
+        results = [_tick_shard(location, part) for part in parts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_tick_shard, [location] * shards, parts))
+
+    count = sum(shard_count for shard_count, _ in results)
+    seconds = time.perf_counter() - started
+    return {
+        'pets': count,
+        'evolved': [pet for _, shard_evolved in results for pet in shard_evolved],
+        'seconds': seconds,
+        'pets_per_sec': count / seconds if seconds > 0 else 0.0,
+        'workers': workers,
+        'shards': shards,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MycoMate fleet tools")
+    commands = parser.add_subparsers(dest='command')
+    tick = commands.add_parser('tick', help="run update_stats on every stored pet")
+    tick.add_argument('store', help="SQLite database, directory of JSON saves or .journal (one worker)")
+    tick.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    tick.add_argument('--shards', type=int, help="pet shards (default: one per worker)")
+    tick.add_argument('-v', '--verbose', action='store_true', help="also list every pet that evolved")
+    args = parser.parse_args(argv)
+
+    if args.command == 'tick':
+        report = tick_fleet(args.store, args.workers, args.shards)
+        print(f"🍄 Ticked {report['pets']} pets in {report['seconds']:.2f}s "
+              f"({report['pets_per_sec']:,.0f} pets/sec, {report['workers']} workers)")
+        by_stage = {}
+        for _, stage in report['evolved']:
+            by_stage[stage] = by_stage.get(stage, 0) + 1
+        if by_stage:
+            stages = ', '.join(f"{count} {STAGE_NAMES[stage]}" for stage, count in sorted(by_stage.items()))
+            print(f"   ✨ {len(report['evolved'])} pets evolved ({stages})")
+        if args.verbose:
+            try:
+                for name, stage in report['evolved']:
+                    print(f"   ✨ {name} evolved into a {STAGE_NAMES[stage]}")
+                sys.stdout.flush()
+            except BrokenPipeError:
+                # Piped into head: stop quietly, the pets are already saved
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+MycoMate Ingest - replay timestamped care actions from other systems.
+
+Reads actions from JSONL or CSV files (or stdin) and applies them to the
+stored pets without the interactive menu:
+
+    {"pet": "Bob", "action": "feed", "food": "water", "time": 1700000000}
+    pet,action,food,time
+    Bob,play,,2024-05-01T12:30:00+00:00
+
+Times are Unix seconds or ISO 8601 dates; dates without a UTC offset are
+read as UTC. Food is only read for feed. The actions are sorted by pet and
+time (in sorted runs spilled to temporary files, then merged at most
+MERGE_FAN_IN at a time), so memory and open files stay bounded however
+large the input is.
+Each pet is advanced exactly to the time of each of its actions with
+fast_forward() before the action runs at that time, so cooldowns follow the
+pet's own clock. Pets are saved in batches, and stores with a history
+(JournalStore) also record every action.
+
+    python3 mycomate_ingest.py pets.db actions.jsonl [more.csv ...] [--create]
+    cat actions.jsonl | python3 mycomate_ingest.py pets.db
+"""
+
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+from mycomate import MushroomPet, FixedClock, FOODS
+from mycomate_storage import open_store, pet_key
+
+ACTIONS = ('feed', 'play', 'clean', 'rest')
+
+# Actions sorted in memory before a run is spilled to disk
+RUN_SIZE = 100000
+# Runs merged at once; more are merged in passes to bound open files
+MERGE_FAN_IN = 64
+# Pets per save_many() batch
+SAVE_BATCH = 500
+
+
+class IngestError(ValueError):
+    """An input line that is not a valid action"""
+
+
+def parse_time(value):
+    """Unix seconds from a number or an ISO 8601 date (UTC unless it has an offset)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        try:
+            return float(value)
+        except ValueError:
+            from datetime import datetime, timezone
+            try:
+                when = datetime.fromisoformat(value.strip())
+            except ValueError:
+                pass
+            else:
+                if when.tzinfo is None:
+                    when = when.replace(tzinfo=timezone.utc)  # Not the local zone of whoever runs this
+                return when.timestamp()
+    raise IngestError(f"Bad time {value!r}; expected Unix seconds or an ISO 8601 date")
+
+
+def parse_action(raw):
+    """(pet name, action, food, time) from one decoded input row"""
+    if not isinstance(raw, dict):
+        raise IngestError("Action must be an object")
+    name = raw.get('pet')
+    if not isinstance(name, str) or not name.strip():
+        raise IngestError("Missing 'pet'")
+    action = raw.get('action')
+    if action not in ACTIONS:
+        raise IngestError(f"Unknown action {action!r}; expected one of {', '.join(ACTIONS)}")
+    food = None
+    if action == 'feed':
+        food = raw.get('food') or 'nutrients'
+        if food not in FOODS:
+            raise IngestError(f"Unknown food {food!r}; expected one of {', '.join(FOODS)}")
+    return name.strip(), action, food, parse_time(raw.get('time'))
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, decoded row) from a JSONL or CSV stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError:
+            yield line_no, None  # Reported by parse_action
+
+
+def _spill(items, directory):
+    fd, path = tempfile.mkstemp(prefix='run_', suffix='.jsonl', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item) + '\n')
+    return path
+
+
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def _merge_runs(paths, directory, fan_in):
+    """Merge spilled runs fan_in at a time until at most fan_in are left"""
+    while len(paths) > fan_in:
+        merged = []
+        for start in range(0, len(paths), fan_in):
+            group = paths[start:start + fan_in]
+            merged.append(_spill(heapq.merge(*(_read_run(path) for path in group)), directory))
+            for path in group:
+                os.remove(path)
+        paths = merged
+    return paths
+
+
+def sorted_actions(actions, directory, run_size=RUN_SIZE, fan_in=MERGE_FAN_IN):
+    """Yield (key, time, sequence, name, action, food) ordered by pet, then time
+
+    Input order breaks ties. Runs of run_size actions are sorted in memory
+    and, when there is more than one, spilled to directory and merged, with
+    at most fan_in run files open at once.
+    """
+    runs = []
+    run = []
+    for sequence, (name, action, food, when) in enumerate(actions):
+        run.append((pet_key(name), when, sequence, name, action, food))
+        if len(run) >= run_size:
+            run.sort()
+            runs.append(_spill(run, directory))
+            run = []
+    run.sort()
+    if not runs:
+        yield from run
+        return
+    if run:
+        runs.append(_spill(run, directory))
+    runs = _merge_runs(runs, directory, fan_in)
+    yield from heapq.merge(*(_read_run(path) for path in runs))
+
+
+def ingest(store, actions, create=False, run_size=RUN_SIZE, save_batch=SAVE_BATCH):
+    """Apply (pet name, action, food, time) tuples to the pets in store; returns a report
+
+    Actions no newer than a pet's saved state are skipped as stale. Pets
+    missing from the store are skipped unless create is set, in which case
+    they sprout at the time of their first action.
+    """
+    report = {'actions': 0, 'applied': 0, 'refused': 0, 'stale': 0, 'unknown_pets': 0,
+              'skipped': 0, 'pets': 0}
+    started = time.perf_counter()
+    clock = FixedClock()  # Shared by the pets, moved to each action's time
+    batch = []
+    with tempfile.TemporaryDirectory(prefix='mycomate_ingest_') as directory:
+        ordered = sorted_actions(actions, directory, run_size)
+        for key, group in itertools.groupby(ordered, key=lambda item: item[0]):
+            first = next(group)
+            record = store.load(first[3])
+            if record is not None:
+                pet = MushroomPet.from_dict(record, clock)
+                # Actions within 36s of an update leave last_update behind
+                saved_at = max(pet.last_update, pet.last_fed, pet.last_played, pet.last_cleaned)
+            elif create:
+                clock.set(first[1])
+                pet = MushroomPet(first[3], clock)
+                saved_at = None
+            else:
+                skipped = 1 + sum(1 for _ in group)
+                report['unknown_pets'] += 1
+                report['skipped'] += skipped
+                report['actions'] += skipped
+                continue
+            for _, when, _, _, action, food in itertools.chain((first,), group):
+                report['actions'] += 1
+                # Already in the save (e.g. a replay of this input), or out of order
+                if (saved_at is not None and when <= saved_at) or when < pet.last_update:
+                    report['stale'] += 1
+                    continue
+                clock.set(when)
+                pet.fast_forward(when)
+                result = pet.feed(food) if action == 'feed' else getattr(pet, action)()
+                report['applied' if result.ok else 'refused'] += 1
+                store.record_action(pet, result)
+            batch.append(pet.to_dict())
+            report['pets'] += 1
+            if len(batch) >= save_batch:
+                store.save_many(batch)
+                batch = []
+    if batch:
+        store.save_many(batch)
+    report['seconds'] = time.perf_counter() - started
+    return report
+
+
+def read_actions(paths, fmt=None, on_error=None):
+    """Yield parsed actions from files ('-' is stdin); bad rows go to on_error(source, line, error)"""
+    for path in paths:
+        path_fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+        stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', newline='')
+        try:
+            for line_no, raw in read_rows(stream, path_fmt):
+                try:
+                    yield parse_action(raw)
+                except IngestError as e:
+                    if on_error is not None:
+                        on_error(path, line_no, e)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply timestamped care actions from JSONL or CSV")
+    parser.add_argument('store', help="SQLite database, .journal or directory of JSON saves")
+    parser.add_argument('inputs', nargs='*', default=['-'], help="JSONL or CSV files; - or none for stdin")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help="input format (default: by extension, stdin is JSONL)")
+    parser.add_argument('--create', action='store_true', help="create pets that are not in the store")
+    parser.add_argument('--batch', type=int, default=SAVE_BATCH, help="pets per save batch (default %(default)s)")
+    parser.add_argument('--run-size', type=int, default=RUN_SIZE,
+                        help="actions sorted in memory at once (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    invalid = []
+
+    def report_error(source, line_no, error):
+        invalid.append(error)
+        if len(invalid) <= 10:
+            print(f"⚠️  {source}:{line_no}: {error}", file=sys.stderr)
+
+    actions = read_actions(args.inputs, args.format, report_error)
+    with open_store(args.store) as store:
+        report = ingest(store, actions, args.create, args.run_size, args.batch)
+    print(f"🍄 {report['actions']} actions for {report['pets']} pets in {report['seconds']:.2f}s: "
+          f"{report['applied']} applied, {report['refused']} refused, {report['stale']} stale, "
+          f"{report['skipped']} for {report['unknown_pets']} unknown pets, {len(invalid)} invalid lines")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+MycoMate Metrics - latency histograms and counters for pet operations.
+
+enable() wraps the instrumented operations (stat updates, care actions,
+saves, loads, fleet ticks and scheduler runs) with timers; disable() puts
+the original functions back, so with metrics off there is no overhead at
+all. Each operation gets a call counter, an error counter and a latency
+histogram. The scheduler also reports how late pets were woken (tick lag).
+
+    metrics = enable()
+    metrics.serve(9108)                  # http://127.0.0.1:9108/metrics
+    metrics.start_reporter(60, path='mycomate.prom')
+    print(metrics.summary_line())
+
+Metrics are exported in the Prometheus text format, to a file (e.g. for a
+node_exporter textfile collector) or from a local HTTP endpoint.
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mycomate import atomic_write_bytes
+
+# Histogram bucket upper bounds in seconds, from 10us to 10s
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                   0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tick lag bucket upper bounds in seconds, from 100ms to 1h
+LAG_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+# (module, attribute path, operation name) of everything enable() times
+INSTRUMENTED = (
+    ('mycomate', 'MushroomPet.update_stats', 'update_stats'),
+    ('mycomate', 'MushroomPet.fast_forward', 'fast_forward'),
+    ('mycomate', 'MushroomPet.feed', 'feed'),
+    ('mycomate', 'MushroomPet.play', 'play'),
+    ('mycomate', 'MushroomPet.clean', 'clean'),
+    ('mycomate', 'MushroomPet.rest', 'rest'),
+    ('mycomate', 'MushroomPet.save_to_file', 'save_to_file'),
+    ('mycomate', 'MushroomPet.load_from_file', 'load_from_file'),
+    ('mycomate_storage', 'JsonFileStore.save_many', 'json_save'),
+    ('mycomate_storage', 'JsonFileStore.load_many', 'json_load'),
+    ('mycomate_storage', 'SqliteStore.save_many', 'sqlite_save'),
+    ('mycomate_storage', 'SqliteStore.load_many', 'sqlite_load'),
+    ('mycomate_storage', 'JournalStore.save_many', 'journal_save'),
+    ('mycomate_storage', 'JournalStore.load_many', 'journal_load'),
+    ('mycomate_storage', 'JournalStore.record_action', 'journal_record'),
+    ('mycomate_storage', 'WriteBehindSaver.flush', 'saver_flush'),
+    ('mycomate_fleet', 'PetPopulation.update_stats', 'fleet_update_stats'),
+    ('mycomate_fleet', 'tick_fleet', 'tick_fleet'),
+    ('mycomate_scheduler', 'ThresholdScheduler.run_pending', 'scheduler_run'),
+)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, plus count, sum and max"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding quantile q (0-1), or None if empty"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for bound, count in zip(self.buckets, self.counts):
+                seen += count
+                if seen >= rank:
+                    return bound
+            return self.max
+
+
+class Metrics:
+    """Per-operation call and error counters, latency histograms and tick lag"""
+
+    def __init__(self):
+        self.latency = {}     # operation -> Histogram
+        self.errors = {}      # operation -> count
+        self.tick_lag = Histogram(LAG_BUCKETS)
+        self.started = time.time()
+        self._server = None
+        self._reporter = None
+        self._stop = threading.Event()
+
+    def histogram(self, operation):
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            histogram = self.latency.setdefault(operation, Histogram())
+        return histogram
+
+    def timed(self, operation, function):
+        """Wrap function so every call is timed under operation"""
+        histogram = self.histogram(operation)
+        errors = self.errors
+        errors.setdefault(operation, 0)
+        perf_counter = time.perf_counter
+
+        def timed_call(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                errors[operation] += 1
+                raise
+            finally:
+                histogram.observe(perf_counter() - start)
+        timed_call.__wrapped__ = function
+        timed_call.__name__ = getattr(function, '__name__', operation)
+        timed_call.__doc__ = function.__doc__
+        return timed_call
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP mycomate_operation_seconds Latency of pet operations",
+            "# TYPE mycomate_operation_seconds histogram",
+        ]
+        for operation, histogram in sorted(self.latency.items()):
+            lines.extend(_histogram_lines('mycomate_operation_seconds', f'operation="{operation}"', histogram))
+        lines.append("# HELP mycomate_operations_total Calls of pet operations")
+        lines.append("# TYPE mycomate_operations_total counter")
+        for operation, histogram in sorted(self.latency.items()):
+            lines.append(f'mycomate_operations_total{{operation="{operation}"}} {histogram.count}')
+        lines.append("# HELP mycomate_operation_errors_total Pet operations that raised")
+        lines.append("# TYPE mycomate_operation_errors_total counter")
+        for operation, count in sorted(self.errors.items()):
+            lines.append(f'mycomate_operation_errors_total{{operation="{operation}"}} {count}')
+        lines.append("# HELP mycomate_tick_lag_seconds How late the scheduler woke due pets")
+        lines.append("# TYPE mycomate_tick_lag_seconds histogram")
+        lines.extend(_histogram_lines('mycomate_tick_lag_seconds', '', self.tick_lag))
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Atomically write the metrics file, e.g. for a textfile collector"""
+        atomic_write_bytes(path, self.render_prometheus().encode('utf-8'))
+
+    def summary_line(self):
+        """One line with calls, mean and p99 latency of every operation that ran"""
+        parts = []
+        for operation, histogram in sorted(self.latency.items()):
+            if histogram.count:
+                mean = histogram.sum / histogram.count
+                parts.append(f"{operation} {histogram.count}x {mean * 1000:.2f}/"
+                             f"{histogram.quantile(0.99) * 1000:.2f}ms")
+        if self.tick_lag.count:
+            parts.append(f"tick lag max {self.tick_lag.max:.1f}s")
+        return "📊 " + (" | ".join(parts) if parts else "no operations yet")
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serve /metrics over HTTP from a daemon thread; returns the bound (host, port)"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes are not worth a log line each
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='mycomate-metrics', daemon=True).start()
+        return self._server.server_address[:2]
+
+    def start_reporter(self, interval=60.0, output=print, path=None):
+        """Every interval seconds, pass summary_line() to output and rewrite path"""
+        def report():
+            while not self._stop.wait(interval):
+                if output is not None:
+                    output(self.summary_line())
+                if path is not None:
+                    self.write_prometheus(path)
+        self._reporter = threading.Thread(target=report, name='mycomate-metrics-reporter', daemon=True)
+        self._reporter.start()
+
+    def stop(self):
+        """Stop the endpoint and the reporter"""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _histogram_lines(name, labels, histogram):
+    separator = ',' if labels else ''
+    cumulative = 0
+    lines = []
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {histogram.count}')
+    suffix = f'{{{labels}}}' if labels else ''
+    lines.append(f'{name}_sum{suffix} {histogram.sum}')
+    lines.append(f'{name}_count{suffix} {histogram.count}')
+    return lines
+
+
+_active = None
+_originals = []   # (owner, attribute, original function) to restore
+
+
+def _resolve(module_name, path):
+    owner = __import__(module_name)
+    *parents, attribute = path.split('.')
+    for parent in parents:
+        owner = getattr(owner, parent)
+    return owner, attribute
+
+
+def enable(metrics=None):
+    """Start timing every INSTRUMENTED operation; returns the active Metrics"""
+    global _active
+    if _active is not None:
+        return _active
+    metrics = metrics or Metrics()
+    for module_name, path, operation in INSTRUMENTED:
+        owner, attribute = _resolve(module_name, path)
+        original = owner.__dict__[attribute]
+        _originals.append((owner, attribute, original))
+        if operation == 'scheduler_run':
+            setattr(owner, attribute, _with_lag(metrics, metrics.timed(operation, original)))
+        else:
+            setattr(owner, attribute, metrics.timed(operation, original))
+    _active = metrics
+    return metrics
+
+
+def _with_lag(metrics, run_pending):
+    def run_pending_with_lag(scheduler, *args, **kwargs):
+        woken = run_pending(scheduler, *args, **kwargs)
+        if woken:
+            metrics.tick_lag.observe(scheduler.lag)
+        return woken
+    return run_pending_with_lag
+
+
+def disable():
+    """Restore the uninstrumented functions and stop exporting"""
+    global _active
+    while _originals:
+        owner, attribute, original = _originals.pop()
+        setattr(owner, attribute, original)
+    if _active is not None:
+        _active.stop()
+    _active = None
+
+
+def active():
+    """The enabled Metrics, or None"""
+    return _active
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+MycoMate Scheduler - wake pets only when a rule threshold is crossed.
+
+Between threshold crossings a pet's stats change linearly and no rule
+switches on or off, so there is nothing to compute. ThresholdScheduler
+keeps every pet's next crossing time (MushroomPet.next_threshold_time) in
+a heap, sleeps until the earliest one, and advances only the pets that are
+due. An idle fleet costs one timer wait instead of a polling loop.
+
+    scheduler = ThresholdScheduler(on_wake=saver.mark_dirty)
+    for pet in pets:
+        scheduler.schedule(pet)
+    scheduler.start()
+    ...
+    scheduler.schedule(pet)  # again after every action on the pet
+"""
+
+import heapq
+import threading
+
+from mycomate import REAL_CLOCK
+from mycomate_storage import pet_key
+
+# fast_forward() ignores steps under 36 seconds, so never wake a pet sooner
+MIN_INTERVAL = 36
+
+
+class ThresholdScheduler:
+    """Heap of pets ordered by their next threshold crossing
+
+    schedule() (re)computes a pet's wake-up time; call it whenever the pet
+    changes outside the scheduler, e.g. after a care action. Superseded heap
+    entries are skipped lazily when they surface. run_pending() advances
+    every due pet with fast_forward(), calls on_wake(pet) and reschedules
+    it. start() runs that loop on a background thread, timed by `clock`
+    (use the pets' clock; an AcceleratedClock shortens the waits).
+    """
+
+    def __init__(self, on_wake=None, clock=None):
+        self.on_wake = on_wake
+        self.clock = clock or REAL_CLOCK
+        self.wakeups = 0
+        self.lag = 0.0        # Seconds the most overdue pet of the last run waited
+        self._heap = []       # (due time, sequence, key)
+        self._pets = {}       # key -> (pet, due time)
+        self._sequence = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pets)
+
+    def schedule(self, pet):
+        """Track a pet, or update its wake-up time; returns the time or None"""
+        due = pet.next_threshold_time()
+        key = pet_key(pet.name)
+        with self._cond:
+            if due is None:
+                self._pets.pop(key, None)  # Nothing left to cross
+                return None
+            due = max(due, pet.last_update + MIN_INTERVAL)
+            self._pets[key] = (pet, due)
+            self._sequence += 1
+            heapq.heappush(self._heap, (due, self._sequence, key))
+            if self._heap[0][2] == key:
+                self._cond.notify()  # Earlier than what the loop is waiting for
+        return due
+
+    def unschedule(self, name):
+        """Stop tracking a pet"""
+        with self._cond:
+            return self._pets.pop(pet_key(name), None) is not None
+
+    def next_due(self):
+        """Earliest wake-up time, or None when no pet is scheduled"""
+        with self._cond:
+            return self._peek()
+
+    def _peek(self):
+        heap = self._heap
+        while heap:
+            due, _, key = heap[0]
+            entry = self._pets.get(key)
+            if entry is not None and entry[1] == due:
+                return due
+            heapq.heappop(heap)  # Superseded or unscheduled
+        return None
+
+    def _pop_due(self, now):
+        due_pets = []
+        with self._cond:
+            self.lag = 0.0
+            while True:
+                due = self._peek()
+                if due is None or due > now:
+                    break
+                if not due_pets:
+                    self.lag = now - due  # The earliest due pet waited longest
+                _, _, key = heapq.heappop(self._heap)
+                due_pets.append(self._pets.pop(key)[0])
+        return due_pets
+
+    def run_pending(self, now=None):
+        """Advance every pet due by now; returns the pets that were woken"""
+        if now is None:
+            now = self.clock.time()
+        woken = self._pop_due(now)
+        for pet in woken:
+            pet.fast_forward(now)
+            self.wakeups += 1
+            if self.on_wake is not None:
+                self.on_wake(pet)
+            self.schedule(pet)
+        return woken
+
+    def start(self):
+        """Run the wake-up loop on a daemon thread"""
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='mycomate-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    due = self._peek()
+                    delay = None if due is None else due - self.clock.time()
+                    if delay is not None and delay <= 0:
+                        break
+                    # Sleeps until due, or until notified when empty or on a FixedClock
+                    self._cond.wait(None if delay is None else self.clock.wait_seconds(delay))
+                if self._stopped:
+                    return
+            self.run_pending()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+MycoMate Server - host many pets from one asyncio event loop.
+
+Clients connect over TCP and send one JSON request per line; every request
+gets one JSON response line, and the connection stays open for the next.
+
+    {"pet": "Bob", "action": "feed", "food": "water"}
+    {"pet": "Bob", "action": "status"}
+
+Actions are feed (optional "food"), play, clean, rest and status. A pet
+that has no save yet is created on first use, as in the interactive game.
+An optional "id" is echoed back so clients can pipeline requests.
+
+    {"action": "needs_care", "limit": 10}
+
+lists the pets that most urgently need care, from an UrgencyIndex kept
+current by every action and save (and filled from the store at start).
+
+Pets stay resident once loaded. Each pet has its own asyncio lock, so
+requests for one pet run in order while different pets never wait on each
+other; loads and action records run on worker threads and saves go
+through a WriteBehindSaver.
+
+    python3 mycomate.py --serve [--host 127.0.0.1] [--port 8765] [--store .] [--metrics-port N]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import signal
+import sys
+import traceback
+
+from mycomate import MushroomPet, REAL_CLOCK, FOODS, STAGE_NAMES
+from mycomate_storage import WriteBehindSaver, open_store, pet_key
+from mycomate_urgency import UrgencyIndex
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_LINE = 4096
+
+# Names end up in save file names, so keep them to plain characters
+PET_NAME = re.compile(r"[\w .'-]{1,32}")
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+
+ACTIONS = ('feed', 'play', 'clean', 'rest', 'status')
+MAX_NEEDS_CARE = 1000
+
+
+class RequestError(ValueError):
+    """A request the server cannot carry out; reported to the client"""
+
+
+def strip_colors(text):
+    """Remove ANSI color codes from a rendered message"""
+    return ANSI_ESCAPE.sub('', text)
+
+
+def pet_state(pet):
+    """Snapshot of a pet for responses: its save record plus display fields"""
+    state = pet.to_dict()
+    state['stage_name'] = STAGE_NAMES[pet.growth_stage]
+    return state
+
+
+class PetServer:
+    """Serves care actions for any number of pets over a JSON line protocol
+
+    Pets created or loaded by the server run on `clock`, which also says
+    which pets are overdue in needs_care responses.
+    """
+
+    def __init__(self, store, save_interval=5.0, clock=None):
+        self.store = store
+        self.clock = clock or REAL_CLOCK
+        self.urgency = UrgencyIndex(self.clock)
+        self.urgency.watch(store)
+        self.saver = WriteBehindSaver(store, interval=save_interval)
+        self.pets = {}        # key -> resident MushroomPet
+        self.requests = 0
+        self.connections = 0
+        self._locks = {}      # key -> asyncio.Lock
+        self._server = None
+
+    def _lock_for(self, key):
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def _get_pet(self, name):
+        """Resident pet for name, loading or creating it (caller holds its lock)"""
+        key = pet_key(name)
+        pet = self.pets.get(key)
+        if pet is None:
+            loop = asyncio.get_running_loop()
+            pet = await loop.run_in_executor(None, self.store.load_pet, name, True, self.clock)
+            if pet is None:
+                pet = MushroomPet(name, self.clock)
+                self.saver.mark_dirty(pet)
+            self.pets[key] = pet
+        return pet
+
+    async def handle_request(self, request):
+        """Carry out one decoded request; returns the response dict"""
+        if not isinstance(request, dict):
+            raise RequestError("Request must be a JSON object")
+        if request.get('action') == 'needs_care':
+            return self.needs_care(request.get('limit', 10))
+        name = request.get('pet')
+        if not isinstance(name, str) or not PET_NAME.fullmatch(name.strip()):
+            raise RequestError("'pet' must be a name of 1-32 letters, digits, spaces or .'-_")
+        name = name.strip()
+        action = request.get('action', 'status')
+        if action not in ACTIONS:
+            raise RequestError(f"Unknown action {action!r}; expected one of {', '.join(ACTIONS)}")
+        food = request.get('food', 'nutrients')
+        if action == 'feed' and food not in FOODS:
+            raise RequestError(f"Unknown food {food!r}; expected one of {', '.join(FOODS)}")
+
+        async with self._lock_for(pet_key(name)):
+            pet = await self._get_pet(name)
+            response = {'ok': True, 'action': action}
+            if action == 'status':
+                pet.update_stats()
+            else:
+                result = pet.feed(food) if action == 'feed' else getattr(pet, action)()
+                response.update(ok=result.ok, result=result.key, message=strip_colors(str(result)),
+                                deltas=result.deltas, leveled_up=result.leveled_up)
+                # Journal appends are blocking file I/O; the lock still keeps them in order
+                await asyncio.get_running_loop().run_in_executor(None, self.store.record_action, pet, result)
+                if result.ok:
+                    self.saver.mark_dirty(pet)
+            # Evolution celebrations are shown once, like in the interactive game
+            if hasattr(pet, '_evolution_celebration'):
+                response['evolution'] = strip_colors(pet._evolution_celebration)
+                del pet._evolution_celebration
+                self.saver.mark_dirty(pet)
+            self.urgency.update(pet)
+            response['pet'] = pet_state(pet)
+        return response
+
+    def needs_care(self, limit):
+        """Response listing the `limit` pets that need care soonest"""
+        if not isinstance(limit, int) or not 0 < limit <= MAX_NEEDS_CARE:
+            raise RequestError(f"'limit' must be a whole number from 1 to {MAX_NEEDS_CARE}")
+        now = self.clock.time()
+        pets = [{'name': name, 'due': due, 'overdue': due <= now}
+                for name, due in self.urgency.top(limit)]
+        return {'ok': True, 'action': 'needs_care', 'pets': pets}
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until the client closes it"""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"ok": false, "error": "Request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                self.requests += 1
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if isinstance(request, dict):
+                        request_id = request.get('id')
+                    response = await self.handle_request(request)
+                except ValueError as e:  # Bad JSON or RequestError
+                    response = {'ok': False, 'error': str(e)}
+                except Exception as e:
+                    # A bug or a failing store must not drop the connection unanswered
+                    print(f"⚠️  Request failed: {line.decode('utf-8', 'replace').strip()}", file=sys.stderr)
+                    traceback.print_exc()
+                    response = {'ok': False, 'error': f"Internal error: {type(e).__name__}"}
+                if request_id is not None:
+                    response['id'] = request_id
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # Client went away, or the server is shutting down
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start listening; port 0 picks a free port (see address)"""
+        self._server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        # Index the saved pets in the background; newer live updates win
+        asyncio.get_running_loop().run_in_executor(None, self.urgency.load, self.store)
+        return self._server
+
+    @property
+    def address(self):
+        """(host, port) the server is listening on"""
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT, announce=None):
+        """Listen and serve until cancelled; announce(address) is called once listening"""
+        server = await self.start(host, port)
+        if announce is not None:
+            announce(self.address)
+        async with server:
+            await server.serve_forever()
+
+    async def stop(self):
+        """Stop accepting connections"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def close(self):
+        """Flush pending saves and close the store"""
+        ok = self.saver.close()
+        self.store.close()
+        return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve MycoMate pets over a JSON line protocol")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"address to listen on (default {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"port to listen on (default {DEFAULT_PORT})")
+    parser.add_argument('--store', default='.', help="directory of JSON saves, .journal directory or SQLite database (default .)")
+    parser.add_argument('--metrics-port', type=int,
+                        help="serve Prometheus metrics on this localhost port and log a summary every minute")
+    args = parser.parse_args(argv)
+
+    if args.metrics_port is not None:
+        import mycomate_metrics
+        metrics = mycomate_metrics.enable()
+        metrics.serve(args.metrics_port)
+        metrics.start_reporter(60, output=lambda line: print(line, flush=True))
+
+    server = PetServer(open_store(args.store))
+
+    def interrupt(signum, frame):
+        raise KeyboardInterrupt  # Stop like Ctrl+C, flushing saves on the way out
+    signal.signal(signal.SIGTERM, interrupt)
+
+    def announce(address):
+        print(f"🍄 MycoMate serving pets from {args.store} on {address[0]}:{address[1]}", flush=True)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, announce))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        saved = server.close()
+    print(f"\n🍄 Server stopped after {server.requests} requests")
+    return 0 if saved else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+MycoMate Simulator - Monte Carlo balance runs for care policies.
+
+Raises many pets from spore under each care policy, for every personality
+and a seeded random favorite food, and reports how long they take to turn
+magical, how many let their health hit zero, and their level curve. Pets
+are spread over a process pool and every pet has its own seed, so a run
+is reproducible regardless of the number of workers.
+
+    python3 mycomate_sim.py --pets 2000 --days 7 --policy neglect --policy care:4 --policy care:8:favorite
+
+Policies are given as name[:hours[:food]]:
+
+    neglect           never care for the pet
+    feed:H[:FOOD]     feed every H hours
+    care:H[:FOOD]     feed, play, clean and rest every H hours
+
+FOOD is a food name, 'favorite' or 'random' (default nutrients).
+
+Each --tune adds a tuning to the grid, next to the unchanged defaults: it
+overrides some of the TUNABLE constants of mycomate (values in JSON,
+several separated by ';'), and every pet of that cell runs with them:
+
+    python3 mycomate_sim.py --tune HUNGER_DECAY=3 --tune 'HUNGER_DECAY=5;ENERGY_DECAY=4'
+    python3 mycomate_sim.py --tune 'PERSONALITY_DECAY={"sleepy": [0.9, 1.2, 1, 0.5]}'
+    python3 mycomate_sim.py --tune 'GROWTH_REQUIREMENTS=[[4, 36, 75, 300], [3, 30, 50, 0], [2, 16, 35, 0], [1, 4, null, 0]]'
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mycomate
+from mycomate import MushroomPet, FixedClock, PERSONALITIES, FOODS, FAVORITE_FOODS
+
+# Pets per task sent to a worker process
+CHUNK_SIZE = 200
+
+# Balance constants of mycomate a tuning may override
+TUNABLE = ('HUNGER_DECAY', 'HAPPINESS_DECAY', 'CLEANLINESS_DECAY', 'ENERGY_DECAY',
+           'PERSONALITY_DECAY', 'GROWTH_REQUIREMENTS')
+DEFAULT_TUNING = 'default'
+
+
+class CarePolicy:
+    """Base care policy: called every `every` hours (plus up to `jitter` hours late)
+
+    Subclasses implement care(pet, rng). Policies are pickled to worker
+    processes, so keep them to plain attributes.
+    """
+
+    name = 'policy'
+
+    def __init__(self, every=4.0, food='nutrients', jitter=0.0):
+        self.every = every
+        self.food = food
+        self.jitter = jitter
+
+    def __repr__(self):
+        return self.label
+
+    @property
+    def label(self):
+        return f"{self.name}:{self.every:g}:{self.food}"
+
+    def next_check(self, hour, rng):
+        """Hour of the next care visit after one at `hour`"""
+        return hour + self.every + (rng.uniform(0, self.jitter) if self.jitter else 0)
+
+    def pick_food(self, pet, rng):
+        if self.food == 'favorite':
+            return pet.favorite_food
+        if self.food == 'random':
+            return rng.choice(FOODS)
+        return self.food
+
+    def care(self, pet, rng):
+        raise NotImplementedError
+
+
+class Neglect(CarePolicy):
+    """Never visits"""
+
+    name = 'neglect'
+
+    @property
+    def label(self):
+        return self.name
+
+    def next_check(self, hour, rng):
+        return float('inf')
+
+    def care(self, pet, rng):
+        pass
+
+
+class FeedEvery(CarePolicy):
+    """Feeds every `every` hours and does nothing else"""
+
+    name = 'feed'
+
+    def care(self, pet, rng):
+        pet.feed(self.pick_food(pet, rng))
+
+
+class FullCare(CarePolicy):
+    """Feeds, plays, cleans and rests every `every` hours"""
+
+    name = 'care'
+
+    def care(self, pet, rng):
+        pet.feed(self.pick_food(pet, rng))
+        pet.play()
+        pet.clean()
+        pet.rest()
+
+
+POLICIES = {policy.name: policy for policy in (Neglect, FeedEvery, FullCare)}
+
+
+def parse_policy(spec):
+    """Policy from a name[:hours[:food]] spec"""
+    name, *args = spec.split(':')
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy {name!r}; expected one of {', '.join(POLICIES)}")
+    every = float(args[0]) if args else 4.0
+    food = args[1] if len(args) > 1 else 'nutrients'
+    if food not in FOODS + ('favorite', 'random'):
+        raise ValueError(f"Unknown food {food!r}")
+    return POLICIES[name](every, food)
+
+
+def parse_tuning(spec):
+    """Overrides dict from a 'NAME=JSON[;NAME=JSON...]' spec"""
+    overrides = {}
+    for item in spec.split(';'):
+        name, sep, value = item.partition('=')
+        name = name.strip()
+        if not sep or name not in TUNABLE:
+            raise ValueError(f"Bad tuning {item!r}; expected NAME=VALUE with NAME one of {', '.join(TUNABLE)}")
+        try:
+            overrides[name] = json.loads(value)
+        except ValueError:
+            raise ValueError(f"Bad value for {name}: {value.strip()!r} is not JSON")
+    return overrides
+
+
+def apply_tuning(overrides):
+    """Set tuning constants of mycomate in this process; returns their previous values
+
+    PERSONALITY_DECAY overrides are merged into the defaults, so a tuning
+    can change one personality. GROWTH_REQUIREMENTS also updates the
+    health levels and ages that fast_forward() steps between.
+    """
+    previous = {name: getattr(mycomate, name)
+                for name in tuple(overrides) + ('HEALTH_LEVELS', 'GROWTH_AGES')}
+    for name, value in overrides.items():
+        if name not in TUNABLE:
+            raise ValueError(f"{name} is not tunable")
+        if name == 'PERSONALITY_DECAY':
+            value = {**mycomate.PERSONALITY_DECAY, **{key: tuple(rates) for key, rates in value.items()}}
+        elif name == 'GROWTH_REQUIREMENTS':
+            value = tuple(tuple(row) for row in value)
+        setattr(mycomate, name, value)
+    mycomate.HEALTH_LEVELS, mycomate.GROWTH_AGES = mycomate.growth_gates(mycomate.GROWTH_REQUIREMENTS)
+    return previous
+
+
+def simulate_pet(policy, personality, seed, days, clock=None, resolution=1.0):
+    """Raise one pet under policy; returns (hours to magical or None, died, level per day)
+
+    Stats are advanced exactly with fast_forward() between care visits and
+    at least every `resolution` hours, which is also the precision of the
+    time to magical.
+    """
+    rng = random.Random(seed)  # Mood and message words do not change the outcome
+    clock = clock or FixedClock()
+    clock.set(0.0)
+    pet = MushroomPet(f"Sim{seed}", clock)
+    pet.personality = personality
+    pet.favorite_food = rng.choice(FAVORITE_FOODS)
+    pet.birth_time = pet.last_update = 0.0
+    pet.last_fed = pet.last_played = pet.last_cleaned = -86400.0
+
+    magical_hour = None
+    died = False
+    levels = []
+    hour = 0.0
+    next_visit = 0.0  # First visit right after the spore sprouts
+    end = days * 24
+    while hour < end:
+        hour = min(next_visit, hour + resolution, end)
+        clock.set(hour * 3600)
+        pet.fast_forward(clock.now)
+        if hour >= next_visit:
+            policy.care(pet, rng)
+            next_visit = policy.next_check(hour, rng)
+        if pet.health <= 0:
+            died = True
+        if magical_hour is None and pet.growth_stage == 4:
+            magical_hour = hour
+        while hour >= (len(levels) + 1) * 24 and len(levels) < days:
+            levels.append(pet.level)  # Steps over a day long cover several days
+    return magical_hour, died, levels
+
+
+def _run_chunk(policy, personality, seeds, days, resolution, overrides=None):
+    """Worker: simulate pets for the given seeds on one simulated clock, under overrides"""
+    clock = FixedClock()
+    previous = apply_tuning(overrides or {})
+    try:
+        return [simulate_pet(policy, personality, seed, days, clock, resolution) for seed in seeds]
+    finally:
+        for name, value in previous.items():  # Pool workers go on to other cells
+            setattr(mycomate, name, value)
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def summarize(outcomes, days):
+    """Distribution summary for a list of simulate_pet() outcomes"""
+    magical = [hour for hour, _, _ in outcomes if hour is not None]
+    count = len(outcomes)
+    return {
+        'pets': count,
+        'magical_rate': len(magical) / count if count else 0.0,
+        'magical_hours_p10': _percentile(magical, 0.1),
+        'magical_hours_p50': _percentile(magical, 0.5),
+        'magical_hours_p90': _percentile(magical, 0.9),
+        'death_rate': sum(1 for _, died, _ in outcomes if died) / count if count else 0.0,
+        'mean_level_by_day': [sum(levels[day] for _, _, levels in outcomes) / count
+                              for day in range(days)] if count else [],
+    }
+
+
+def run_grid(policies, personalities=PERSONALITIES, pets=1000, days=7, seed=0,
+             workers=None, resolution=1.0, tunings=None):
+    """Simulate `pets` pets per (tuning, policy, personality)
+
+    tunings maps a label to a dict of overrides (see apply_tuning); the
+    default is the unchanged constants, as DEFAULT_TUNING. Every tuning
+    uses the same seeds. Returns {(tuning, policy label, personality): summary}.
+    """
+    workers = workers or os.cpu_count() or 1
+    tunings = tunings or {DEFAULT_TUNING: {}}
+    tasks = []
+    for tuning, overrides in tunings.items():
+        for policy in policies:
+            for personality in personalities:
+                for start in range(0, pets, CHUNK_SIZE):
+                    seeds = range(seed + start, seed + min(pets, start + CHUNK_SIZE))
+                    tasks.append((tuning, overrides, policy, personality, seeds))
+
+    args = ([task[2] for task in tasks], [task[3] for task in tasks], [task[4] for task in tasks],
+            [days] * len(tasks), [resolution] * len(tasks), [task[1] for task in tasks])
+    if workers == 1:
+        results = list(map(_run_chunk, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, *args))
+
+    outcomes = {}
+    for (tuning, _, policy, personality, _), chunk in zip(tasks, results):
+        outcomes.setdefault((tuning, policy.label, personality), []).extend(chunk)
+    return {key: summarize(cell, days) for key, cell in outcomes.items()}
+
+
+def _hours(value):
+    return f"{value:.0f}h" if value is not None else "-"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo care-policy simulator")
+    parser.add_argument('--policy', action='append', help="policy spec, may repeat (default care:4)")
+    parser.add_argument('--pets', type=int, default=1000, help="pets per policy and personality (default 1000)")
+    parser.add_argument('--days', type=int, default=7, help="days to simulate (default 7)")
+    parser.add_argument('--seed', type=int, default=0, help="base seed (default 0)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random delay of each visit, in hours")
+    parser.add_argument('--resolution', type=float, default=1.0,
+                        help="hours between stat checks; coarser is faster (default 1)")
+    parser.add_argument('--tune', action='append', default=[],
+                        help="NAME=JSON[;NAME=JSON] constant overrides to compare with the defaults, may repeat")
+    parser.add_argument('--output', help="also write the summaries to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        policies = [parse_policy(spec) for spec in (args.policy or ['care:4'])]
+        tunings = {DEFAULT_TUNING: {}}
+        tunings.update((spec, parse_tuning(spec)) for spec in args.tune)
+    except ValueError as e:
+        parser.error(str(e))
+    for policy in policies:
+        policy.jitter = args.jitter
+
+    started = time.perf_counter()
+    grid = run_grid(policies, pets=args.pets, days=args.days, seed=args.seed, workers=args.workers,
+                    resolution=args.resolution, tunings=tunings)
+    elapsed = time.perf_counter() - started
+
+    header = f"{'policy':<22}{'personality':<12}{'magical':>8}{'p10':>7}{'p50':>7}{'p90':>7}{'died':>7}  level by day"
+    tuning = None
+    for (cell_tuning, label, personality), summary in grid.items():
+        if cell_tuning != tuning:
+            tuning = cell_tuning
+            if len(tunings) > 1:
+                print(f"\n[{tuning}]")
+            print(header)
+        levels = ' '.join(f"{level:.1f}" for level in summary['mean_level_by_day'])
+        print(f"{label:<22}{personality:<12}{summary['magical_rate']:>8.0%}"
+              f"{_hours(summary['magical_hours_p10']):>7}{_hours(summary['magical_hours_p50']):>7}"
+              f"{_hours(summary['magical_hours_p90']):>7}{summary['death_rate']:>7.0%}  {levels}")
+    if args.output:
+        rows = [dict(tuning=cell_tuning, overrides=tunings[cell_tuning], policy=label,
+                     personality=personality, **summary)
+                for (cell_tuning, label, personality), summary in grid.items()]
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+    total = sum(summary['pets'] for summary in grid.values())
+    print(f"\n🍄 Simulated {total} pets for {args.days} days in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,746 @@
+#!/usr/bin/env python3
+"""
+MycoMate Storage - pluggable save backends for many pets.
+
+PetStore is the backend interface. JsonFileStore keeps the classic
+.mushroom_pet_<name>.json file per pet; SqliteStore keeps a whole fleet in
+one SQLite database in WAL mode with batched, transactional upserts.
+JournalStore appends every change and care action to a log that is
+compacted into snapshots in the background.
+WriteBehindSaver sits in front of any store and coalesces saves of dirty
+pets onto a background thread.
+
+Import existing JSON saves into a database, or convert any store to and
+from the binary bulk format (see mycomate_codec), with:
+
+    python3 mycomate_storage.py migrate pets.db [save_dir]
+    python3 mycomate_storage.py pack pets.db fleet.myco
+    python3 mycomate_storage.py unpack fleet.myco pets.db
+
+Recover a save directory's pet index with:
+
+    python3 mycomate_storage.py rebuild-index [save_dir]
+
+Inspect or compact a journal with:
+
+    python3 mycomate_storage.py history pets.journal Sporey
+    python3 mycomate_storage.py compact pets.journal
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; journals are then not locked
+    fcntl = None
+
+from mycomate import MushroomPet, REAL_CLOCK, SAVE_FIELDS, atomic_write_bytes, atomic_write_json
+
+SAVE_PREFIX = '.mushroom_pet_'
+SAVE_SUFFIX = '.json'
+
+
+def pet_key(name):
+    """Storage key for a pet name (names are case-insensitive, as in save files)"""
+    return name.lower()
+
+
+class PetStore:
+    """Base class for save backends
+
+    Records are plain dicts with the SAVE_FIELDS keys, as produced by
+    MushroomPet.to_dict(). Subclasses implement load_many, save_many,
+    names and delete.
+    """
+
+    def load(self, name):
+        """Record for one pet, or None if it is not stored"""
+        return self.load_many([name]).get(pet_key(name))
+
+    def load_many(self, names):
+        """Records for the given names as {key: record}; missing pets are left out"""
+        raise NotImplementedError
+
+    def save(self, record):
+        """Insert or replace one record"""
+        self.save_many([record])
+
+    def save_many(self, records):
+        """Insert or replace many records in one batch"""
+        raise NotImplementedError
+
+    def names(self):
+        """Keys of every stored pet"""
+        raise NotImplementedError
+
+    def delete(self, name):
+        """Remove a pet; returns True if it existed"""
+        raise NotImplementedError
+
+    def record_action(self, pet, result):
+        """Note a care action (an ActionResult) on pet; only stores with a history keep it"""
+
+    def close(self):
+        """Release any resources held by the store"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def load_pet(self, name, catch_up=True, clock=None):
+        """Load a MushroomPet on clock, fast-forwarded to its now unless catch_up is False"""
+        record = self.load(name)
+        if record is None:
+            return None
+        pet = MushroomPet.from_dict(record, clock)
+        if catch_up:
+            pet.fast_forward()
+        return pet
+
+    def load_pets(self, names, catch_up=True, clock=None):
+        """Load every stored pet among names, in one bulk read"""
+        pets = []
+        for record in self.load_many(names).values():
+            pet = MushroomPet.from_dict(record, clock)
+            if catch_up:
+                pet.fast_forward()
+            pets.append(pet)
+        return pets
+
+    def save_pet(self, pet):
+        self.save(pet.to_dict())
+
+    def save_pets(self, pets):
+        self.save_many([pet.to_dict() for pet in pets])
+
+
+class JsonFileStore(PetStore):
+    """One JSON save file per pet, the format MushroomPet.save_to_file() writes
+
+    Saves and deletes keep the directory's PetIndex up to date.
+    """
+
+    def __init__(self, directory='.'):
+        self.directory = directory
+        self.index = PetIndex(directory)
+
+    def path_for(self, name):
+        return os.path.join(self.directory, f"{SAVE_PREFIX}{pet_key(name)}{SAVE_SUFFIX}")
+
+    def load_many(self, names):
+        records = {}
+        for name in names:
+            try:
+                with open(self.path_for(name), 'r') as f:
+                    records[pet_key(name)] = json.load(f)
+            except FileNotFoundError:
+                continue
+        return records
+
+    def save_many(self, records):
+        records = list(records)
+        for record in records:
+            atomic_write_json(self.path_for(record['name']), record)
+        self.index.record(records)
+
+    def names(self):
+        return sorted(f[len(SAVE_PREFIX):-len(SAVE_SUFFIX)] for f in os.listdir(self.directory)
+                      if f.startswith(SAVE_PREFIX) and f.endswith(SAVE_SUFFIX))
+
+    def delete(self, name):
+        try:
+            os.remove(self.path_for(name))
+        except FileNotFoundError:
+            return False
+        self.index.remove(name)
+        return True
+
+
+INDEX_FILE = '.mushroom_index.jsonl'
+
+
+class PetIndex:
+    """Manifest of the pets saved in a directory: name, stage, level, last_update
+
+    Each save appends one JSON line per pet, so updating the index costs
+    O(pets saved), not O(pets known); later lines win and tombstones
+    remove pets. Reading compacts the file once stale lines dominate.
+    rebuild() recovers the index from a directory scan.
+    """
+
+    def __init__(self, directory='.'):
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILE)
+
+    @staticmethod
+    def entry_for(record):
+        return {
+            'name': record['name'],
+            'stage': record['growth_stage'],
+            'level': record['level'],
+            'last_update': record['last_update'],
+        }
+
+    def record(self, records):
+        """Append index entries for saved records"""
+        lines = ''.join(json.dumps(self.entry_for(record)) + '\n' for record in records)
+        if lines:
+            self._append(lines)
+
+    def remove(self, name):
+        """Append a tombstone for a deleted pet"""
+        self._append(json.dumps({'name': name, 'deleted': True}) + '\n')
+
+    def _append(self, lines):
+        # One O_APPEND write per batch, so batches appended by several
+        # processes at once (see mycomate_fleet.tick_fleet) never interleave
+        data = lines.encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def load(self):
+        """Current entries as {key: entry}, or None if there is no index yet"""
+        entries = {}
+        lines = 0
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash mid-append
+                    if entry.get('deleted'):
+                        entries.pop(pet_key(entry['name']), None)
+                    else:
+                        entries[pet_key(entry['name'])] = entry
+        except FileNotFoundError:
+            return None
+        if lines > 2 * len(entries) + 100:
+            self._write(entries)
+        return entries
+
+    def load_or_rebuild(self):
+        """Current entries, rebuilding the index first if it does not exist"""
+        entries = self.load()
+        if entries is None:
+            entries = self.rebuild()
+        return entries
+
+    def rebuild(self):
+        """Recreate the index from the save files in the directory"""
+        store = JsonFileStore(self.directory)
+        entries = {}
+        for key, record in store.load_many(store.names()).items():
+            entries[key] = self.entry_for(record)
+        self._write(entries)
+        return entries
+
+    def _write(self, entries):
+        data = ''.join(json.dumps(entry) + '\n' for entry in entries.values())
+        atomic_write_bytes(self.path, data.encode('utf-8'))
+
+
+# SQLite column type for each save field
+_COLUMN_TYPES = {
+    'name': 'TEXT NOT NULL',
+    'personality': 'TEXT',
+    'favorite_food': 'TEXT',
+    'mood': 'TEXT',
+    'growth_stage': 'INTEGER',
+    'experience': 'INTEGER',
+    'level': 'INTEGER',
+}
+
+_COLUMNS = ', '.join(SAVE_FIELDS)
+_CREATE_TABLE = "CREATE TABLE IF NOT EXISTS pets (key TEXT PRIMARY KEY, {})".format(
+    ', '.join(f"{field} {_COLUMN_TYPES.get(field, 'REAL')}" for field in SAVE_FIELDS))
+_UPSERT = "INSERT OR REPLACE INTO pets (key, {}) VALUES (?, {})".format(
+    _COLUMNS, ', '.join('?' * len(SAVE_FIELDS)))
+_SELECT_BY_KEYS = "SELECT key, {} FROM pets WHERE key IN ({{}})".format(_COLUMNS)
+
+# Keys per bulk SELECT; stays under SQLite's bound-parameter limit and keeps
+# the number of distinct statement texts (and so cached statements) small
+_LOAD_CHUNK = 500
+
+
+class SqliteStore(PetStore):
+    """All pets in one SQLite database, written in WAL mode
+
+    Statements use fixed SQL text with bound parameters, so sqlite3's
+    statement cache prepares each one once. save_many() writes a whole batch
+    in a single transaction.
+    """
+
+    def __init__(self, path):
+        import sqlite3  # Only database stores need it; keeps the game's startup light
+        self.path = path
+        self._lock = threading.Lock()  # One connection shared by saver/server threads
+        # Generous busy timeout: fleet tick workers write one database concurrently
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, safe with WAL
+        with self.conn:
+            self.conn.execute(_CREATE_TABLE)
+
+    def load_many(self, names):
+        keys = list(dict.fromkeys(pet_key(name) for name in names))
+        records = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOAD_CHUNK):
+                chunk = keys[start:start + _LOAD_CHUNK]
+                sql = _SELECT_BY_KEYS.format(', '.join('?' * len(chunk)))
+                for row in self.conn.execute(sql, chunk):
+                    records[row[0]] = dict(zip(SAVE_FIELDS, row[1:]))
+        return records
+
+    def save_many(self, records):
+        rows = [(pet_key(record['name']),) + tuple(record[field] for field in SAVE_FIELDS)
+                for record in records]
+        with self._lock, self.conn:
+            self.conn.executemany(_UPSERT, rows)
+
+    def names(self):
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT key FROM pets ORDER BY key")]
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0]
+
+    def delete(self, name):
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM pets WHERE key = ?", (pet_key(name),)).rowcount > 0
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+JOURNAL_SNAPSHOT = 'snapshot.json'
+JOURNAL_SEGMENT = 'segment-{:08d}.jsonl'
+JOURNAL_ARCHIVE = 'archive'
+JOURNAL_LOCK = 'lock'
+
+
+class JournalLockedError(RuntimeError):
+    """The journal is already open for writing in another process or store"""
+
+
+def is_journal(location):
+    """Whether open_store() opens location as a JournalStore"""
+    return location.rstrip(os.sep).endswith('.journal')
+
+
+class JournalStore(PetStore):
+    """Event-sourced store: an append-only log of changes plus snapshots
+
+    Every save appends one JSON line holding only the fields that changed
+    since the pet's last entry, and record_action() appends the care action
+    itself with its outcome, so writes are small sequential appends and the
+    log doubles as an audit trail. The log is split into segments; once the
+    current one passes `segment_bytes` a new one is started and a
+    background thread folds the finished segments into snapshot.json and
+    deletes them (or moves them to archive/ when `archive` is set).
+
+    Opening the directory recovers the state from the snapshot plus the
+    segments written after it. A torn last line from a crash is skipped,
+    like in PetIndex. Appends reach the OS on every write; pass fsync=True
+    to also survive a power loss, at the cost of a disk flush per entry.
+    Saves and deletes are stamped with `clock`, actions with the pet's clock.
+
+    A journal has a single writer: the store holds an exclusive lock on the
+    directory until close(), and a second JournalStore on the same directory
+    raises JournalLockedError instead of rolling and retiring segments
+    under the first one.
+    """
+
+    def __init__(self, directory, segment_bytes=4 << 20, fsync=False, archive=False, clock=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock_file = self._acquire(directory)
+        self.clock = clock or REAL_CLOCK
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.archive = archive
+        self.compactions = 0
+        self._lock = threading.Lock()
+        self._compactor = None
+        self._compact_again = False
+        self.pets, self.segment = self._recover()
+        self._file = open(self._segment_path(self.segment), 'a', encoding='utf-8')
+
+    @staticmethod
+    def _acquire(directory):
+        lock_file = open(os.path.join(directory, JOURNAL_LOCK), 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                raise JournalLockedError(f"{directory} is already open in another process or store")
+        return lock_file
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, JOURNAL_SEGMENT.format(segment))
+
+    def _segments(self, directory=None):
+        """Numbers of the segment files in directory, in order"""
+        directory = directory or self.directory
+        prefix, suffix = JOURNAL_SEGMENT.split('{:08d}')
+        try:
+            files = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        return sorted(int(f[len(prefix):-len(suffix)]) for f in files
+                      if f.startswith(prefix) and f.endswith(suffix))
+
+    def _read_snapshot(self):
+        try:
+            with open(os.path.join(self.directory, JOURNAL_SNAPSHOT), 'r') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return {}, 0
+        return snapshot['pets'], snapshot['segment']
+
+    @staticmethod
+    def _entries(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash mid-append
+        except FileNotFoundError:
+            return
+
+    @classmethod
+    def _replay(cls, path, pets):
+        for entry in cls._entries(path):
+            key = pet_key(entry['pet'])
+            if entry['op'] == 'delete':
+                pets.pop(key, None)
+            elif entry['set']:
+                pets.setdefault(key, {}).update(entry['set'])
+
+    def _recover(self):
+        """State as of the end of the log, and the segment to keep appending to"""
+        pets, first = self._read_snapshot()
+        segment = first
+        for number in self._segments():
+            if number < first:
+                self._retire(number)  # Already in the snapshot; left over by a crash
+                continue
+            self._replay(self._segment_path(number), pets)
+            segment = number
+        return pets, segment
+
+    def _append(self, entry):
+        # Called with self._lock held
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        if self._file.tell() >= self.segment_bytes:
+            self._roll()
+
+    def _log(self, record, op, when, **extra):
+        # Called with self._lock held; appends the fields that changed
+        key = pet_key(record['name'])
+        known = self.pets.get(key)
+        if known is None:
+            changed = dict(record)
+            self.pets[key] = dict(record)
+        else:
+            changed = {field: value for field, value in record.items() if known.get(field) != value}
+            if not changed and not extra:
+                return  # Nothing new since the last entry
+            known.update(changed)
+        self._append(dict(t=when, pet=record['name'], op=op, set=changed, **extra))
+
+    def _roll(self):
+        """Start a new segment and compact the finished ones in the background"""
+        self._file.close()
+        self.segment += 1
+        self._file = open(self._segment_path(self.segment), 'a', encoding='utf-8')
+        if self._compactor is not None and self._compactor.is_alive():
+            self._compact_again = True
+            return
+        self._compactor = threading.Thread(target=self._compact_loop, name='mycomate-journal', daemon=True)
+        self._compactor.start()
+
+    def _compact_loop(self):
+        while True:
+            with self._lock:
+                upto = self.segment
+                self._compact_again = False
+            self._compact(upto)
+            with self._lock:
+                if not self._compact_again:
+                    return
+
+    def _compact(self, upto):
+        """Fold every segment before upto into the snapshot, then retire them
+
+        Works from the files rather than the live state, so appends to the
+        current segment carry on meanwhile. The snapshot is replaced
+        atomically before any segment goes, so a crash at any point leaves
+        a recoverable directory.
+        """
+        pets, first = self._read_snapshot()
+        done = [number for number in self._segments() if first <= number < upto]
+        if not done:
+            return
+        for number in done:
+            self._replay(self._segment_path(number), pets)
+        atomic_write_json(os.path.join(self.directory, JOURNAL_SNAPSHOT),
+                          {'segment': upto, 'time': self.clock.time(), 'pets': pets})
+        for number in done:
+            self._retire(number)
+        self.compactions += 1
+
+    def _retire(self, number):
+        path = self._segment_path(number)
+        try:
+            if self.archive:
+                archive = os.path.join(self.directory, JOURNAL_ARCHIVE)
+                os.makedirs(archive, exist_ok=True)
+                os.replace(path, os.path.join(archive, os.path.basename(path)))
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            pass  # Already retired
+
+    def compact(self):
+        """Snapshot now and drop the whole log; returns when done"""
+        with self._lock:
+            self._roll()
+            compactor = self._compactor
+        compactor.join()
+
+    def load_many(self, names):
+        with self._lock:
+            return {key: dict(self.pets[key]) for key in map(pet_key, names) if key in self.pets}
+
+    def save_many(self, records):
+        with self._lock:
+            now = self.clock.time()
+            for record in records:
+                self._log(record, 'save', now)
+
+    def record_action(self, pet, result):
+        extra = {'ok': result.ok, 'result': result.key}
+        if result.params:
+            extra['params'] = result.params
+        record = pet.to_dict()
+        with self._lock:
+            self._log(record, result.action, pet.clock.time(), **extra)
+
+    def names(self):
+        with self._lock:
+            return sorted(self.pets)
+
+    def delete(self, name):
+        key = pet_key(name)
+        with self._lock:
+            if self.pets.pop(key, None) is None:
+                return False
+            self._append({'t': self.clock.time(), 'pet': name, 'op': 'delete', 'set': {}})
+            return True
+
+    def history(self, name):
+        """Every logged entry for a pet still on disk (archived segments included), oldest first"""
+        key = pet_key(name)
+        with self._lock:
+            self._file.flush()
+        archive = os.path.join(self.directory, JOURNAL_ARCHIVE)
+        paths = [os.path.join(archive, JOURNAL_SEGMENT.format(number)) for number in self._segments(archive)]
+        paths += [self._segment_path(number) for number in self._segments()]
+        for path in paths:
+            for entry in self._entries(path):
+                if pet_key(entry['pet']) == key:
+                    yield entry
+
+    def close(self):
+        with self._lock:
+            compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self._file.close()
+            self._lock_file.close()  # Releases the directory lock
+
+
+class WriteBehindSaver:
+    """Coalesces pet saves onto a background thread
+
+    mark_dirty() snapshots the pet's record; repeated marks of the same pet
+    before the next write replace each other. The thread writes all pending
+    records in one save_many() batch every `interval` seconds, or sooner
+    once `max_dirty` pets are waiting. Nothing is written while nothing is
+    dirty. Call close() (or use it as a context manager) to flush on exit.
+    """
+
+    def __init__(self, store, interval=5.0, max_dirty=100):
+        self.store = store
+        self.interval = interval
+        self.max_dirty = max_dirty
+        self.saves = 0          # Records written
+        self.last_error = None
+        self._pending = {}      # key -> latest record
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # Keeps batches in order
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='mycomate-saver', daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self, pet):
+        """Queue the pet's current state for the next write"""
+        record = pet.to_dict()
+        with self._cond:
+            self._pending[pet_key(pet.name)] = record
+            if len(self._pending) >= self.max_dirty:
+                self._cond.notify()
+
+    @property
+    def dirty_count(self):
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self):
+        """Write everything pending now, on the calling thread; returns True on success"""
+        with self._write_lock:
+            with self._cond:
+                records, self._pending = self._pending, {}
+            if not records:
+                return self.last_error is None
+            try:
+                self.store.save_many(records.values())
+            except Exception as e:
+                self.last_error = e
+                with self._cond:
+                    # Keep failed records unless a newer snapshot arrived meanwhile
+                    for key, record in records.items():
+                        self._pending.setdefault(key, record)
+                return False
+            self.last_error = None
+            self.saves += len(records)
+            return True
+
+    def close(self):
+        """Stop the background thread and flush pending saves"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.interval
+                while not self._closed and len(self._pending) < self.max_dirty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+
+def open_store(location):
+    """Open a .journal directory as a JournalStore, any other directory as JSON
+    saves, or any other path as a SQLite database"""
+    if is_journal(location):
+        return JournalStore(location)
+    if os.path.isdir(location):
+        return JsonFileStore(location)
+    return SqliteStore(location)
+
+
+def migrate_json_saves(store, directory='.', batch_size=500):
+    """Copy every JSON save in directory into store; returns the number imported"""
+    source = JsonFileStore(directory)
+    names = source.names()
+    for start in range(0, len(names), batch_size):
+        store.save_many(source.load_many(names[start:start + batch_size]).values())
+    return len(names)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="MycoMate save storage tools")
+    commands = parser.add_subparsers(dest='command')
+    migrate = commands.add_parser('migrate', help="import JSON saves into a SQLite database")
+    migrate.add_argument('database', help="SQLite database to create or update")
+    migrate.add_argument('directory', nargs='?', default='.', help="directory holding .mushroom_pet_*.json files")
+    pack = commands.add_parser('pack', help="write every pet in a store to a binary save")
+    pack.add_argument('store', help="SQLite database or directory of JSON saves")
+    pack.add_argument('output', help="binary save file to write")
+    unpack = commands.add_parser('unpack', help="load a binary save into a store")
+    unpack.add_argument('input', help="binary save file to read")
+    unpack.add_argument('store', help="SQLite database or directory of JSON saves")
+    rebuild = commands.add_parser('rebuild-index', help="recreate the pet index from a directory scan")
+    rebuild.add_argument('directory', nargs='?', default='.', help="directory holding .mushroom_pet_*.json files")
+    history = commands.add_parser('history', help="print a pet's journal entries")
+    history.add_argument('journal', help="journal directory")
+    history.add_argument('name', help="pet name")
+    compact = commands.add_parser('compact', help="fold a journal's log into its snapshot")
+    compact.add_argument('journal', help="journal directory")
+    args = parser.parse_args(argv)
+
+    if args.command == 'migrate':
+        with SqliteStore(args.database) as store:
+            count = migrate_json_saves(store, args.directory)
+        print(f"🍄 Imported {count} pets into {args.database}")
+    elif args.command == 'pack':
+        import mycomate_codec
+        with open_store(args.store) as store:
+            records = store.load_many(store.names()).values()
+            data = mycomate_codec.encode_records(records)
+        atomic_write_bytes(args.output, data)
+        print(f"🍄 Packed {len(records)} pets into {args.output}")
+    elif args.command == 'unpack':
+        import mycomate_codec
+        with open(args.input, 'rb') as f:
+            records = mycomate_codec.decode_records(f.read())
+        with open_store(args.store) as store:
+            store.save_many(records)
+        print(f"🍄 Unpacked {len(records)} pets into {args.store}")
+    elif args.command == 'rebuild-index':
+        entries = PetIndex(args.directory).rebuild()
+        print(f"🍄 Indexed {len(entries)} pets in {args.directory}")
+    elif args.command == 'history':
+        with JournalStore(args.journal) as store:
+            for entry in store.history(args.name):
+                print(json.dumps(entry))
+    elif args.command == 'compact':
+        with JournalStore(args.journal) as store:
+            store.compact()
+            print(f"🍄 Compacted {len(store.pets)} pets in {args.journal}")
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
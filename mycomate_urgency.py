@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+MycoMate Urgency - which pets need care first, kept current as they change.
+
+A pet needs care once its hunger drops below 20 or its health starts
+falling (MushroomPet.care_due_time). UrgencyIndex keeps every pet's due
+time in a heap: update() is O(log n) and top(k) returns the k most urgent
+pets in O(k log n), without loading or updating anyone else.
+
+    index = UrgencyIndex()
+    index.watch(store)                 # every save updates the index
+    index.load(store)                  # pets already saved
+    scheduler = ThresholdScheduler(on_wake=index.update)
+    ...
+    index.update(pet)                  # after a care action
+    for name, due in index.top(10):
+        print(name, due)
+
+Print the most urgent pets of a store with:
+
+    python3 mycomate_urgency.py pets.db [--top 20]
+"""
+
+import argparse
+import heapq
+import sys
+import threading
+
+from mycomate import REAL_CLOCK, get_care_due_hours, get_decay_rates
+from mycomate_storage import open_store, pet_key
+
+# Records loaded from the store per batch by load()
+LOAD_BATCH = 5000
+
+
+def care_due_time(record):
+    """care_due_time() of the pet a save record describes, without building it"""
+    hours = get_care_due_hours(record['hunger'], record['happiness'], record['cleanliness'],
+                               record['energy'], get_decay_rates(record['personality']))
+    return None if hours is None else record['last_update'] + hours * 3600
+
+
+class UrgencyIndex:
+    """Heap of pets ordered by the time they start needing care
+
+    Each pet has one live entry, the one whose sequence number _pets
+    holds; an update pushes a new entry and the old one is skipped lazily
+    when it surfaces, as in ThresholdScheduler. The
+    heap is rebuilt once stale entries outnumber live ones. Updates older
+    than what the index already has for a pet (by last_update) are
+    ignored, so a slow bulk load never undoes a newer action. Pets that
+    will never need care are left out. `clock` (use the pets' clock) says
+    what "now" is for due_by().
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock or REAL_CLOCK
+        self._heap = []       # (due time, sequence, key)
+        self._pets = {}       # key -> (due time, name, last_update, sequence of live entry)
+        self._seen = {}       # key -> last_update of the newest state seen
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pets)
+
+    def update(self, pet):
+        """Index a pet's current state; returns its due time or None"""
+        return self._set(pet.name, pet.last_update, pet.care_due_time())
+
+    def update_record(self, record):
+        """Index a save record; returns its due time or None"""
+        return self._set(record['name'], record['last_update'], care_due_time(record))
+
+    def update_records(self, records):
+        for record in records:
+            self.update_record(record)
+
+    def _set(self, name, last_update, due):
+        key = pet_key(name)
+        with self._lock:
+            if self._seen.get(key, last_update) > last_update:
+                return self._pets.get(key, (None,))[0]  # Older than what we have
+            self._seen[key] = last_update
+            if due is None:
+                self._pets.pop(key, None)
+                return None
+            self._sequence += 1
+            self._pets[key] = (due, name, last_update, self._sequence)
+            heapq.heappush(self._heap, (due, self._sequence, key))
+            if len(self._heap) > 2 * len(self._pets) + 64:
+                self._rebuild()
+        return due
+
+    def _rebuild(self):
+        self._heap = [(due, sequence, key) for key, (due, _, _, sequence) in self._pets.items()]
+        heapq.heapify(self._heap)
+
+    def remove(self, name):
+        """Stop tracking a pet, e.g. when it is deleted"""
+        key = pet_key(name)
+        with self._lock:
+            self._seen.pop(key, None)
+            return self._pets.pop(key, None) is not None
+
+    def due_time(self, name):
+        """Indexed due time of one pet, or None"""
+        with self._lock:
+            entry = self._pets.get(pet_key(name))
+        return entry[0] if entry is not None else None
+
+    def top(self, k=10):
+        """The k most urgent pets as (name, due time), soonest (or most overdue) first"""
+        found = []
+        with self._lock:
+            heap = self._heap
+            while heap and len(found) < k:
+                entry = heapq.heappop(heap)
+                _, sequence, key = entry
+                pet = self._pets.get(key)
+                if pet is None or pet[3] != sequence:
+                    continue  # Superseded or removed
+                found.append(entry)
+            for entry in found:
+                heapq.heappush(heap, entry)  # Still live; only stale entries are dropped
+            return [(self._pets[key][1], due) for due, _, key in found]
+
+    def due_by(self, when=None, limit=None):
+        """Pets needing care at `when` (default now), most overdue first"""
+        if when is None:
+            when = self.clock.time()
+        pets = []
+        k = 16
+        while True:
+            pets = self.top(k)
+            if len(pets) < k or pets[-1][1] > when or (limit is not None and k >= limit):
+                break
+            k *= 4
+        pets = [(name, due) for name, due in pets if due <= when]
+        return pets[:limit] if limit is not None else pets
+
+    def load(self, store, batch_size=LOAD_BATCH):
+        """Index every pet saved in store; returns the number indexed"""
+        names = store.names()
+        count = 0
+        for start in range(0, len(names), batch_size):
+            records = store.load_many(names[start:start + batch_size]).values()
+            self.update_records(records)
+            count += len(records)
+        return count
+
+    def watch(self, store):
+        """Update the index on every save_many() and delete() of this store"""
+        save_many, delete = store.save_many, store.delete
+
+        def save_and_index(records):
+            records = list(records)
+            save_many(records)
+            self.update_records(records)
+
+        def delete_and_unindex(name):
+            self.remove(name)
+            return delete(name)
+
+        store.save_many = save_and_index
+        store.delete = delete_and_unindex
+        return store
+
+
+def format_due(due, now):
+    """'overdue 2.5h' or 'in 3.0h'"""
+    hours = (due - now) / 3600
+    return f"overdue {-hours:.1f}h" if hours < 0 else f"in {hours:.1f}h"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the pets that most urgently need care")
+    parser.add_argument('store', help="SQLite database, .journal or directory of JSON saves")
+    parser.add_argument('--top', type=int, default=20, help="pets to list (default 20)")
+    args = parser.parse_args(argv)
+
+    index = UrgencyIndex()
+    with open_store(args.store) as store:
+        count = index.load(store)
+    now = index.clock.time()
+    print(f"🍄 {len(index)} of {count} pets will need care; most urgent first:")
+    for name, due in index.top(args.top):
+        print(f"   {name:<32} {format_due(due, now)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""Shared fixtures for the tests"""
+
+from mycomate import MushroomPet, PERSONALITIES
+
+START = 1700000000.0
+STATS = ('hunger', 'happiness', 'health', 'cleanliness', 'energy')
+
+
+def random_pets(rng, clock, count, low=0.0, history=False):
+    """count pets on clock with random personalities, experience and stats from low to 100
+
+    With history, each pet was born up to 80 hours before START, last
+    updated up to 40 hours before it, and has a random stage and a level
+    to match its experience.
+    """
+    pets = []
+    for i in range(count):
+        pet = MushroomPet(f"Pet{i}", clock)
+        pet.personality = rng.choice(PERSONALITIES)
+        for field in STATS:
+            setattr(pet, field, rng.uniform(low, 100))
+        if history:
+            pet.birth_time = START - rng.uniform(0, 80) * 3600
+            pet.last_update = START - rng.choice([rng.uniform(0, 30), rng.uniform(0, 40 * 3600)])
+            pet.age = (pet.last_update - pet.birth_time) / 3600
+            pet.growth_stage = rng.randrange(4)
+        pet.experience = rng.randrange(600 if history else 500)
+        pet.level = 1 + pet.experience // 100
+        pet.update_mood()
+        pets.append(pet)
+    return pets
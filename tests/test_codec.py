@@ -0,0 +1,38 @@
+import unittest
+
+from mycomate import MushroomPet, FixedClock, SAVE_FIELDS
+from mycomate_codec import encode_pets, decode_pets
+
+
+class TestDecodePets(unittest.TestCase):
+    def setUp(self):
+        self.clock = FixedClock(1700000000.0)
+        self.pets = [MushroomPet(f"Pet{i}", self.clock) for i in range(5)]
+        self.clock.advance(7200)
+        for pet in self.pets:
+            pet.update_stats()
+
+    def test_round_trip(self):
+        decoded = decode_pets(encode_pets(self.pets), self.clock)
+        self.assertEqual([p.to_dict() for p in decoded], [p.to_dict() for p in self.pets])
+
+    def test_decoded_pets_update_and_feed_on_their_clock(self):
+        decoded = decode_pets(encode_pets(self.pets), self.clock)
+        self.clock.advance(600)
+        fields = [f for f in SAVE_FIELDS if f != 'mood']  # Mood words are drawn at random
+        for pet, original in zip(decoded, self.pets):
+            self.assertIs(pet.clock, self.clock)
+            pet.update_stats()
+            original.update_stats()
+            self.assertEqual(pet.feed('water').ok, original.feed('water').ok)
+            self.assertEqual([getattr(pet, f) for f in fields],
+                             [getattr(original, f) for f in fields])
+
+    def test_default_clock_is_real_time(self):
+        pet = decode_pets(encode_pets([MushroomPet("Bob")]))[0]
+        pet.update_stats()
+        self.assertEqual(pet.feed().action, 'feed')
+
+
+if __name__ == '__main__':
+    unittest.main()
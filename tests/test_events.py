@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import unittest
+
+from mycomate import MushroomPet, FixedClock, EVENT_LISTENERS
+from mycomate_events import EventStream
+
+START = 1700000000.0
+
+
+class TestEventStream(unittest.TestCase):
+    def test_async_consumer_gets_events_from_other_threads(self):
+        clock = FixedClock(START)
+        pets = [MushroomPet(f"Pet{i}", clock) for i in range(3)]
+
+        async def consume(stream):
+            def produce():
+                clock.advance(3600)
+                for pet in pets:
+                    pet.update_stats()
+                stream.close()
+            threading.Thread(target=produce).start()
+            return [event.pet async for event in stream]
+
+        with EventStream(kinds=['stats']) as stream:
+            names = asyncio.run(consume(stream))
+        self.assertEqual(names, ["Pet0", "Pet1", "Pet2"])
+        self.assertNotIn(stream, EVENT_LISTENERS)
+
+    def test_waiting_consumer_does_not_block_loop_shutdown(self):
+        async def main(stream):
+            asyncio.get_running_loop().create_task(stream.__anext__())
+            await asyncio.sleep(0.01)  # The consumer is now waiting; run() cancels it on return
+
+        with EventStream() as stream:
+            runner = threading.Thread(target=asyncio.run, args=(main(stream),), daemon=True)
+            runner.start()
+            runner.join(5)
+            self.assertFalse(runner.is_alive())
+            self.assertEqual(stream._waiters, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
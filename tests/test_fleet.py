@@ -0,0 +1,113 @@
+import io
+import random
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from helpers import START, random_pets
+from mycomate import MushroomPet, FixedClock, EVENT_LISTENERS
+from mycomate_fleet import PetPopulation, STAT_FIELDS, main, np
+from mycomate_storage import JsonFileStore
+
+
+@unittest.skipIf(np is None, "PetPopulation needs NumPy")
+class TestPetPopulation(unittest.TestCase):
+    def test_matches_scalar_update_stats(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            clock = FixedClock(START)
+            pets = random_pets(rng, clock, 200, history=True)
+            scalar = [MushroomPet.from_dict(pet.to_dict(), clock) for pet in pets]
+            for pet in scalar:
+                pet.update_stats()
+
+            population = PetPopulation.from_pets(pets)
+            evolved = population.update_stats()
+            population.apply_to(pets, evolved)
+
+            for pet, expected in zip(pets, scalar):
+                for field in STAT_FIELDS + ('age',):
+                    self.assertAlmostEqual(getattr(pet, field), getattr(expected, field), places=9)
+                self.assertEqual(pet.last_update, expected.last_update)
+                self.assertEqual(pet.growth_stage, expected.growth_stage)
+                self.assertEqual(pet.experience, expected.experience)
+                self.assertEqual(pet.level, expected.level)
+                self.assertEqual(pet.mood_bucket, expected.mood_bucket)
+                self.assertEqual(hasattr(pet, '_evolution_celebration'),
+                                 hasattr(expected, '_evolution_celebration'))
+
+    def test_skips_recently_updated_pets(self):
+        clock = FixedClock(START)
+        pets = random_pets(random.Random(2), clock, 10, history=True)
+        for pet in pets:
+            pet.last_update = START - 30
+        before = [pet.to_dict() for pet in pets]
+        population = PetPopulation.from_pets(pets)
+        self.assertFalse(population.update_stats().any())
+        population.apply_to(pets)
+        self.assertEqual([pet.to_dict() for pet in pets], before)
+
+    def test_mood_events_carry_the_pets_mood(self):
+        clock = FixedClock(START)
+        pets = random_pets(random.Random(3), clock, 200, history=True)
+        events = []
+        EVENT_LISTENERS.append(events.append)
+        try:
+            population = PetPopulation.from_pets(pets)
+            population.apply_to(pets, population.update_stats())
+        finally:
+            EVENT_LISTENERS.remove(events.append)
+        moods = [event for event in events if event.kind == 'mood']
+        self.assertTrue(moods)
+        by_name = {pet.name: pet for pet in pets}
+        for event in moods:
+            pet = by_name[event.pet]
+            self.assertEqual(event.data['mood'], pet.mood)
+            self.assertEqual(event.data['bucket'], pet.mood_bucket)
+        self.assertEqual(len(moods), len({event.pet for event in moods}))
+
+    def test_mood_events_without_apply_to_have_buckets_only(self):
+        clock = FixedClock(START)
+        pets = random_pets(random.Random(4), clock, 100, history=True)
+        events = []
+        EVENT_LISTENERS.append(events.append)
+        try:
+            population = PetPopulation.from_pets(pets)
+            population.update_stats()
+            population.update_stats(START + 3600)
+        finally:
+            EVENT_LISTENERS.remove(events.append)
+        moods = [event for event in events if event.kind == 'mood']
+        self.assertTrue(moods)
+        self.assertTrue(all('mood' not in event.data for event in moods))
+
+
+class TestTickCommand(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mycomate_test_')
+        clock = FixedClock(START - 7200)
+        JsonFileStore(self.directory).save_pets([MushroomPet(f"Pet{i}", clock) for i in range(20)])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def tick(self, *options):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(['tick', self.directory, '--workers', '1'] + list(options))
+        return output.getvalue().splitlines()
+
+    def test_summarizes_evolved_pets(self):
+        lines = self.tick()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("20 pets evolved (20 Sprout)", lines[1])
+
+    def test_verbose_lists_evolved_pets(self):
+        lines = self.tick('--verbose')
+        self.assertEqual(len(lines), 22)
+        self.assertIn("Pet0 evolved into a Sprout", ''.join(lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
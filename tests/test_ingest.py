@@ -0,0 +1,108 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from mycomate import MushroomPet, FixedClock
+from mycomate_ingest import IngestError, ingest, parse_time, sorted_actions
+from mycomate_storage import open_store, pet_key
+
+START = 1700000000.0
+
+
+def random_actions(count, seed=5):
+    rng = random.Random(seed)
+    return [(f"Pet{rng.randrange(20)}", rng.choice(('feed', 'play', 'clean', 'rest')), 'water',
+             START + rng.randrange(48) * 1800) for _ in range(count)]
+
+
+class TestSortedActions(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mycomate_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_merges_in_passes_with_bounded_fan_in(self):
+        actions = random_actions(500)
+        expected = sorted((pet_key(name), when, sequence, name, action, food)
+                          for sequence, (name, action, food, when) in enumerate(actions))
+        for run_size, fan_in in ((1000, 64), (7, 64), (7, 3), (1, 2)):
+            ordered = list(sorted_actions(actions, self.directory, run_size, fan_in))
+            self.assertEqual(ordered, expected, (run_size, fan_in))
+            self.assertLessEqual(len(os.listdir(self.directory)), fan_in)  # Merged runs are removed
+            for name in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, name))
+
+    def test_open_runs_stay_within_fan_in(self):
+        import mycomate_ingest
+        read_run = mycomate_ingest._read_run
+        open_runs = [0, 0]  # Now, most at once
+
+        def counting(path):
+            open_runs[0] += 1
+            open_runs[1] = max(open_runs)
+            try:
+                yield from read_run(path)
+            finally:
+                open_runs[0] -= 1
+
+        mycomate_ingest._read_run = counting
+        try:
+            self.assertEqual(len(list(sorted_actions(random_actions(300), self.directory, 2, 4))), 300)
+        finally:
+            mycomate_ingest._read_run = read_run
+        self.assertEqual(open_runs, [0, 4])
+
+
+class TestParseTime(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(parse_time(START), START)
+        self.assertEqual(parse_time(str(START)), START)
+        self.assertEqual(parse_time('2023-11-14T22:13:20+00:00'), START)
+        self.assertEqual(parse_time('2023-11-15T00:13:20+02:00'), START)
+
+    def test_dates_without_an_offset_are_utc(self):
+        self.assertEqual(parse_time('2023-11-14T22:13:20'), START)
+        self.assertEqual(parse_time('2023-11-14 22:13:20'), START)
+
+    def test_bad_times(self):
+        for value in (None, '', 'yesterday', True):
+            with self.assertRaises(IngestError):
+                parse_time(value)
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mycomate_test_')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_result_does_not_depend_on_run_size_and_replays_are_stale(self):
+        actions = random_actions(400)
+        results = []
+        for run_size in (1000, 9):
+            location = os.path.join(self.directory, f"run{run_size}")
+            os.makedirs(location)
+            random.seed(7)  # New pets draw their personality and moods at random
+            with open_store(location) as store:
+                report = ingest(store, actions, create=True, run_size=run_size, save_batch=7)
+                self.assertEqual((report['actions'], report['pets']), (400, 20))
+                self.assertEqual(report['applied'] + report['refused'], 400)
+                again = ingest(store, actions, run_size=run_size)
+                self.assertEqual(again['stale'], 400)
+                results.append(store.load_many(store.names()))
+        self.assertEqual(results[0], results[1])
+
+    def test_unknown_pets_are_skipped_without_create(self):
+        with open_store(self.directory) as store:
+            store.save_pet(MushroomPet("Pet1", FixedClock(START - 3600)))
+            report = ingest(store, [("Pet1", 'play', None, START), ("Ghost", 'play', None, START)])
+        self.assertEqual((report['applied'] + report['refused'], report['unknown_pets'], report['skipped']),
+                         (1, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+import unittest
+
+import mycomate_metrics
+import mycomate_storage
+from mycomate import MushroomPet, FixedClock
+from mycomate_storage import JournalStore, PetStore
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mycomate_test_')
+        self.metrics = mycomate_metrics.enable(mycomate_metrics.Metrics())
+
+    def tearDown(self):
+        mycomate_metrics.disable()
+        shutil.rmtree(self.directory)
+
+    def test_every_store_backend_is_timed(self):
+        instrumented = {path for module, path, _ in mycomate_metrics.INSTRUMENTED if module == 'mycomate_storage'}
+        for store in vars(mycomate_storage).values():
+            if isinstance(store, type) and issubclass(store, PetStore) and store is not PetStore:
+                for method in ('save_many', 'load_many'):
+                    if method in vars(store):
+                        self.assertIn(f"{store.__name__}.{method}", instrumented)
+
+    def test_journal_store_reports_latency(self):
+        pet = MushroomPet("Bob", FixedClock(1700000000.0))
+        with JournalStore(self.directory + '/pets.journal') as store:
+            store.save_pet(pet)
+            store.record_action(pet, pet.play())
+            self.assertEqual(store.load_many(["Bob"])["bob"]["name"], "Bob")
+        for operation in ('journal_save', 'journal_load', 'journal_record'):
+            self.assertEqual(self.metrics.latency[operation].count, 1, operation)
+
+    def test_disable_restores_the_originals(self):
+        timed = JournalStore.save_many
+        mycomate_metrics.disable()
+        self.assertIs(JournalStore.save_many, timed.__wrapped__)
+        self.metrics = mycomate_metrics.enable(mycomate_metrics.Metrics())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from mycomate import MushroomPet, FixedClock
+
+START = 1700000000.0
+
+
+class TestFastForward(unittest.TestCase):
+    def starving_sprout(self, clock, hours_old, health):
+        pet = MushroomPet("Bob", clock)
+        pet.birth_time = START - hours_old * 3600
+        pet.last_update = START
+        pet.hunger = pet.happiness = pet.cleanliness = pet.energy = 0  # Health falls 13/h
+        pet.health = health
+        pet.growth_stage = 1
+        return pet
+
+    def test_evolves_when_a_gate_holds_only_inside_a_step(self):
+        # Age passes 16h at +0.1h, health drops to 35 at about +0.38h; young
+        # (age > 16, health > 35) holds in between but at neither step end
+        clock = FixedClock(START)
+        pet = self.starving_sprout(clock, 15.9, 40)
+        pet.fast_forward(START + 3600)
+        self.assertEqual(pet.experience, 100)
+        self.assertEqual(pet.growth_stage, 1)  # Back to sprout once health is at 35 or below
+        self.assertAlmostEqual(pet.health, 40 - 13, places=6)
+
+    def test_one_call_matches_many(self):
+        clock = FixedClock(START)
+        once = self.starving_sprout(clock, 15.9, 40)
+        stepped = self.starving_sprout(clock, 15.9, 40)
+        once.fast_forward(START + 3600)
+        for minutes in range(1, 61):
+            stepped.fast_forward(START + minutes * 60)
+        for field in ('health', 'age', 'growth_stage', 'experience'):
+            self.assertAlmostEqual(getattr(once, field), getattr(stepped, field), places=6)
+
+
+class TestScript(unittest.TestCase):
+    def test_script_is_imported_once(self):
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mycomate.py')
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run([sys.executable, '-X', 'importtime', script], cwd=directory,
+                                    input="Bob\n\n5\n", capture_output=True, text=True, timeout=60)
+            self.assertTrue(os.path.exists(os.path.join(directory, '.mushroom_pet_bob.json')))
+        self.assertIn('mycomate_storage', result.stderr)
+        imported = [line.split('|')[-1].strip() for line in result.stderr.splitlines()]
+        self.assertNotIn('mycomate', imported)
+
+
+if __name__ == '__main__':
+    unittest.main()
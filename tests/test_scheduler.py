@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from helpers import START, random_pets
+from mycomate import MushroomPet, FixedClock
+from mycomate_scheduler import ThresholdScheduler, MIN_INTERVAL
+
+END = START + 72 * 3600
+STATE = ('hunger', 'happiness', 'health', 'cleanliness', 'energy', 'age', 'growth_stage', 'experience')
+
+
+def expected_wakeups(pet, end):
+    """Wake-up times of one pet stepped from threshold to threshold by hand"""
+    times = []
+    while True:
+        due = pet.next_threshold_time()
+        if due is None:
+            return times
+        due = max(due, pet.last_update + MIN_INTERVAL)
+        if due > end:
+            return times
+        pet.fast_forward(due)
+        times.append(due)
+
+
+class TestThresholdScheduler(unittest.TestCase):
+    def run_to(self, scheduler, clock, end):
+        while True:
+            due = scheduler.next_due()
+            if due is None or due > end:
+                return
+            clock.set(due)
+            scheduler.run_pending()
+
+    def test_matches_fast_forward(self):
+        clock = FixedClock(START)
+        pets = random_pets(random.Random(3), clock, 50, low=30)
+        direct = [MushroomPet.from_dict(pet.to_dict(), clock) for pet in pets]
+        stepped = [MushroomPet.from_dict(pet.to_dict(), clock) for pet in pets]
+        woken = []
+        scheduler = ThresholdScheduler(on_wake=lambda pet: woken.append((pet.name, pet.last_update)),
+                                       clock=clock)
+        for pet in pets:
+            scheduler.schedule(pet)
+        self.run_to(scheduler, clock, END)
+
+        expected = {pet.name: expected_wakeups(pet, END) for pet in stepped}
+        self.assertEqual(scheduler.wakeups, sum(len(times) for times in expected.values()))
+        self.assertEqual(len(woken), len(set(woken)))  # Never stopped twice at once
+        for name, times in expected.items():
+            self.assertEqual([when for pet, when in woken if pet == name], times)
+
+        for pet, ff in zip(pets, direct):
+            pet.fast_forward(END)
+            ff.fast_forward(END)
+            for field in STATE:
+                self.assertAlmostEqual(getattr(pet, field), getattr(ff, field), places=6, msg=field)
+
+    def test_rescheduling_keeps_one_wakeup(self):
+        clock = FixedClock(START)
+        pet = random_pets(random.Random(3), clock, 1, low=30)[0]
+        scheduler = ThresholdScheduler(clock=clock)
+        due = scheduler.schedule(pet)
+        for _ in range(3):
+            self.assertEqual(scheduler.schedule(pet), due)
+        clock.set(due)
+        self.assertEqual(scheduler.run_pending(), [pet])
+        self.assertEqual(scheduler.run_pending(), [])  # Stale entries for the same time are skipped
+        self.assertEqual(scheduler.wakeups, 1)
+        self.assertGreater(scheduler.next_due(), due)
+
+    def test_unschedule(self):
+        clock = FixedClock(START)
+        pet = random_pets(random.Random(3), clock, 1, low=30)[0]
+        scheduler = ThresholdScheduler(clock=clock)
+        due = scheduler.schedule(pet)
+        self.assertTrue(scheduler.unschedule(pet.name))
+        self.assertIsNone(scheduler.next_due())
+        self.assertEqual(scheduler.run_pending(due + 3600), [])
+        self.assertEqual(len(scheduler), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import io
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr
+
+from mycomate import FixedClock
+from mycomate_server import PetServer
+from mycomate_storage import open_store
+
+
+class TestPetServer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mycomate_test_')
+        self.clock = FixedClock(1700000000.0)
+        self.server = PetServer(open_store(self.directory), save_interval=0.05, clock=self.clock)
+        self.loop_errors = []
+
+    def tearDown(self):
+        self.server.close()
+        shutil.rmtree(self.directory)
+
+    def run_client(self, client):
+        """Run client(reader, writer) against a live server on a free localhost port"""
+        async def main():
+            asyncio.get_running_loop().set_exception_handler(
+                lambda loop, context: self.loop_errors.append(context))
+            await self.server.start('127.0.0.1', 0)
+            reader, writer = await asyncio.open_connection(*self.server.address)
+            try:
+                return await client(reader, writer)
+            finally:
+                writer.close()
+                await self.server.stop()
+        return asyncio.run(main())
+
+    def test_pipelined_requests(self):
+        async def client(reader, writer):
+            writer.write(b'{"id": 1, "pet": "Bob", "action": "feed", "food": "water"}\n'
+                         b'{"id": "two", "pet": "Bob", "action": "status"}\n'
+                         b'{"id": 3, "pet": "Bob", "action": \n'
+                         b'{"id": 4, "pet": "Bob", "action": "dance"}\n'
+                         b'{"id": 5, "action": "needs_care", "limit": 5}\n')
+            await writer.drain()
+            return [json.loads(await reader.readline()) for _ in range(5)]
+
+        feed, status, bad_json, bad_action, needs_care = self.run_client(client)
+        self.assertEqual((feed['id'], feed['action'], feed['pet']['name']), (1, 'feed', 'Bob'))
+        self.assertIn('ok', feed)
+        self.assertEqual((status['id'], status['ok'], status['action']), ('two', True, 'status'))
+        self.assertEqual(status['pet']['hunger'], feed['pet']['hunger'])
+        self.assertFalse(bad_json['ok'])
+        self.assertNotIn('id', bad_json)  # Unparsed, so there is no id to echo
+        self.assertEqual((bad_action['id'], bad_action['ok']), (4, False))
+        self.assertIn('dance', bad_action['error'])
+        self.assertEqual((needs_care['id'], needs_care['action']), (5, 'needs_care'))
+        self.assertEqual(self.server.requests, 5)
+
+        self.assertTrue(self.server.close())
+        with open_store(self.directory) as store:
+            self.assertEqual(store.load('Bob')['hunger'], feed['pet']['hunger'])
+
+    def test_pets_and_needs_care_follow_the_server_clock(self):
+        async def client(reader, writer):
+            async def ask(request):
+                writer.write(json.dumps(request).encode('utf-8') + b'\n')
+                return json.loads(await reader.readline())
+            created = await ask({'pet': 'Bob'})
+            due = self.server.urgency.due_time('Bob')
+            before = await ask({'action': 'needs_care'})
+            self.clock.set(due + 60)
+            after = await ask({'action': 'needs_care'})
+            return created, before, after
+
+        created, before, after = self.run_client(client)
+        self.assertEqual(created['pet']['birth_time'], 1700000000.0)
+        self.assertEqual([pet['overdue'] for pet in before['pets']], [False])
+        self.assertEqual([pet['overdue'] for pet in after['pets']], [True])
+
+    def test_actions_are_recorded_off_the_event_loop(self):
+        threads = []
+        self.server.store.record_action = lambda pet, result: threads.append(threading.get_ident())
+
+        async def client(reader, writer):
+            writer.write(b'{"pet": "Bob", "action": "feed"}\n{"pet": "Bob", "action": "play"}\n')
+            await writer.drain()
+            return [json.loads(await reader.readline()) for _ in range(2)]
+
+        self.run_client(client)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_unexpected_errors_are_answered(self):
+        def broken_load(*args):
+            raise OSError("disk on fire")
+        self.server.store.load_pet = broken_load
+
+        async def client(reader, writer):
+            writer.write(b'{"id": 1, "pet": "Bob"}\n{"id": 2, "action": "needs_care"}\n')
+            await writer.drain()
+            return [json.loads(await reader.readline()) for _ in range(2)]
+
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            failed, next_request = self.run_client(client)
+        self.assertEqual((failed['id'], failed['ok'], failed['error']), (1, False, "Internal error: OSError"))
+        self.assertTrue(next_request['ok'])
+        self.assertIn("disk on fire", errors.getvalue())
+
+    def test_shutdown_with_open_connection(self):
+        async def client(reader, writer):
+            writer.write(b'{"pet": "Bob"}\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            # The handler is still waiting for the next line when asyncio.run cancels it
+            return response
+
+        self.assertTrue(self.run_client(client)['ok'])
+        self.assertEqual(self.loop_errors, [])
+        self.assertEqual(self.server.connections, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
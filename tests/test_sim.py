@@ -0,0 +1,46 @@
+import random
+import unittest
+
+import mycomate
+from mycomate_sim import FullCare, Neglect, parse_tuning, run_grid, simulate_pet
+
+
+class TestSimulator(unittest.TestCase):
+    def test_coarse_resolution_records_every_day(self):
+        _, died, levels = simulate_pet(Neglect(), 'shy', 1, days=4, resolution=48)
+        self.assertTrue(died)
+        self.assertEqual(len(levels), 4)
+        grid = run_grid([Neglect()], ['shy'], pets=3, days=4, workers=1, resolution=48)
+        self.assertEqual(len(grid['default', 'neglect', 'shy']['mean_level_by_day']), 4)
+
+    def test_does_not_reseed_global_random(self):
+        draws = []
+        for global_seed in (42, 43):
+            random.seed(global_seed)
+            simulate_pet(FullCare(6), 'curious', 7, days=2)
+            draws.append(random.random())
+        self.assertNotEqual(draws[0], draws[1])
+
+    def test_tunings_change_outcomes_and_are_undone(self):
+        decay, levels = mycomate.HUNGER_DECAY, mycomate.HEALTH_LEVELS
+        tunings = {
+            'default': {},
+            'hungry': parse_tuning('HUNGER_DECAY=8'),
+            'early': parse_tuning('GROWTH_REQUIREMENTS=[[4, 36, 75, 300], [3, 30, 50, 0], '
+                                  '[2, 16, 35, 0], [1, 4, null, 0]]'),
+        }
+        grid = run_grid([FullCare(6)], ['shy'], pets=5, days=3, workers=1, tunings=tunings)
+        default, hungry, early = (grid[tuning, 'care:6:nutrients', 'shy'] for tuning in tunings)
+        self.assertEqual(default['death_rate'], 0)
+        self.assertEqual(hungry['death_rate'], 1)
+        self.assertLess(early['magical_hours_p50'], default['magical_hours_p50'])
+        self.assertEqual((mycomate.HUNGER_DECAY, mycomate.HEALTH_LEVELS), (decay, levels))
+
+    def test_rejects_unknown_constants(self):
+        for spec in ('MAX_LEVEL=3', 'HUNGER_DECAY', 'HUNGER_DECAY=fast'):
+            with self.assertRaises(ValueError):
+                parse_tuning(spec)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+import unittest
+
+from mycomate import MushroomPet, FixedClock
+from mycomate_storage import JournalStore, JournalLockedError
+
+START = 1700000000.0
+
+
+class TestJournalStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mycomate_test_') + '/pets.journal'
+
+    def tearDown(self):
+        shutil.rmtree(self.directory.rsplit('/', 1)[0])
+
+    def test_entries_are_stamped_by_the_clocks(self):
+        store_clock = FixedClock(START)
+        pet_clock = FixedClock(START - 3600)
+        with JournalStore(self.directory, clock=store_clock) as store:
+            pet = MushroomPet("Bob", pet_clock)
+            store.save_pet(pet)
+            pet_clock.advance(600)
+            store.record_action(pet, pet.play())
+            store_clock.advance(60)
+            store.delete("Bob")
+            history = list(store.history("Bob"))
+        self.assertEqual([(entry['op'], entry['t']) for entry in history],
+                         [('save', START), ('play', START - 3000), ('delete', START + 60)])
+
+    def test_recovers_after_reopening(self):
+        clock = FixedClock(START)
+        pets = [MushroomPet(f"Pet{i}", clock) for i in range(20)]
+        with JournalStore(self.directory, segment_bytes=2048, clock=clock) as store:
+            store.save_pets(pets)
+            for pet in pets[:5]:
+                clock.advance(60)
+                store.record_action(pet, pet.feed('water'))
+            store.compact()
+        with JournalStore(self.directory) as store:
+            self.assertEqual(store.load_many([pet.name for pet in pets]),
+                             {pet.name.lower(): pet.to_dict() for pet in pets})
+
+    def test_single_writer(self):
+        with JournalStore(self.directory) as store:
+            with self.assertRaises(JournalLockedError):
+                JournalStore(self.directory)
+            store.save_pet(MushroomPet("Bob", FixedClock(START)))
+        with JournalStore(self.directory) as store:  # Released on close
+            self.assertEqual(store.names(), ["bob"])
+
+    def test_retiring_a_missing_segment_is_harmless(self):
+        with JournalStore(self.directory) as store:
+            store._retire(store.segment + 5)
+
+    def test_fleet_tick_runs_journals_in_one_process(self):
+        from mycomate_fleet import tick_fleet
+        clock = FixedClock(START - 7200)
+        with JournalStore(self.directory) as store:
+            store.save_pets([MushroomPet(f"Pet{i}", clock) for i in range(50)])
+        report = tick_fleet(self.directory, workers=4)
+        self.assertEqual((report['pets'], report['workers']), (50, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from mycomate import MushroomPet, FixedClock
+from mycomate_urgency import UrgencyIndex, care_due_time
+
+
+START = 1700000000.0
+
+
+def record(name, hunger, last_update=START):
+    pet = MushroomPet(name, FixedClock(last_update))
+    pet.personality = 'curious'
+    pet.hunger = hunger
+    return pet.to_dict()
+
+
+class TestUrgencyIndex(unittest.TestCase):
+    def test_repeated_updates_leave_one_live_entry(self):
+        index = UrgencyIndex()
+        for _ in range(3):
+            index.update_record(record("A", 60))  # Same due time each time
+        index.update_record(record("B", 90))
+        self.assertEqual([name for name, _ in index.top(3)], ["A", "B"])
+        self.assertEqual(index.top(3), index.top(3))  # top() leaves live entries in place
+
+    def test_changing_updates_leave_one_live_entry(self):
+        index = UrgencyIndex()
+        for hunger in (60, 70, 80):
+            index.update_record(record("A", hunger))
+        index.update_record(record("B", 90))
+        self.assertEqual([name for name, _ in index.top(3)], ["A", "B"])
+        self.assertEqual(index.due_time("A"), care_due_time(record("A", 80)))
+
+    def test_update_back_to_an_earlier_due_time(self):
+        index = UrgencyIndex()
+        for hunger in (60, 80, 60):
+            index.update_record(record("A", hunger))
+        index.update_record(record("B", 70))
+        self.assertEqual(index.top(5), [("A", care_due_time(record("A", 60))),
+                                        ("B", care_due_time(record("B", 70)))])
+
+    def test_remove(self):
+        index = UrgencyIndex()
+        index.update_record(record("A", 60))
+        index.update_record(record("A", 65))
+        index.update_record(record("B", 90))
+        self.assertTrue(index.remove("a"))
+        self.assertFalse(index.remove("a"))
+        self.assertEqual([name for name, _ in index.top(5)], ["B"])
+        self.assertEqual(len(index), 1)
+        index.update_record(record("A", 60))
+        self.assertEqual([name for name, _ in index.top(5)], ["A", "B"])
+
+    def test_older_states_are_ignored(self):
+        index = UrgencyIndex()
+        index.update_record(record("A", 80, last_update=1700003600.0))
+        index.update_record(record("A", 30))
+        self.assertEqual(index.due_time("A"), care_due_time(record("A", 80, last_update=1700003600.0)))
+
+    def test_top_matches_sorting_after_many_updates(self):
+        index = UrgencyIndex()
+        expected = {}
+        for step in range(400):
+            name = f"Pet{step % 37}"
+            rec = record(name, 25 + (step * 7) % 70, last_update=1700000000.0 + step)
+            index.update_record(rec)
+            expected[name] = care_due_time(rec)
+        ranked = sorted(expected.items(), key=lambda item: item[1])
+        self.assertEqual(index.top(10), ranked[:10])
+        self.assertEqual(index.due_by(ranked[4][1]), ranked[:5])
+
+    def test_due_by_defaults_to_the_index_clock(self):
+        clock = FixedClock(START)
+        index = UrgencyIndex(clock)
+        index.update_record(record("A", 25))
+        due = index.due_time("A")
+        self.assertEqual(index.due_by(), [])
+        clock.set(due)
+        self.assertEqual(index.due_by(), [("A", due)])
+
+
+if __name__ == '__main__':
+    unittest.main()